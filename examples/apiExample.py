@@ -1,4 +1,4 @@
-from flask import Flask, request
+from flask import Flask, Response, request
 import curveengine as ce
 
 '''
@@ -10,7 +10,8 @@ app = Flask('app')
 
 @app.route('/bootstrap', methods=['POST'])
 def bootstrap():
-    params = request.get_json()
+    # the request and the response are decoded and encoded with the fastest JSON backend installed
+    params = ce.loadJSON(request.get_data())
     try:
         cm = ce.CurveEngine(params)
         bootstrapResults = []
@@ -37,7 +38,7 @@ def bootstrap():
         'curves': bootstrapResults
     }
 
-    return {'statusCode': 200, 'data': results}
+    return Response(ce.dumpJSON({'statusCode': 200, 'data': results}), mimetype='application/json')
 
 
 def getCurrency(config: dict, lookupCurve: str):
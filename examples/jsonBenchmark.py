@@ -0,0 +1,39 @@
+import sys
+import os
+import timeit
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+from curveengine import *
+
+'''
+    Compares the JSON backends installed on examples/config.json: decoding the configuration, building
+    the engine from it and encoding the bootstrapped curves.
+'''
+
+
+def main(number=20):
+    with open(parent_dir + '/config.json', 'rb') as f:
+        data = f.read()
+    # the cross currency curves do not build with every version of ORE
+    config = loadJSON(data)
+    config['curves'] = [curve for curve in config['curves']
+                        if all(rateHelper['helperType'] != 'XccyBasis'
+                               for rateHelper in curve['curveConfig'].get('rateHelpers', []))]
+    engine = CurveEngine(config)
+    # keep the evaluation date of the engine, so that the curves are bootstrapped once
+    ore.Settings.instance().evaluationDate = engine.refDate
+    output = engine.toJSON()
+    print('config.json: {} bytes, output: {} bytes'.format(len(data), len(output)))
+
+    for backend in JSON_BACKENDS:
+        setJSONBackend(backend)
+        decode = timeit.timeit(lambda: loadJSON(data), number=number) / number
+        encode = timeit.timeit(lambda: dumpJSON(config), number=number) / number
+        toJSON = timeit.timeit(lambda: engine.toJSON(), number=number) / number
+        fromJSON = timeit.timeit(lambda: CurveEngine.fromJSON(output), number=number) / number
+        print('{:8} decode {:7.3f} ms, encode {:7.3f} ms, toJSON {:7.3f} ms, fromJSON {:7.3f} ms'.format(
+            backend, decode * 1e3, encode * 1e3, toJSON * 1e3, fromJSON * 1e3))
+
+
+if __name__ == '__main__':
+    main()
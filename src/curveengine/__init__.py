@@ -11,4 +11,5 @@
     curves and indexes from other builds.
 '''
 
-from .engine import *
\ No newline at end of file
+from .engine import *
+from .stream import *
\ No newline at end of file
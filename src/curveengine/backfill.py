@@ -0,0 +1,281 @@
+'''
+    Historical backfill runner. Bootstraps a curve set template for many reference dates, fanning the
+    dates out over a process pool, since the evaluation date is process-global. Results are written
+    chunk by chunk to a columnar store, a folder of NumPy .npz files, so an interrupted run can be
+    resumed by running it again.
+
+    Command line usage:
+
+        python -m curveengine.backfill template.json --start 2023-01-02 --end 2023-12-29 --market quotes/ --output curves/
+
+    where quotes/ holds one quote table per date, named after the date (2023-01-02.csv, .json or .npz).
+'''
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from .engine import *
+
+
+def getMarketFile(folder: str, date: str) -> str:
+    '''
+    Get the quote file of a date in a market folder
+
+    Parameters
+    ----------
+    folder: str
+        The market folder, with one quote file per date named after the date
+    date: str
+        The date, in ISO format
+
+    Returns
+    -------
+    str
+        The path of the quote file
+
+    Raises
+    ------
+    MarketConfigurationError
+        If there is no quote file for the date
+    '''
+    for extension in ['.csv', '.json', '.npz']:
+        path = os.path.join(folder, date + extension)
+        if os.path.exists(path):
+            return path
+    raise MarketConfigurationError(
+        'No market data for {} in {}'.format(date, folder))
+
+
+def backfillChunk(template: dict, dates: list, market) -> tuple:
+    '''
+    Bootstrap a curve set template for a chunk of dates. Runs in a worker process.
+
+    Parameters
+    ----------
+    template: dict
+        The curve set template, see CurveEngine
+    dates: list
+        The reference dates, in ISO format
+    market: str or callable
+        A market folder, see getMarketFile, or a function returning the quote table of a date
+
+    Returns
+    -------
+    tuple
+        The columns of the results, the bootstrap time by curve in seconds and the failed dates
+        with their error messages
+    '''
+    columns = {'refDate': [], 'curveName': [], 'date': [], 'discount': []}
+    timings = {}
+    failed = {}
+    for date in dates:
+        try:
+            table = market(date) if callable(market) else getMarketFile(market, date)
+            engine = CurveEngine({**template, 'refDate': date}, template=True)
+            report = engine.bindMarket(table)
+            if report['missing']:
+                raise MarketConfigurationError(
+                    'Missing tickers: {}'.format(', '.join(report['missing'])))
+            rows = []
+            for curveName in engine.sortedCurves:
+                # the curves are bootstrapped by bindMarket, which records the time of each one
+                timings.setdefault(curveName, []).append(engine.bootstrapTimes.get(curveName, 0.0))
+                rows.extend((curveName, parseOREDate(d), v) for d, v in engine.getCurve(curveName).nodes())
+        except Exception as exc:
+            failed[date] = str(exc)
+            continue
+        for curveName, nodeDate, value in rows:
+            columns['refDate'].append(date)
+            columns['curveName'].append(curveName)
+            columns['date'].append(nodeDate)
+            columns['discount'].append(value)
+    return columns, timings, failed
+
+
+def writeChunk(output: str, columns: dict) -> str:
+    '''
+    Write the columns of a chunk of results to the store, atomically
+
+    Parameters
+    ----------
+    output: str
+        The store folder
+    columns: dict
+        The columns, as returned by backfillChunk
+
+    Returns
+    -------
+    str
+        The path of the chunk file
+    '''
+    refDates = sorted(set(columns['refDate']))
+    path = os.path.join(output, '{}_{}.npz'.format(refDates[0], refDates[-1]))
+    tmpPath = path + '.tmp'
+    with open(tmpPath, 'wb') as f:
+        np.savez(f,
+                 refDate=np.array(columns['refDate'], dtype='datetime64[D]'),
+                 curveName=np.array(columns['curveName'], dtype=str),
+                 date=np.array(columns['date'], dtype='datetime64[D]'),
+                 discount=np.array(columns['discount'], dtype=np.float64))
+    os.replace(tmpPath, path)
+    return path
+
+
+def readBackfill(output: str) -> dict:
+    '''
+    Read the results stored by a backfill run
+
+    Parameters
+    ----------
+    output: str
+        The store folder
+
+    Returns
+    -------
+    dict
+        The refDate, curveName, date and discount columns, as NumPy arrays
+    '''
+    names = ['refDate', 'curveName', 'date', 'discount']
+    chunks = {name: [] for name in names}
+    for path in sorted(glob.glob(os.path.join(output, '*.npz'))):
+        with np.load(path) as data:
+            for name in names:
+                chunks[name].append(data[name])
+    if not chunks['refDate']:
+        return {'refDate': np.array([], dtype='datetime64[D]'), 'curveName': np.array([], dtype=str),
+                'date': np.array([], dtype='datetime64[D]'), 'discount': np.array([], dtype=np.float64)}
+    return {name: np.concatenate(values) for name, values in chunks.items()}
+
+
+def runBackfill(template: dict, dates: list, market, output: str, chunkSize: int = 20,
+                maxWorkers: int = None, log=print) -> dict:
+    '''
+    Bootstrap a curve set template for many reference dates in parallel. Dates already in the
+    store are skipped, so an interrupted run is resumed by running it again.
+
+    Parameters
+    ----------
+    template: dict
+        The curve set template, see CurveEngine. Its refDate, if any, is replaced by each date.
+    dates: list
+        The reference dates, in ISO format
+    market: str or callable
+        A market folder, see getMarketFile, or a picklable function returning the quote table of a date
+    output: str
+        The store folder
+    chunkSize: int, optional
+        The number of dates sent to a worker at a time. The default is 20.
+    maxWorkers: int, optional
+        The maximum number of worker processes. The default is None, the number of processors.
+    log: callable, optional
+        The function used to report progress. The default is print.
+
+    Returns
+    -------
+    dict
+        The run statistics: processed, skipped and failed dates, elapsed seconds, dates per second
+        and mean bootstrap seconds by curve
+    '''
+    os.makedirs(output, exist_ok=True)
+    done = set(str(date) for date in np.unique(readBackfill(output)['refDate']))
+    dates = list(dict.fromkeys(dates))
+    pending = [date for date in dates if date not in done]
+    chunks = [pending[i:i + chunkSize] for i in range(0, len(pending), chunkSize)]
+    if pending:
+        checkConfiguration({**template, 'refDate': pending[0]}, template=True)
+
+    start = time.perf_counter()
+    processed = 0
+    timings = {}
+    failed = {}
+    with ProcessPoolExecutor(maxWorkers) as executor:
+        futures = [executor.submit(backfillChunk, template, chunk, market) for chunk in chunks]
+        for count, future in enumerate(as_completed(futures), 1):
+            columns, chunkTimings, chunkFailed = future.result()
+            if columns['refDate']:
+                writeChunk(output, columns)
+            processed += len(set(columns['refDate']))
+            failed.update(chunkFailed)
+            for curveName, values in chunkTimings.items():
+                timings.setdefault(curveName, []).extend(values)
+            elapsed = time.perf_counter() - start
+            log('chunk {}/{}: {} dates done, {} failed, {:.2f} dates/s'.format(
+                count, len(chunks), processed, len(failed), processed / elapsed if elapsed > 0 else 0.0))
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        'processed': processed,
+        'skipped': len(dates) - len(pending),
+        'failed': failed,
+        'elapsed': elapsed,
+        'datesPerSecond': processed / elapsed if elapsed > 0 else 0.0,
+        'curveSeconds': {curveName: sum(values) / len(values) for curveName, values in timings.items()}
+    }
+    log('{} dates in {:.1f}s ({:.2f} dates/s), {} skipped, {} failed'.format(
+        processed, elapsed, stats['datesPerSecond'], stats['skipped'], len(failed)))
+    for curveName, seconds in stats['curveSeconds'].items():
+        log('  {}: {:.1f} ms per date'.format(curveName, seconds * 1000))
+    for date, error in sorted(failed.items()):
+        log('  failed {}: {}'.format(date, error))
+    return stats
+
+
+def getBusinessDates(start: str, end: str, calendar: str = 'NullCalendar') -> list:
+    '''
+    Get the business dates between two dates, both included
+
+    Parameters
+    ----------
+    start: str
+        The first date, in ISO format
+    end: str
+        The last date, in ISO format
+    calendar: str, optional
+        The calendar, matching the Calendar enum. The default is NullCalendar.
+
+    Returns
+    -------
+    list
+        The business dates, in ISO format
+    '''
+    cal = parseCalendar(calendar)
+    date = parseDate(start)
+    last = parseDate(end)
+    dates = []
+    while date <= last:
+        if cal.isBusinessDay(date):
+            dates.append(parseOREDate(date))
+        date = date + 1
+    return dates
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Bootstrap a curve set template for a range of reference dates.')
+    parser.add_argument('template', help='curve set template, a JSON file')
+    parser.add_argument('--start', required=True, help='first reference date, YYYY-MM-DD')
+    parser.add_argument('--end', required=True, help='last reference date, YYYY-MM-DD')
+    parser.add_argument('--calendar', default='NullCalendar',
+                        help='calendar of the reference dates (default: NullCalendar)')
+    parser.add_argument('--market', required=True,
+                        help='folder with one quote table per date, named YYYY-MM-DD.csv, .json or .npz')
+    parser.add_argument('--output', required=True, help='output folder')
+    parser.add_argument('--chunk-size', type=int, default=20, help='dates per task (default: 20)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: number of processors)')
+    options = parser.parse_args(args)
+
+    with open(options.template) as f:
+        template = json.load(f)
+    dates = getBusinessDates(options.start, options.end, options.calendar)
+    stats = runBackfill(template, dates, options.market, options.output,
+                        chunkSize=options.chunk_size, maxWorkers=options.workers)
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
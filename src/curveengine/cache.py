@@ -0,0 +1,417 @@
+import json
+import hashlib
+import weakref
+from collections import OrderedDict
+import numpy as np
+import ORE as ore
+from .queries import *
+
+
+class CachedCurve:
+    '''
+    Wrapper of a curve memoizing the discount, zeroRate and forwardRate queries in a bounded LRU cache,
+    keyed by the date serial numbers and the conventions of each query. The cache is cleared whenever the
+    curve notifies its observers, as when it is re-bootstrapped, and when it is relinked to a new curve.
+    Any other attribute is looked up on the wrapped curve.
+
+    Parameters
+    ----------
+    curve : ore.YieldTermStructure
+        The curve.
+    maxSize : int, optional
+        The maximum number of cached queries. The default is 1024.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, curve, maxSize=1024):
+        self.curve = curve
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.__cache = OrderedDict()
+        ref = weakref.ref(self)
+        self.__observer = ore.Observer(lambda: ref() is not None and ref().clear())
+        self.__observer.registerWith(curve)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.curve, name)
+
+    '''
+    Wrap a new curve, clearing the cache.
+
+    Parameters
+    ----------
+    curve : ore.YieldTermStructure
+        The new curve.
+
+    Returns
+    -------
+    None
+    '''
+
+    def relink(self, curve):
+        self.__observer.unregisterWith(self.curve)
+        self.curve = curve
+        self.__observer.registerWith(curve)
+        self.clear()
+
+    def discount(self, *args, **kwargs):
+        return self.__lookup('discount', args, kwargs)
+
+    def zeroRate(self, *args, **kwargs):
+        return self.__lookup('zeroRate', args, kwargs)
+
+    def forwardRate(self, *args, **kwargs):
+        return self.__lookup('forwardRate', args, kwargs)
+
+    '''
+    Clear the cache. The hit and miss counters are kept.
+
+    Returns
+    -------
+    None
+    '''
+
+    def clear(self):
+        self.__cache.clear()
+
+    '''
+    Get the cache statistics.
+
+    Returns
+    -------
+    dict
+        The number of hits ("hits") and misses ("misses"), the maximum size ("maxSize") and the
+        current size ("size") of the cache.
+    '''
+
+    def cacheInfo(self):
+        return {'hits': self.hits, 'misses': self.misses, 'maxSize': self.maxSize, 'size': len(self.__cache)}
+
+    def __lookup(self, method, args, kwargs):
+        key = getQueryKey(method, args, kwargs)
+        if key is None:
+            return getattr(self.curve, method)(*args, **kwargs)
+        if key in self.__cache:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+            return self.__cache[key]
+
+        self.misses += 1
+        value = getattr(self.curve, method)(*args, **kwargs)
+        if self.maxSize > 0:
+            self.__cache[key] = value
+            if len(self.__cache) > self.maxSize:
+                self.__cache.popitem(last=False)
+        return value
+
+
+def getQueryKey(method: str, args: tuple, kwargs: dict):
+    """
+    Get the cache key of a curve query
+
+    Parameters
+    ----------
+    method : str
+        The name of the query method
+    args : tuple
+        The positional arguments of the query
+    kwargs : dict
+        The keyword arguments of the query
+
+    Returns
+    -------
+    tuple or None
+        The key, or None if an argument is not supported, in which case the query is not cached
+    """
+    key = [method]
+    for value in list(args) + [kwargs[name] for name in sorted(kwargs.keys())]:
+        if isinstance(value, ore.Date):
+            key.append(('Date', value.serialNumber()))
+        elif isinstance(value, ore.DayCounter):
+            key.append(('DayCounter', value.name()))
+        elif isinstance(value, ore.Period):
+            key.append(('Period', value.length(), value.units()))
+        elif isinstance(value, (bool, int, float)):
+            key.append((type(value).__name__, value))
+        else:
+            return None
+    return tuple(key) + tuple(sorted(kwargs.keys()))
+
+
+class DiscountGrid:
+    '''
+    Dense daily grid of the discount factors of a curve, for constant time lookups. The grid is a
+    contiguous float64 array indexed by the day offset from the reference date of the curve. It is
+    built on the first lookup and rebuilt lazily on the first lookup after the curve notifies its
+    observers or is relinked. Dates off the grid are interpolated exactly, see CurveSnapshot.
+
+    Parameters
+    ----------
+    curve : ore.YieldTermStructure
+        The curve.
+    source : callable
+        A function returning a CurveSnapshot of the current curve.
+    days : int
+        The number of days of the grid. The grid ends earlier if the curve does not allow extrapolation.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, curve, source, days):
+        self.curve = curve
+        self.source = source
+        self.days = days
+        self.rebuilds = 0
+        self.__values = None
+        self.__snapshot = None
+        self.__refDate = None
+        ref = weakref.ref(self)
+        self.__observer = ore.Observer(lambda: ref() is not None and ref().invalidate())
+        self.__observer.registerWith(curve)
+
+    '''
+    Follow a new curve, invalidating the grid.
+
+    Parameters
+    ----------
+    curve : ore.YieldTermStructure
+        The new curve.
+
+    Returns
+    -------
+    None
+    '''
+
+    def relink(self, curve):
+        self.__observer.unregisterWith(self.curve)
+        self.curve = curve
+        self.__observer.registerWith(curve)
+        self.invalidate()
+
+    '''
+    Invalidate the grid, so it is rebuilt on the next lookup.
+
+    Returns
+    -------
+    None
+    '''
+
+    def invalidate(self):
+        self.__values = None
+        self.__snapshot = None
+
+    '''
+    Get the discount factors at many dates.
+
+    Parameters
+    ----------
+    dates : array_like
+        The dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+
+    Returns
+    -------
+    np.ndarray
+        The discount factors, with the shape of dates.
+    '''
+
+    def discounts(self, dates):
+        values = self.values()
+        offsets = toSerials(dates) - self.__refDate
+        onGrid = (offsets >= 0) & (offsets < len(values))
+        if np.all(onGrid):
+            return values[offsets]
+        discounts = np.empty(offsets.shape)
+        discounts[onGrid] = values[offsets[onGrid]]
+        discounts[~onGrid] = self.__snapshot.discounts(offsets[~onGrid] + self.__refDate)
+        return discounts
+
+    '''
+    Get the discount factor at a single date.
+
+    Parameters
+    ----------
+    date : int or ore.Date
+        The date, as a serial number or an ore.Date.
+
+    Returns
+    -------
+    float
+        The discount factor.
+    '''
+
+    def discount(self, date):
+        values = self.values()
+        serial = date.serialNumber() if isinstance(date, ore.Date) else int(date)
+        offset = serial - self.__refDate
+        if 0 <= offset < len(values):
+            return float(values[offset])
+        return float(self.__snapshot.discounts(serial))
+
+    '''
+    Get the grid, building it if needed.
+
+    Returns
+    -------
+    np.ndarray
+        The discount factors of the grid, a read-only array indexed by the day offset from the
+        reference date.
+    '''
+
+    def values(self):
+        if self.__values is None:
+            snapshot = self.source()
+            days = self.days
+            if not snapshot.extrapolation:
+                days = min(days, int(snapshot.serials[-1] - snapshot.refDate) + 1)
+            values = snapshot.discounts(np.arange(snapshot.refDate, snapshot.refDate + days))
+            values.flags.writeable = False
+            self.__snapshot = snapshot
+            self.__refDate = snapshot.refDate
+            self.__values = values
+            self.rebuilds += 1
+        return self.__values
+
+
+def getCurveHash(curve: dict, refDate: ore.Date, upstream: dict) -> str:
+    """
+    Get the structural hash of a curve, from its canonicalized configuration, the reference date and
+    the hashes of the curves it depends on. Curves with the same hash bootstrap to the same nodes.
+
+    Parameters
+    ----------
+    curve : dict
+        The curve configuration, with its market values
+    refDate : ore.Date
+        The reference date
+    upstream : dict
+        The hash of each curve the curve depends on, by curve name
+
+    Returns
+    -------
+    str
+        The hash, as a hexadecimal SHA-256 digest
+    """
+    canonical = json.dumps([refDate.serialNumber(), curve, sorted(upstream.items())],
+                           sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class BuildCache:
+    '''
+    In-process cache of bootstrapped curves, keyed by their structural hash, see getCurveHash. Each entry
+    keeps the nodes of a curve, as arrays of date serial numbers and discount factors, so engines built
+    on the same curves, even partially, take them from the cache instead of bootstrapping them again.
+    The least recently used entries are evicted beyond maxSize entries or maxBytes bytes of nodes.
+
+    Parameters
+    ----------
+    maxSize : int, optional
+        The maximum number of entries. The default is 1024.
+    maxBytes : int, optional
+        The maximum size of the nodes of all the entries, in bytes. The default is 16 MiB.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, maxSize=1024, maxBytes=16 * 2 ** 20):
+        self.maxSize = maxSize
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self.__entries = OrderedDict()
+
+    '''
+    Get the nodes of a curve.
+
+    Parameters
+    ----------
+    key : str
+        The hash of the curve.
+
+    Returns
+    -------
+    tuple or None
+        The date serial numbers and the discount factors of the nodes, as read-only arrays, or None if
+        the curve is not cached.
+    '''
+
+    def get(self, key):
+        if key not in self.__entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key]
+
+    '''
+    Add the nodes of a curve, evicting the least recently used entries if needed.
+
+    Parameters
+    ----------
+    key : str
+        The hash of the curve.
+    nodes : list
+        The nodes, as (ore.Date, discount factor) pairs.
+
+    Returns
+    -------
+    None
+    '''
+
+    def put(self, key, nodes):
+        serials = np.array([date.serialNumber() for date, _ in nodes], dtype=np.int64)
+        values = np.array([value for _, value in nodes], dtype=np.float64)
+        serials.flags.writeable = False
+        values.flags.writeable = False
+        if key in self.__entries:
+            self.bytes -= self.__sizeOf(self.__entries.pop(key))
+        entry = (serials, values)
+        self.__entries[key] = entry
+        self.bytes += self.__sizeOf(entry)
+        while self.__entries and (len(self.__entries) > self.maxSize or self.bytes > self.maxBytes):
+            self.bytes -= self.__sizeOf(self.__entries.popitem(last=False)[1])
+
+    '''
+    Clear the cache. The hit and miss counters are kept.
+
+    Returns
+    -------
+    None
+    '''
+
+    def clear(self):
+        self.__entries.clear()
+        self.bytes = 0
+
+    '''
+    Get the cache statistics.
+
+    Returns
+    -------
+    dict
+        The number of hits ("hits") and misses ("misses"), the maximum size ("maxSize") and the current
+        size ("size") of the cache, in entries, and the maximum size ("maxBytes") and the current size
+        ("bytes") of the nodes, in bytes.
+    '''
+
+    def cacheInfo(self):
+        return {'hits': self.hits, 'misses': self.misses, 'maxSize': self.maxSize, 'size': len(self.__entries),
+                'maxBytes': self.maxBytes, 'bytes': self.bytes}
+
+    def __sizeOf(self, entry):
+        return entry[0].nbytes + entry[1].nbytes
+
+
+# the cache shared by the engines of the process, see CurveEngine
+BUILD_CACHE = BuildCache()
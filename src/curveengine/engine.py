@@ -1,8 +1,20 @@
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
 from .parsing.parsers import *
 from .parsing.enums import *
 from .parsing.others import *
 from .parsing.ratehelpers import *
 from .parsing.checks import *
+from .parsing.market import *
+from .parsing.configuration import *
+from .parsing.registry import *
+from .parsing.definitions import *
+from .parsing.loader import *
+from .parsing.serialization import *
+from .queries import *
+from .snapshot import *
+from .cache import *
 
 
 class CurveEngine:
@@ -11,25 +23,206 @@ class CurveEngine:
 
     Parameters
     ----------
-    data : dict
-        The JSON configuration file as a dictionary.
+    data : dict or CurveSetFile
+        The JSON configuration file as a dictionary, or a curve set file indexed by CurveSetFile, whose
+        curves are only read when used in lazy mode.
     curves : dict, optional
         A dictionary of curves to be populated by the engine. The default is None.
     indexes : dict, optional
         A dictionary of indexes to be populated by the engine. The default is None.
+    quotes : dict, optional
+        A dictionary of quotes by ticker to be populated by the engine. Rate helpers sharing a ticker
+        share the same quote. The default is None.
+    template : bool, optional
+        If True, the configuration is a template whose market values may be left out. The template is
+        validated on construction and its curves are built on the first call to bindMarket, which
+        binds the market values by ticker. The default is False.
+    parallel : bool, optional
+        If True, independent curves are bootstrapped in parallel in worker processes, one level of the
+        dependency graph at a time. Upstream curves are sent to the workers as discount factor nodes and
+        the engine curves are built from the bootstrapped nodes, so they do not follow quote updates;
+        use update with new curve configurations instead, whose affected curves are bootstrapped in the
+        workers as well. The worker processes are kept for the life of the engine and released by close,
+        or on exit when the engine is used as a context manager. The default is False.
+    maxWorkers : int, optional
+        The maximum number of worker processes in parallel mode. The default is None, the number of
+        processors.
+    cacheSize : int, optional
+        The number of discount, zero rate and forward rate queries memoized per curve by the CachedCurve
+        wrappers of getCachedCurve. The default is None, the default size of CachedCurve.
+    gridBudget : int, optional
+        The memory budget, in bytes, of the daily discount grids of the curves, see getDiscountGrid.
+        The default is 64 MiB.
+    buildCache : BuildCache, optional
+        A cache of bootstrapped curves, keyed by their structural hash, see getCurveHash. The curves found in
+        the cache are built from their cached nodes as discount curves instead of being bootstrapped, and
+        the bootstrapped curves are added to it. A curve built from the cache is bootstrapped from its
+        configuration when one of its quotes or upstream curves changes. BUILD_CACHE is shared by the
+        engines of the process. The default is None, no cache.
+    lazy : bool, optional
+        If True, construction only indexes the configuration and builds the dependency graph, see
+        indexConfiguration. Each curve is checked, parsed and built with its upstream curves on first
+        use, by getCurve, getIndex or any query on it, and kept afterwards; setting the quote of a curve
+        not built yet builds it. Not supported for templates. The default is False.
 
     Returns
     -------
     None
+
+    Notes
+    -----
+    The curves are bootstrapped with the reference date of the configuration as evaluation date and
+    frozen, so engines with different reference dates can coexist in the same process. The global
+    evaluation date is only set while the engine builds or updates its curves, and restored afterwards.
+    Queries depending on the evaluation date, such as index fixings, should be done within scope.
+    Configurations differing only in their market values are checked and parsed once per process, see
+    StructureCache; the next ones only have their market values checked.
     '''
 
-    def __init__(self, data, curves=None, indexes=None):
+    def __init__(self, data, curves=None, indexes=None, quotes=None, template=False, parallel=False, maxWorkers=None,
+                 cacheSize=None, gridBudget=64 * 2 ** 20, buildCache=None, lazy=False):
         self.curveHandles = {None: ore.RelinkableYieldTermStructureHandle()}
         self.curves = {} if curves is None else curves
         self.indexes = {} if indexes is None else indexes
-        localData = data.copy()
-        checkConfiguration(localData)
-        self.__initialize(localData)
+        self.quotes = {} if quotes is None else quotes
+        self.tickerCurves = {}
+        self.curveConfigs = {}
+        self.curvePointers = {}
+        self.curveTickers = {}
+        self.conventions = {}
+        self.parsedCurves = {}
+        self.curveDependencies = {}
+        self.dependencies = {}
+        self.dependents = {}
+        self.sortedCurves = []
+        self.__built = False
+        self.parallel = parallel
+        self.maxWorkers = maxWorkers
+        self.cacheSize = cacheSize
+        self.cachedCurves = {}
+        self.gridBudget = gridBudget
+        self.discountGrids = {}
+        # the snapshots of the curves used by the queries, dropped when a curve is rebuilt or recalculated
+        self.curveSnapshots = {}
+        self.buildCache = buildCache
+        self.curveHashes = {}
+        self.nodeCurves = set()
+        # the seconds spent building and bootstrapping each curve, the last time it was bootstrapped
+        self.bootstrapTimes = {}
+        self.__buildTimes = {}
+        self.__executor = None
+        self.__externalTickers = set(self.quotes.keys())
+        # the tickers whose quote values override the ones of the configuration
+        self.__boundTickers = set(self.__externalTickers)
+        self.lazy = lazy
+        if lazy:
+            if template:
+                raise ValueError('Template engines cannot be lazy')
+            localData = None
+            configuration = data.getConfiguration() if isinstance(data, CurveSetFile) else indexConfiguration(data)
+        else:
+            localData = resolveConventions(data.load() if isinstance(data, CurveSetFile) else data.copy())
+            configuration = parseConfiguration(localData, template=template)
+        self.__initialize(localData, configuration, template)
+
+    '''
+    Build a curve set against several market snapshots. The structure is validated, parsed and
+    built once; each snapshot only relinks the quotes of the rate helpers before bootstrapping.
+
+    Parameters
+    ----------
+    template : dict
+        The configuration, as a template, see CurveEngine.
+    snapshots : iterable
+        The market snapshots, each one a quote table as accepted by readQuoteTable. Each snapshot
+        is bound over the values given in the template, if any.
+
+    Returns
+    -------
+    list
+        For each snapshot, a dictionary with the curve name as key and the curve nodes, as a list
+        of (date, discount factor) pairs, as value.
+
+    Raises
+    ------
+    MarketConfigurationError
+        If a snapshot leaves a ticker of the curve set without a value
+    '''
+
+    @staticmethod
+    def buildMany(template, snapshots):
+        engine = CurveEngine(template, template=True)
+        base = {}
+        for curve in engine.curveConfigs.values():
+            base.update(getMarketQuotes(curve))
+
+        results = []
+        for pos, snapshot in enumerate(snapshots):
+            market = {**base, **readQuoteTable(snapshot)}
+            engine.bindMarket(market)
+            missing = sorted(engine.quotes.keys() - market.keys())
+            if missing:
+                raise MarketConfigurationError(
+                    'Missing tickers in snapshot {}: {}'.format(pos, ', '.join(missing)))
+            results.append({curveName: list(engine.curves[curveName].nodes())
+                            for curveName in engine.sortedCurves})
+        return results
+
+    '''
+    Build an engine from a JSON configuration, decoded with the JSON backend in use, see setJSONBackend.
+
+    Parameters
+    ----------
+    data : bytes or str
+        The JSON configuration, see CurveEngine.
+    **kwargs
+        The other arguments of CurveEngine.
+
+    Returns
+    -------
+    CurveEngine
+        The engine.
+    '''
+
+    @staticmethod
+    def fromJSON(data, **kwargs):
+        return CurveEngine(loadJSON(data), **kwargs)
+
+    '''
+    Encode the curves as a JSON configuration of discount curves with their bootstrapped nodes, see
+    createDiscountCurveConfig, from which CurveEngine builds curves with the same discount factors. The
+    JSON backend in use is used, see setJSONBackend.
+
+    Parameters
+    ----------
+    curveNames : list, optional
+        The names of the curves. The default is None, all the curves.
+    fields : dict, optional
+        Additional top-level fields of the configuration, e.g. curveSetName. The default is None.
+
+    Returns
+    -------
+    bytes
+        The UTF-8 encoded configuration, with the curves in topological order.
+    '''
+
+    def toJSON(self, curveNames=None, fields=None):
+        curveNames = self.sortedCurves if curveNames is None else curveNames
+        self.__buildLazyCurves(curveNames)
+        for curveName in curveNames:
+            if curveName not in self.curves.keys() or curveName not in self.curveConfigs.keys():
+                raise KeyError('Unknown curve: {}'.format(curveName))
+        curveNames = set(curveNames)
+        curves = []
+        with self.scope():
+            for curveName in self.sortedCurves:
+                if curveName not in curveNames:
+                    continue
+                nodes = [{'date': parseOREDate(date), 'value': value}
+                         for date, value in self.curves[curveName].nodes()]
+                curves.append(createDiscountCurveConfig(self.curveConfigs[curveName], nodes))
+        return dumpJSON({**({} if fields is None else fields), 'refDate': parseOREDate(self.refDate),
+                         'curves': curves})
 
     '''
     Get a curve by name.
@@ -46,8 +239,80 @@ class CurveEngine:
     '''
 
     def getCurve(self, curveName):
+        self.__buildLazyCurves([curveName])
         return self.curves[curveName]
 
+    '''
+    Get a curve by name, wrapped in a CachedCurve memoizing its discount, zero rate and forward rate
+    queries. The wrapper is kept by the engine and follows the rebuilds of the curve.
+
+    Parameters
+    ----------
+    curveName : str
+        The name of the curve to get.
+
+    Returns
+    -------
+    CachedCurve
+        The cached curve with the given name.
+    '''
+
+    def getCachedCurve(self, curveName):
+        curve = self.getCurve(curveName)
+        if curveName not in self.cachedCurves.keys():
+            self.cachedCurves[curveName] = CachedCurve(curve) if self.cacheSize is None else \
+                CachedCurve(curve, self.cacheSize)
+        return self.cachedCurves[curveName]
+
+    '''
+    Get the query cache statistics of the curves, see CachedCurve.
+
+    Returns
+    -------
+    dict
+        The cache statistics by curve name, for the curves queried through getCachedCurve.
+    '''
+
+    def cacheInfo(self):
+        return {curveName: cachedCurve.cacheInfo() for curveName, cachedCurve in self.cachedCurves.items()}
+
+    '''
+    Get a dense daily grid of the discount factors of a curve, for constant time lookups, see
+    DiscountGrid. The grid is sized within the grid budget of the engine: if the budget left by the
+    other grids is short, the horizon is shortened and later dates are interpolated exactly.
+
+    Parameters
+    ----------
+    curveName : str
+        The name of the curve.
+    horizon : str, optional
+        The horizon of the grid, as a period from the reference date. The default is 50Y.
+
+    Returns
+    -------
+    DiscountGrid
+        The discount grid of the curve.
+
+    Raises
+    ------
+    MemoryError
+        If the grid budget is exhausted
+    '''
+
+    def getDiscountGrid(self, curveName, horizon='50Y'):
+        self.__buildLazyCurves([curveName])
+        curve = self.curves[curveName]
+        days = (self.refDate + parsePeriod(horizon)).serialNumber() - self.refDate.serialNumber() + 1
+        used = sum(8 * grid.days for name, grid in self.discountGrids.items() if name != curveName)
+        days = min(days, (self.gridBudget - used) // 8)
+        if days <= 0:
+            raise MemoryError('Discount grid budget exhausted for curve {}'.format(curveName))
+        grid = self.discountGrids.get(curveName)
+        if grid is None or grid.days != days:
+            grid = DiscountGrid(curve, lambda: self.__snapshotCurve(curveName), days)
+            self.discountGrids[curveName] = grid
+        return grid
+
     '''
     Get an index by name.
 
@@ -63,32 +328,725 @@ class CurveEngine:
     '''
 
     def getIndex(self, indexName):
+        self.__buildLazyCurves([indexName])
         return self.indexes[indexName]
 
-    def __initialize(self, data):
-        refDate = parseDate(data['refDate'])
-        ore.Settings.instance().evaluationDate = refDate
+    '''
+    Get a quote by ticker.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the quote to get.
+
+    Returns
+    -------
+    ore.SimpleQuote
+        The quote with the given ticker.
+    '''
+
+    def getQuote(self, ticker):
+        return self.quotes[ticker]
+
+    '''
+    Get the tickers known to the engine among the given ones. In lazy mode, the curves quoting them
+    are built first.
+
+    Parameters
+    ----------
+    tickers : iterable
+        The tickers to look up.
+
+    Returns
+    -------
+    list
+        The known tickers, in the given order.
+    '''
+
+    def getKnownTickers(self, tickers):
+        tickers = list(tickers)
+        self.__buildTickerCurves(tickers)
+        return [ticker for ticker in tickers if ticker in self.quotes.keys()]
+
+    '''
+    Get a context manager setting the evaluation date to the reference date of the engine, restoring
+    the previous evaluation date on exit.
+
+    Returns
+    -------
+    contextmanager
+        The evaluation date scope, see evaluationDateScope.
+    '''
+
+    def scope(self):
+        return evaluationDateScope(self.refDate)
+
+    '''
+    Release the worker processes of the parallel mode, if any. The engine can still be used, new
+    worker processes are started when needed.
+
+    Returns
+    -------
+    None
+    '''
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    '''
+    Get the discount factors of a curve at many dates. The log-linear interpolation of the curve is
+    evaluated in NumPy from the bootstrapped nodes, matching the values of the curve. The nodes are
+    read once per curve and kept until the curve is rebuilt or its quotes change.
+
+    Parameters
+    ----------
+    curveName : str
+        The name of the curve.
+    dates : array_like
+        The dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+
+    Returns
+    -------
+    np.ndarray
+        The discount factors, with the shape of dates.
+    '''
+
+    def discounts(self, curveName, dates):
+        return self.__snapshotCurve(curveName).discounts(dates)
+
+    '''
+    Get the zero rates of a curve at many dates, see discounts.
+
+    Parameters
+    ----------
+    curveName : str
+        The name of the curve.
+    dates : array_like
+        The dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+    dayCounter : ore.DayCounter, optional
+        The day counter of the rates. The default is None, the day counter of the curve.
+    compounding : int, optional
+        The ORE compounding of the rates. The default is ore.Continuous.
+    frequency : int, optional
+        The ORE frequency of the rates. The default is ore.Annual.
+
+    Returns
+    -------
+    np.ndarray
+        The zero rates, with the shape of dates.
+    '''
+
+    def zeroRates(self, curveName, dates, dayCounter=None, compounding=ore.Continuous, frequency=ore.Annual):
+        return self.__snapshotCurve(curveName).zeroRates(dates, dayCounter, compounding, frequency)
+
+    '''
+    Get the forward rates of a curve between many pairs of dates, see discounts.
+
+    Parameters
+    ----------
+    curveName : str
+        The name of the curve.
+    startDates : array_like
+        The start dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+    endDates : array_like
+        The end dates, in the same formats.
+    dayCounter : ore.DayCounter, optional
+        The day counter of the rates. The default is None, the day counter of the curve.
+    compounding : int, optional
+        The ORE compounding of the rates. The default is ore.Continuous.
+    frequency : int, optional
+        The ORE frequency of the rates. The default is ore.Annual.
+
+    Returns
+    -------
+    np.ndarray
+        The forward rates, with the broadcast shape of the start and end dates.
+    '''
+
+    def forwardRates(self, curveName, startDates, endDates, dayCounter=None, compounding=ore.Continuous,
+                     frequency=ore.Annual):
+        return self.__snapshotCurve(curveName).forwardRates(
+            startDates, endDates, dayCounter, compounding, frequency)
+
+    '''
+    Project the fixings of an index at many fixing dates, as the fixing method of the index for future
+    fixings. The value and maturity dates follow the fixing calendar, fixing days, tenor and conventions
+    of the index, and the forwards are computed from the node arrays of the linked curve.
+
+    Parameters
+    ----------
+    indexName : str
+        The name of the index.
+    fixingDates : array_like
+        The fixing dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+        They must be valid fixing dates, not earlier than the reference date.
+
+    Returns
+    -------
+    np.ndarray
+        The projected fixings, with the shape of fixingDates.
+    '''
+
+    def indexForwards(self, indexName, fixingDates):
+        self.__buildLazyCurves([indexName])
+        index = self.indexes[indexName]
+        snapshot = self.__snapshotCurve(indexName)
+        fixingSerials = toSerials(fixingDates)
+        if np.any(fixingSerials < snapshot.refDate):
+            raise ValueError('{}: past fixings are not projected'.format(indexName))
+        valueSerials, maturitySerials = indexFixingPeriods(index, fixingSerials)
+        return (snapshot.discounts(valueSerials) / snapshot.discounts(maturitySerials) - 1.0) / \
+            yearFractions(index.dayCounter(), valueSerials, maturitySerials)
+
+    '''
+    Project the compounded rates of an index over many periods. For an overnight index, it is the
+    compounded rate of the daily fixings over each period, with the start and end dates adjusted to
+    the fixing calendar of the index, as an overnight indexed coupon; for an ibor index, it is the
+    forward rate over each period. Rates accrue with the day counter of the index.
+
+    Parameters
+    ----------
+    indexName : str
+        The name of the index.
+    startDates : array_like
+        The start dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+        They must not be earlier than the reference date.
+    endDates : array_like
+        The end dates, in the same formats, later than the start dates.
+
+    Returns
+    -------
+    np.ndarray
+        The compounded rates, with the broadcast shape of the start and end dates.
+    '''
+
+    def compoundedRates(self, indexName, startDates, endDates):
+        self.__buildLazyCurves([indexName])
+        index = self.indexes[indexName]
+        snapshot = self.__snapshotCurve(indexName)
+        startSerials, endSerials = np.broadcast_arrays(toSerials(startDates), toSerials(endDates))
+        if np.any(startSerials >= endSerials):
+            raise ValueError('Start dates must be earlier than end dates')
+        if np.any(startSerials < snapshot.refDate):
+            raise ValueError('{}: past fixings are not projected'.format(indexName))
+        if startSerials.size == 0:
+            return np.zeros(startSerials.shape)
+        busdaycal = createBusinessCalendar(
+            index.fixingCalendar(), startSerials.min(), endSerials.max() + 40)
+        compound = snapshot.discounts(adjustSerials(startSerials, ore.Following, busdaycal)) / \
+            snapshot.discounts(adjustSerials(endSerials, ore.Following, busdaycal))
+        return (compound - 1.0) / yearFractions(index.dayCounter(), startSerials, endSerials)
+
+    '''
+    Get the FX spot rates of the FX swap rate helpers of the curves, see getFxPairs. Quoted prices take
+    the current value of their quote.
+
+    Returns
+    -------
+    dict
+        The number of units of the quote currency per unit of the base currency, by (base, quote)
+        currency pair.
+    '''
+
+    def getFxRates(self):
+        pairs = getFxPairs({'curves': list(self.curveConfigs.values())})
+        rates = {}
+        for pair, price in pairs.items():
+            ticker = price.get('ticker')
+            rates[pair] = self.quotes[ticker].value() if ticker in self.quotes.keys() else price['value']
+        return rates
+
+    '''
+    Compute the present values of a table of cashflows. Rows are grouped by curve and discounted in
+    NumPy, see discounts.
+
+    Parameters
+    ----------
+    cashflows : dict or np.ndarray
+        The cashflows, as a dictionary of columns or a NumPy structured array, with the columns:
+        - date: the payment dates, in any format accepted by discounts
+        - amount: the amounts
+        - curveName: the names of the discount curves
+        - currency (optional): the currencies of the amounts, by default the currencies of the curves
+    currency : str, optional
+        The reporting currency. If given, the present values are converted with the FX spot rates of
+        the curves, see getFxRates. The default is None, no conversion.
+    fxRates : dict, optional
+        Additional FX rates by (base, quote) currency pair, overriding those of the curves. The
+        default is None.
+
+    Returns
+    -------
+    dict
+        The present values of the rows ("pv"), in the reporting currency if given, and their totals by
+        curve ("byCurve"), by currency of the cashflows ("byCurrency", before conversion) and overall
+        ("total", None without a reporting currency).
+    '''
+
+    def pv(self, cashflows, currency=None, fxRates=None):
+        names = cashflows.dtype.names if isinstance(cashflows, np.ndarray) else cashflows.keys()
+        for name in ['date', 'amount', 'curveName']:
+            if name not in names:
+                raise KeyError('Missing cashflow column: {}'.format(name))
+        dates = toSerials(cashflows['date'])
+        amounts = np.asarray(cashflows['amount'], dtype=np.float64)
+        curveNames, curveRows = np.unique(np.asarray(cashflows['curveName']).astype(str), return_inverse=True)
+        self.__buildLazyCurves(curveNames)
+        for curveName in curveNames:
+            if curveName not in self.curves.keys():
+                raise KeyError('Unknown curve: {}'.format(curveName))
+
+        values = np.empty(amounts.shape)
+        for i, curveName in enumerate(curveNames):
+            rows = curveRows == i
+            values[rows] = amounts[rows] * self.__snapshotCurve(curveName).discounts(dates[rows])
+
+        if 'currency' in names:
+            currencies, currencyRows = np.unique(np.asarray(cashflows['currency']).astype(str),
+                                                 return_inverse=True)
+        else:
+            curveCurrencies = [self.curveConfigs[curveName]['curveConfig']['currency']
+                               for curveName in curveNames]
+            currencies, currencyRows = np.unique(np.array(curveCurrencies, dtype=str)[curveRows],
+                                                 return_inverse=True)
+        byCurrency = {str(ccy): float(values[currencyRows == i].sum()) for i, ccy in enumerate(currencies)}
+
+        total = None
+        if currency is not None:
+            rates = {**self.getFxRates(), **({} if fxRates is None else fxRates)}
+            fx = np.array([1.0 if ccy == currency else getFxRate(rates, ccy, currency) for ccy in currencies])
+            values = values * fx[currencyRows]
+            total = float(values.sum())
+        return {
+            'pv': values,
+            'byCurve': {str(curveName): float(values[curveRows == i].sum()) for i, curveName in enumerate(curveNames)},
+            'byCurrency': byCurrency,
+            'total': total
+        }
+
+    '''
+    Take immutable, array-backed snapshots of the curves, see CurveSnapshot.
+
+    Parameters
+    ----------
+    curveNames : list, optional
+        The names of the curves. The default is None, all the curves.
+
+    Returns
+    -------
+    dict
+        The snapshots by curve name, in topological order.
+    '''
+
+    def snapshot(self, curveNames=None):
+        curveNames = self.sortedCurves if curveNames is None else curveNames
+        self.__buildLazyCurves(curveNames)
+        for curveName in curveNames:
+            if curveName not in self.curves.keys():
+                raise KeyError('Unknown curve: {}'.format(curveName))
+        return {curveName: self.__snapshotCurve(curveName)
+                for curveName in self.sortedCurves if curveName in curveNames}
+
+    '''
+    Set the value of a quote by ticker. Curves built on the quote, and the ones downstream, are
+    re-bootstrapped.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the quote to set.
+    value : float
+        The new value of the quote.
+
+    Returns
+    -------
+    None
+    '''
+
+    def setQuote(self, ticker, value):
+        self.__buildTickerCurves([ticker])
+        if ticker not in self.quotes.keys():
+            raise KeyError('Unknown ticker: {}'.format(ticker))
+        self.applyMarket({ticker: value})
+
+    '''
+    Apply a market snapshot as a single update. The values are set while the curves are frozen, and
+    the affected curves are then re-bootstrapped in topological order, so each one notifies its
+    observers only once.
+
+    Parameters
+    ----------
+    market : dict
+        A dictionary of values by ticker.
+
+    Returns
+    -------
+    list
+        The names of the curves invalidated by the update, directly or through their dependencies,
+        in topological order.
+    '''
+
+    def applyMarket(self, market):
+        self.__buildTickerCurves(market.keys())
+        unknown = [ticker for ticker in market.keys() if ticker not in self.quotes.keys()]
+        if unknown:
+            raise KeyError('Unknown tickers: {}'.format(', '.join(unknown)))
+
+        with self.scope():
+            invalidated = self.__setQuotes(market)
+            for curveName in invalidated:
+                self.curveHashes.pop(curveName, None)
+                if curveName in self.nodeCurves:
+                    self.__buildCurve(self.parsedCurves[curveName])
+            self.__anchorCurves(invalidated)
+        return invalidated
+
+    '''
+    Bind market data from a flat table of quotes by ticker. Typically used with template engines,
+    whose configuration is validated and parsed once and then bound to each new market.
+
+    Parameters
+    ----------
+    table : dict, tuple or str
+        The quote table, see readQuoteTable for the supported formats.
+
+    Returns
+    -------
+    dict
+        A report with the invalidated curves ("invalidated"), the tickers of the engine left without
+        a value ("missing") and the tickers of the table not used by the engine ("unused").
+    '''
+
+    def bindMarket(self, table):
+        table = readQuoteTable(table)
+        if self.__built:
+            bound = table.keys() & self.quotes.keys()
+            invalidated = self.applyMarket({ticker: table[ticker] for ticker in bound})
+        else:
+            # first binding of a template, the curves are built on the bound values
+            self.__buildCurves(table)
+            bound = table.keys() & self.quotes.keys()
+            invalidated = list(self.sortedCurves)
+        return {
+            'invalidated': invalidated,
+            'missing': sorted(ticker for ticker, quote in self.quotes.items()
+                              if ticker not in bound and math.isnan(quote.value())),
+            'unused': sorted(table.keys() - bound)
+        }
+
+    '''
+    Update quotes and curve configurations, re-bootstrapping only the curves affected by the changes.
+    Curves with a new configuration are rebuilt and their quoted values applied; curves downstream of
+    a changed quote or curve are recalculated, in topological order. Curves downstream of a changed
+    index are rebuilt as well, since their rate helpers hold the index.
+
+    Parameters
+    ----------
+    market : dict, optional
+        A dictionary of values by ticker. The default is None.
+    curves : list, optional
+        A list of curve configurations, replacing the ones with the same curve name. Their rate helpers
+        may reference the conventions of the configuration, see resolveConventions. The default is None.
+
+    Returns
+    -------
+    list
+        The names of the re-bootstrapped curves, in topological order.
+    '''
+
+    def update(self, market=None, curves=None):
+        market = {} if market is None else market
+        curves = [] if curves is None else curves
+        self.__buildTickerCurves(market.keys())
+        unknown = [ticker for ticker in market.keys() if ticker not in self.quotes.keys()]
+        if unknown:
+            raise KeyError('Unknown tickers: {}'.format(', '.join(unknown)))
+        curves = [resolveCurve(curve, self.conventions, '/{}'.format(pos)) for pos, curve in enumerate(curves)]
+        parsedCurves = []
+        for pos, curve in enumerate(curves):
+            parsedCurves.append(parseCurve(curve, '/{}'.format(pos)))
+            if curve['curveName'] not in self.curveConfigs.keys():
+                raise KeyError('Unknown curve: {}'.format(curve['curveName']))
+
+        changedIndexes = set()
+        for curve, (parsed, deps) in zip(curves, parsedCurves):
+            curveName = curve['curveName']
+            if curve['curveIndex'] != self.curveConfigs[curveName]['curveIndex']:
+                changedIndexes.add(curveName)
+            self.curveConfigs[curveName] = curve
+            self.parsedCurves[curveName] = parsed
+            self.curveDependencies[curveName] = deps
+            if self.lazy:
+                self.curveTickers[curveName] = getTickers(curve)
+        if curves:
+            self.__buildDependencies()
+
+        values = {}
+        for curve in curves:
+            values.update(getMarketQuotes(curve))
+        values = {ticker: value for ticker, value in values.items()
+                  if ticker in self.quotes.keys()}
+        values.update(market)
+
+        with self.scope():
+            return self.__rebuildCurves(values, curves, changedIndexes)
+
+    def __rebuildCurves(self, values, curves, changedIndexes):
+        invalidated = self.__setQuotes(values)
+        dirty = getDownstreamCurves(
+            self.dependents, invalidated + [curve['curveName'] for curve in curves])
+        toRebuild = getDownstreamCurves(self.dependents, changedIndexes)
+        toRebuild.update(curve['curveName'] for curve in curves)
+        snapshots = {}
+        if self.parallel:
+            # curves built from nodes do not follow their dependencies
+            toRebuild.update(dirty)
+            snapshots = self.__bootstrapParallel(None, {}, [curveName for curveName in self.sortedCurves
+                                                            if curveName in dirty and curveName in self.curves.keys()])
+        toRebuild.update(dirty & self.nodeCurves)
+
+        rebuilt = []
+        for curveName in self.sortedCurves:
+            if curveName not in dirty:
+                continue
+            self.curveHashes.pop(curveName, None)
+            if self.lazy and curveName not in self.curves.keys():
+                # built on first use with its new configuration
+                continue
+            if curveName in toRebuild:
+                parsed = self.parsedCurves[curveName]
+                if curveName in changedIndexes:
+                    self.__buildIndexes(parsed)
+                self.__buildCurve(parse(**snapshots[curveName]) if curveName in snapshots.keys() else parsed)
+            rebuilt.append(curveName)
+        self.__anchorCurves(rebuilt)
+        return rebuilt
+
+    def __snapshotCurve(self, curveName):
+        snapshot = self.curveSnapshots.get(curveName)
+        if snapshot is None:
+            self.__buildLazyCurves([curveName])
+            with self.scope():
+                snapshot = createCurveSnapshot(curveName, self.curves[curveName])
+            self.curveSnapshots[curveName] = snapshot
+        return snapshot
+
+    def __setQuotes(self, market):
+        changed = [ticker for ticker, value in market.items()
+                   if self.quotes[ticker].value() != value]
+        affected = set()
+        for ticker in changed:
+            affected.update(self.tickerCurves.get(ticker, ()))
+        for ticker in changed:
+            self.quotes[ticker].setValue(market[ticker])
+        self.__boundTickers.update(changed)
+        downstream = getDownstreamCurves(self.dependents, affected)
+        return [name for name in self.sortedCurves if name in downstream and name in self.curves.keys()]
+
+    def __anchorCurves(self, curveNames):
+        # bootstrap and freeze, so the curves no longer follow the global evaluation date
+        for curveName in curveNames:
+            self.curveSnapshots.pop(curveName, None)
+            curve = self.curves[curveName]
+            seconds = self.__buildTimes.pop(curveName, 0.0)
+            if not isinstance(curve, ore.PiecewiseLogLinearDiscount):
+                self.bootstrapTimes[curveName] = seconds
+                continue
+            start = time.perf_counter()
+            try:
+                curve.recalculate()
+            except RuntimeError:
+                # left lazy, so the error is raised again when the curve is used
+                curve.unfreeze()
+                continue
+            finally:
+                self.bootstrapTimes[curveName] = seconds + time.perf_counter() - start
+            curve.freeze()
+
+    def __initialize(self, data, configuration, template):
+        self.refDate = configuration['refDate']
+        self.curveDependencies = configuration['dependencies']
+        self.conventions = configuration['conventions']
+        self.__buildDependencies()
+        if self.lazy:
+            # the raw curves, read from their file on first use if loaded with CurveSetFile
+            self.curveConfigs = configuration['curves']
+            self.curvePointers = configuration['pointers']
+            self.curveTickers = configuration['tickers']
+            self.__built = True
+            return
 
-        tmpData = {}
         for curve in data['curves']:
             curveName = curve['curveName']
-            tmpData[curveName] = curve
+            self.curveConfigs[curveName] = curve
+        self.parsedCurves = configuration['curves']
+        if not template:
+            self.__buildCurves()
 
-        dependencies = getDependencyList(data)
-        sortedList = topologicalSort(dependencies)
-        for curveName in sortedList:
-            parsed = parse(**tmpData[curveName])
+    def __buildLazyCurves(self, curveNames):
+        # parse and build the curves not built yet, with their upstream curves
+        if not self.lazy:
+            return
+        pending = [curveName for curveName in curveNames
+                   if curveName in self.curveConfigs.keys() and curveName not in self.curves.keys()]
+        if not pending:
+            return
+        upstream = getDownstreamCurves(self.dependencies, pending)
+        toBuild = [curveName for curveName in self.sortedCurves
+                   if curveName in upstream and curveName not in self.curves.keys()]
+        for curveName in toBuild:
+            if curveName not in self.parsedCurves.keys():
+                self.parsedCurves[curveName], _ = parseCurve(
+                    self.curveConfigs[curveName], self.curvePointers.get(curveName, ''))
+        self.__buildCurves(curveNames=toBuild)
+
+    def __buildTickerCurves(self, tickers):
+        # build the curves not built yet quoting the tickers unknown to the engine
+        if not self.lazy:
+            return
+        unknown = set(ticker for ticker in tickers if ticker not in self.quotes.keys())
+        if not unknown:
+            return
+        self.__buildLazyCurves([curveName for curveName, tickers in self.curveTickers.items()
+                                if curveName not in self.curves.keys() and not unknown.isdisjoint(tickers)])
+
+    def __buildCurves(self, market=None, curveNames=None):
+        self.__built = True
+        curveNames = self.sortedCurves if curveNames is None else curveNames
+        cachedNodes = self.__getCachedNodes(market, curveNames) if self.buildCache is not None else {}
+        snapshots = {}
+        if self.parallel:
+            snapshots = self.__bootstrapParallel(
+                market, cachedNodes, [curveName for curveName in curveNames if curveName not in self.curves.keys()])
+        with self.scope():
+            self.__buildSortedCurves(snapshots, market, cachedNodes, curveNames)
+            self.__anchorCurves(curveNames)
+            if self.buildCache is not None:
+                self.__cacheNodes(cachedNodes, curveNames)
+
+    def __buildSortedCurves(self, snapshots, market, cachedNodes, curveNames):
+        for curveName in curveNames:
+            if curveName in snapshots.keys():
+                parsed = parse(**snapshots[curveName])
+            elif market is not None:
+                parsed = bindMarketValues(self.parsedCurves[curveName], market)
+            else:
+                parsed = self.parsedCurves[curveName]
             if curveName not in self.indexes.keys():
                 self.__buildIndexes(parsed)
-            if curveName not in self.curves.keys():
+            if curveName in self.curves.keys():
+                continue
+            if curveName in cachedNodes.keys() and curveName not in snapshots.keys():
+                self.__buildCachedCurve(parsed, cachedNodes[curveName])
+            else:
                 self.__buildCurve(parsed)
 
+    def __getCachedNodes(self, market, curveNames):
+        # hashed in topological order, a curve is hashed only if its upstream curves are
+        cachedNodes = {}
+        for curveName in curveNames:
+            if curveName in self.curves.keys():
+                continue
+            curve = self.curveConfigs[curveName]
+            if market is not None:
+                curve = bindMarketValues(curve, market)
+            if not self.__externalTickers.isdisjoint(getTickers(curve)):
+                # the values of the quotes given to the engine are not in the configuration
+                continue
+            dependencies = self.dependencies[curveName]
+            if not all(dep in self.curveHashes.keys() for dep in dependencies):
+                continue
+            key = getCurveHash(curve, self.refDate, {dep: self.curveHashes[dep] for dep in dependencies})
+            self.curveHashes[curveName] = key
+            nodes = self.buildCache.get(key)
+            if nodes is not None:
+                cachedNodes[curveName] = [{'date': ore.Date(int(serial)), 'value': float(value)}
+                                          for serial, value in zip(*nodes)]
+        return cachedNodes
+
+    def __buildCachedCurve(self, data, nodes):
+        data = self.__bindQuoteValues(data)
+        curveName = data['curveName']
+        self.__buildCurve(createDiscountCurveConfig(data, nodes))
+        # the quotes are registered as if the curve was bootstrapped, so it is when they change
+        for ticker in getTickers(data):
+            self.tickerCurves.setdefault(ticker, set()).add(curveName)
+        for rateHelper in data['curveConfig'].get('rateHelpers', []):
+            for price in rateHelper['marketConfig'].values():
+                if isinstance(price, dict):
+                    createQuoteHandle(price, self.quotes)
+        self.nodeCurves.add(curveName)
+
+    def __cacheNodes(self, cachedNodes, curveNames):
+        for curveName in curveNames:
+            key = self.curveHashes.get(curveName)
+            if key is None or curveName in cachedNodes.keys():
+                continue
+            try:
+                nodes = self.curves[curveName].nodes()
+            except RuntimeError:
+                # failed bootstrap
+                continue
+            self.buildCache.put(key, nodes)
+
+    def __bootstrapParallel(self, market, cachedNodes, curveNames):
+        refDate = parseOREDate(self.refDate)
+        curveNames = set(curveNames)
+        snapshots = {}
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(self.maxWorkers)
+        for level in getDependencyLevels(self.dependencies):
+            futures = {}
+            for curveName in level:
+                if curveName not in curveNames:
+                    continue
+                if curveName in cachedNodes.keys():
+                    nodes = [{'date': parseOREDate(node['date']), 'value': node['value']}
+                             for node in cachedNodes[curveName]]
+                    snapshots[curveName] = createDiscountCurveConfig(self.curveConfigs[curveName], nodes)
+                    continue
+                curve = self.curveConfigs[curveName]
+                if market is not None:
+                    curve = bindMarketValues(curve, market)
+                # the upstream curves built before, lazily or not rebuilt, are sent as their nodes
+                upstream = [snapshots[dep] if dep in snapshots.keys() else self.__getNodeConfig(dep)
+                            for dep in self.dependencies[curveName]
+                            if dep in snapshots.keys() or dep in self.curves.keys()]
+                futures[curveName] = self.__executor.submit(
+                    bootstrapCurveNodes, refDate, curve, upstream)
+            for curveName, future in futures.items():
+                snapshots[curveName] = createDiscountCurveConfig(
+                    self.curveConfigs[curveName], future.result())
+        return snapshots
+
+    def __getNodeConfig(self, curveName):
+        # a curve built before, as a discount curve of its nodes for the workers
+        nodes = [{'date': parseOREDate(date), 'value': value} for date, value in self.curves[curveName].nodes()]
+        return createDiscountCurveConfig(self.curveConfigs[curveName], nodes)
+
+    def __buildDependencies(self):
+        dependencies = {curveName: deps - {curveName}
+                        for curveName, deps in self.curveDependencies.items()}
+        self.dependencies = dependencies
+        self.dependents = getDependentsList(dependencies)
+        self.sortedCurves = topologicalSort(
+            {curveName: set(deps) for curveName, deps in dependencies.items()})
+
     def __buildIndexes(self, data):
         name = data['curveName']
         config = data['curveIndex']
         indexType = config['indexType']
-        handle = ore.RelinkableYieldTermStructureHandle()
-        self.curveHandles[name] = handle
+        if name not in self.curveHandles.keys():
+            self.curveHandles[name] = ore.RelinkableYieldTermStructureHandle()
+        handle = self.curveHandles[name]
         if indexType == IndexType.IborIndex:
             index = createIborIndex(name, config, handle)
         elif indexType == IndexType.OvernightIndex:
@@ -98,91 +1056,93 @@ class CurveEngine:
                 'Unknown index type: {}'.format(indexType))
         self.indexes[name] = index
 
+    def __bindQuoteValues(self, data):
+        # the quotes set after the configuration was given keep their values on rebuilds
+        bound = getTickers(data) & self.__boundTickers
+        if not bound:
+            return data
+        return bindMarketValues(data, {ticker: self.quotes[ticker].value() for ticker in bound})
+
     def __buildCurve(self, data):
+        data = self.__bindQuoteValues(data)
         curveName = data['curveName']
         config = data['curveConfig']
-        if config['curveType'] == CurveType.Piecewise:
-            curve = self.__buildPiecewiseCurve(data)
-        elif config['curveType'] == CurveType.Discount:
-            curve = self.__buildDiscountingCurve(data)
-        elif config['curveType'] == CurveType.FlatForward:
-            curve = self.__buildFlatForwardCurve(data)
-        else:
-            raise Exception(
-                'Unknown curve type: {}'.format(config['curveType']))
+        for curveNames in self.tickerCurves.values():
+            curveNames.discard(curveName)
+        self.nodeCurves.discard(curveName)
+        definition = findCurveDefinition(config['curveType'])
+        if definition is None:
+            raise ConfigurationError(
+                'Unknown curve type: {}'.format(getTypeName(config['curveType'])))
+        start = time.perf_counter()
+        curve = definition.builder(data, self.refDate, self.curveHandles, self.indexes, quotes=self.quotes)
+        self.__buildTimes[curveName] = time.perf_counter() - start
+        self.curveSnapshots.pop(curveName, None)
+        for rateHelper in config.get('rateHelpers', []):
+            for price in rateHelper['marketConfig'].values():
+                if isinstance(price, dict) and price.get('ticker') in self.quotes.keys():
+                    self.tickerCurves.setdefault(price['ticker'], set()).add(curveName)
 
         self.curveHandles[curveName].linkTo(curve)
+        if curveName in self.cachedCurves.keys():
+            self.cachedCurves[curveName].relink(curve)
+        if curveName in self.discountGrids.keys():
+            self.discountGrids[curveName].relink(curve)
         self.indexes[curveName] = self.indexes[curveName].clone(
             self.curveHandles[curveName])
         self.curves[curveName] = curve
 
-    def __buildPiecewiseCurve(self, data):
-        rateHelpers = []
-        config = data['curveConfig']
-        for i, rateHelper in enumerate(config['rateHelpers']):
-            helperType = rateHelper['helperType']
-            helperConfig = rateHelper['helperConfig']                        
-            marketConfig = rateHelper['marketConfig']
-        
-            if helperType == HelperType.Deposit:
-                helper = createDepositRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.OIS:
-                helper = createOISRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.Swap:
-                helper = createSwapRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.TenorBasis:
-                helper = createTenorBasisSwapRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.Xccy:
-                helper = createCrossCcyFixFloatSwapRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.FxSwap:
-                helper = createFxSwapRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.SofrFuture:
-                helper = createSofrFutureRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.XccyBasis:
-                helper = createCrossCcyBasisSwapRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-            elif helperType == HelperType.Bond:
-                helper = createFixedRateBondRateHelper(
-                    helperConfig, marketConfig, self.curveHandles, self.indexes)
-          
-            rateHelpers.append(helper)
-
-        refDate = ore.Settings.instance().evaluationDate
-        dayCounter = config['dayCounter']
-
-        curve = ore.PiecewiseLogLinearDiscount(
-            refDate, rateHelpers, dayCounter)
-        if 'enableExtrapolation' in config.keys():
-            if config['enableExtrapolation']:
-                curve.enableExtrapolation()
-
-        return curve
-
-    def __buildDiscountingCurve(self, data):
-        config = data['curveConfig']
-        dates = [node['date'] for node in config['nodes']]
-        dfs = [node['value'] for node in config['nodes']]
-        dayCounter = config['dayCounter']
-        if dates[0] != ore.Settings.instance().evaluationDate:
-            raise Exception(
-                'Failed to create curve {}: first date in discount curve must be the evaluation date'.format(data['curveName']))
 
-        if dfs[0] != 1.0:
-            raise Exception(
-                'Failed to create curve {}: first discount factor in discount curve must be 1.0'.format(data['curveName']))
+def bootstrapCurveNodes(refDate, curve, upstream):
+    '''
+    Bootstrap a single curve and return its nodes. Used by the parallel mode of CurveEngine,
+    it runs in a worker process, where the evaluation date can be set independently.
+
+    Parameters
+    ----------
+    refDate : str
+        The reference date.
+    curve : dict
+        The curve configuration.
+    upstream : list
+        The configurations of the curves the curve depends on, usually discount curves.
+
+    Returns
+    -------
+    list
+        The curve nodes, as a list of dictionaries with date and value.
+    '''
+    engine = CurveEngine({'refDate': refDate, 'curves': upstream + [curve]})
+    return [{'date': parseOREDate(date), 'value': value}
+            for date, value in engine.getCurve(curve['curveName']).nodes()]
 
-        curve = ore.DiscountCurve(dates, dfs, dayCounter)
-        if 'enableExtrapolation' in config.keys():
-            if config['enableExtrapolation']:
-                curve.enableExtrapolation()
-        return curve
 
-    def __buildFlatForwardCurve(self, data):
-        raise NotImplementedError("Flat forward curve not implemented yet")
+def createDiscountCurveConfig(curve, nodes):
+    '''
+    Create the configuration of a discount curve with the given nodes, keeping the name,
+    day counter, extrapolation, currency and index of a curve.
+
+    Parameters
+    ----------
+    curve : dict
+        The curve configuration.
+    nodes : list
+        The discount factor nodes, as a list of dictionaries with date and value.
+
+    Returns
+    -------
+    dict
+        The discount curve configuration.
+    '''
+    curveConfig = curve['curveConfig']
+    return {
+        'curveName': curve['curveName'],
+        'curveConfig': {
+            'curveType': CurveType.Discount.value,
+            'dayCounter': curveConfig['dayCounter'],
+            'enableExtrapolation': curveConfig.get('enableExtrapolation', False),
+            'currency': curveConfig['currency'],
+            'nodes': nodes
+        },
+        'curveIndex': curve['curveIndex']
+    }
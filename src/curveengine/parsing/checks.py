@@ -1,6 +1,9 @@
+import math
 import re
 from functools import partial
+from operator import itemgetter
 from .enums import *
+from .registry import *
 
 '''
 Example of a basic structure of the curve request:
@@ -59,8 +62,9 @@ class ConfigurationError(Exception):
     Exception raised when the request is invalid
     '''
 
-    def __init__(self, message):
+    def __init__(self, message, pointer=None):
         self.message = message
+        self.pointer = pointer
 
 
 class RateIndexError(ConfigurationError):
@@ -68,8 +72,9 @@ class RateIndexError(ConfigurationError):
     Exception raised when the index is invalid
     '''
 
-    def __init__(self, message):
+    def __init__(self, message, pointer=None):
         self.message = message
+        self.pointer = pointer
 
 
 class RateHelperConfigurationError(ConfigurationError):
@@ -77,8 +82,9 @@ class RateHelperConfigurationError(ConfigurationError):
     Exception raised when the rate helper is invalid
     '''
 
-    def __init__(self, message):
+    def __init__(self, message, pointer=None):
         self.message = message
+        self.pointer = pointer
 
 
 class MarketConfigurationError(ConfigurationError):
@@ -86,10 +92,31 @@ class MarketConfigurationError(ConfigurationError):
     Exception raised when the market configuration is invalid
     '''
 
-    def __init__(self, message):
+    def __init__(self, message, pointer=None):
         self.message = message
+        self.pointer = pointer
 
 
+## Compiled patterns and enum sets ##
+
+DATE_PATTERN = re.compile(
+    r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?)?$')
+TENOR_PATTERN = re.compile(r'^(\d+[DWMY])+$')
+# single unit tenors, checked by set lookup before matching TENOR_PATTERN
+SIMPLE_TENORS = frozenset(f'{n}{unit}' for n in range(1000) for unit in 'DWMY')
+
+DAY_COUNTERS = frozenset(DayCounter.__members__)
+FREQUENCIES = frozenset(Frequency.__members__)
+COMPOUNDINGS = frozenset(Compounding.__members__)
+CONVENTIONS = frozenset(Convention.__members__)
+CALENDARS = frozenset(Calendar.__members__)
+CURRENCIES = frozenset(Currency.__members__)
+DATE_GENERATION_RULES = frozenset(DateGenerationRule.__members__)
+INDEX_TYPES = frozenset(IndexType.__members__)
+HELPER_TYPE_VALUES = [r.value for r in HelperType]
+CURVE_TYPE_VALUES = [r.value for r in CurveType]
+CURRENCY_NAMES = [r.name for r in Currency]
+
 ## Check available enums and possible instances#
 
 
@@ -111,7 +138,7 @@ def checkDate(value) -> None:
     ValueError
         If the date is invalid
     '''
-    if not re.match(r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?)?$', value):
+    if not DATE_PATTERN.match(value):
         raise ValueError(
             f'{value} is not a valid date or it does not follow the ISO format.')
 
@@ -164,7 +191,8 @@ def checkDayCounter(value) -> None:
     DayCounter
 
     '''
-    checkIsInEnum(value, DayCounter.__members__)
+    if value not in DAY_COUNTERS:
+        checkIsInEnum(value, DayCounter.__members__)
 
 
 def checkFrequency(value) -> None:
@@ -190,7 +218,8 @@ def checkFrequency(value) -> None:
     checkIsInEnum
     Frequency
     '''
-    checkIsInEnum(value, Frequency.__members__)
+    if value not in FREQUENCIES:
+        checkIsInEnum(value, Frequency.__members__)
 
 
 def checkCompounding(value) -> None:
@@ -216,7 +245,8 @@ def checkCompounding(value) -> None:
     checkIsInEnum
     Compounding
     '''
-    checkIsInEnum(value, Compounding.__members__)
+    if value not in COMPOUNDINGS:
+        checkIsInEnum(value, Compounding.__members__)
 
 
 def checkConvention(value) -> None:
@@ -242,7 +272,8 @@ def checkConvention(value) -> None:
     checkIsInEnum
     Convention
     '''
-    checkIsInEnum(value, Convention.__members__)
+    if value not in CONVENTIONS:
+        checkIsInEnum(value, Convention.__members__)
 
 
 def checkCalendar(value) -> None:
@@ -268,7 +299,8 @@ def checkCalendar(value) -> None:
     checkIsInEnum
     Calendar
     '''
-    checkIsInEnum(value, Calendar.__members__)
+    if value not in CALENDARS:
+        checkIsInEnum(value, Calendar.__members__)
 
 
 def checkCurrency(value) -> None:
@@ -294,7 +326,8 @@ def checkCurrency(value) -> None:
     checkIsInEnum
     Currency
     '''
-    checkIsInEnum(value, Currency.__members__)
+    if value not in CURRENCIES:
+        checkIsInEnum(value, Currency.__members__)
 
 
 def checkDateGenerationRule(value) -> None:
@@ -320,7 +353,8 @@ def checkDateGenerationRule(value) -> None:
     checkIsInEnum
     DateGenerationRule
     '''
-    checkIsInEnum(value, DateGenerationRule.__members__)
+    if value not in DATE_GENERATION_RULES:
+        checkIsInEnum(value, DateGenerationRule.__members__)
 
 
 def checkTenor(tenor: str) -> None:
@@ -341,8 +375,7 @@ def checkTenor(tenor: str) -> None:
     ConfigurationError
         If the tenor is invalid
     '''
-    regex = r'^(\d+[DWMY])+$'
-    if not re.match(regex, tenor):
+    if not TENOR_PATTERN.match(tenor):
         raise ValueError(f'The tenor {tenor} is invalid')
 
 
@@ -384,8 +417,373 @@ def checkInstance(value: any, type: type) -> None:
         raise ValueError(f'The value {tmpvalue} is not an instance of {type}.')
 
 
+## Compiled structures ##
+
+class CompiledStructure:
+    '''
+    Reference structure compiled into lookup tables, so it can be checked many times without rebuilding it.
+    The rules are grouped by kind, enum sets, patterns, types and predicates, so a valid input is checked in
+    a single pass, see isValid. The checks are only called, as in checkDictStructure, to raise the error
+    of an invalid input.
+
+    Parameters
+    ----------
+    reference: dict
+        The reference, as in checkDictStructure. A value can also be a (rule, check) pair, where the rule
+        is a frozenset of valid values, a compiled pattern, a type, a tuple of types, a nested compiled rule
+        (CompiledStructure, CompiledList or CompiledSwitch) or a predicate, and the check raises the error
+        of an invalid value. A value that fails the rule is passed to the check, so the rule may be stricter
+        than the check, e.g. SIMPLE_TENORS for checkTenor. The (rule, check) pairs are kept by key in rules,
+        and those of the nested rules in nodes, so they can be walked, see parseConfiguration.
+
+    Returns
+    -------
+    None
+    '''
+
+    __slots__ = ('requiredKeys', 'checks', 'rules', 'nodes', 'enums', 'patterns', 'types', 'predicates')
+
+    def __init__(self, reference: dict):
+        self.requiredKeys = tuple(reference.keys())
+        self.checks = {}
+        self.rules = {}
+        self.nodes = {}
+        enums, patterns, types, predicates = [], [], [], []
+        for key, rule in reference.items():
+            if not isinstance(rule, tuple):
+                rule = (partial(isValidByCheck, check=rule), rule)
+            self.rules[key] = rule
+            spec, self.checks[key] = rule
+            if isinstance(spec, COMPILED_RULES):
+                self.nodes[key] = rule
+            elif isinstance(spec, frozenset):
+                enums.append((key, spec))
+            elif isinstance(spec, re.Pattern):
+                patterns.append((key, spec))
+            elif isinstance(spec, (type, tuple)):
+                types.append((key, spec))
+            else:
+                predicates.append((key, spec))
+        self.enums = tuple(enums)
+        self.patterns = tuple(patterns)
+        self.types = tuple(types)
+        self.predicates = tuple(predicates)
+
+    '''
+    Check if a dictionary is valid, without building the error
+
+    Parameters
+    ----------
+    input: dict
+        The dictionary to check
+
+    Returns
+    -------
+    bool
+        True if the dictionary is valid. It may also raise if the dictionary is invalid, e.g. on a missing key.
+    '''
+
+    def isValid(self, input: dict) -> bool:
+        if not self.hasValidLeaves(input):
+            return False
+        for key, (rule, _) in self.nodes.items():
+            if not rule.isValid(input[key]):
+                return False
+        return True
+
+    '''
+    Check if the values of a dictionary are valid, without checking the nested rules
+
+    Parameters
+    ----------
+    input: dict
+        The dictionary to check
+
+    Returns
+    -------
+    bool
+        True if the values are valid. It may also raise if the dictionary is invalid, e.g. on a missing key.
+    '''
+
+    def hasValidLeaves(self, input: dict) -> bool:
+        # every key is required, so a missing key raises a KeyError below
+        for key, values in self.enums:
+            if input[key] not in values:
+                return False
+        for key, pattern in self.patterns:
+            if not pattern.match(input[key]):
+                return False
+        for key, type in self.types:
+            if not isinstance(input[key], type):
+                return False
+        for key, predicate in self.predicates:
+            if not predicate(input[key]):
+                return False
+        return True
+
+
+class CompiledList:
+    '''
+    Compiled rule of a non-empty list, see CompiledStructure
+
+    Parameters
+    ----------
+    item: CompiledStructure, CompiledSwitch or callable
+        The rule of the items, a compiled rule or a predicate
+    check: callable, optional
+        The check raising the error of an invalid item, called with the item and its position.
+        The default is None.
+
+    Returns
+    -------
+    None
+    '''
+
+    __slots__ = ('item', 'check', 'predicate')
+
+    def __init__(self, item, check=None):
+        self.item = item
+        self.check = check
+        self.predicate = item.isValid if isinstance(item, COMPILED_RULES) else item
+
+    def isValid(self, input: list) -> bool:
+        if not isinstance(input, list) or len(input) == 0:
+            return False
+        predicate = self.predicate
+        for item in input:
+            if not predicate(item):
+                return False
+        return True
+
+
+class CompiledSwitch:
+    '''
+    Compiled rule of a dictionary whose structure depends on its content, e.g. on its type,
+    see CompiledStructure
+
+    Parameters
+    ----------
+    selector: callable
+        The function returning the case of a dictionary
+    structures: dict
+        The CompiledStructure of each case
+    missing: callable, optional
+        The function returning the CompiledStructure of a case not in structures, or None if the case
+        is invalid. The default is None, any other case is invalid.
+
+    Returns
+    -------
+    None
+    '''
+
+    __slots__ = ('selector', 'structures', 'missing')
+
+    def __init__(self, selector, structures: dict, missing=None):
+        self.selector = selector
+        self.structures = structures
+        self.missing = missing
+
+    def select(self, input: dict):
+        case = self.selector(input)
+        structure = self.structures.get(case)
+        if structure is None and self.missing is not None:
+            structure = self.missing(case)
+        return structure
+
+    def isValid(self, input: dict) -> bool:
+        structure = self.select(input)
+        return structure is not None and structure.isValid(input)
+
+
+# the rules that can be nested in a CompiledStructure
+COMPILED_RULES = (CompiledStructure, CompiledList, CompiledSwitch)
+
+
+def isValidByCheck(value, check) -> bool:
+    '''
+    Rule of a reference value given as a plain check, see CompiledStructure
+
+    Parameters
+    ----------
+    value: any
+        The value to check
+    check: callable
+        The check, raising if the value is invalid
+
+    Returns
+    -------
+    bool
+        True, if the check does not raise
+    '''
+    check(value)
+    return True
+
+
+def compileStructure(reference: dict) -> CompiledStructure:
+    '''
+    Compile a reference structure, see CompiledStructure
+
+    Parameters
+    ----------
+    reference: dict
+        The reference, with the key as key and the check or a (rule, check) pair as value
+
+    Returns
+    -------
+    CompiledStructure
+        The compiled structure
+    '''
+    return CompiledStructure(reference)
+
+
+def checkCompiledStructure(input: dict, structure: CompiledStructure) -> None:
+    '''
+    Check a dictionary against a compiled structure. It raises the same errors as checkDictStructure.
+
+    Parameters
+    ----------
+    input: dict
+        The dictionary to check
+    structure: CompiledStructure
+        The structure, see compileStructure
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    KeyError
+        If a required key is missing
+    Exception
+        The error of the check of an invalid value
+    '''
+    try:
+        if structure.isValid(input):
+            return
+    except Exception:
+        pass
+
+    keys = input.keys()
+    for key in structure.requiredKeys:
+        if key not in keys:
+            raise KeyError(
+                f'The required key "{key}" is missing.')
+    checks = structure.checks
+    for key, value in input.items():
+        check = checks.get(key)
+        if check is not None:
+            check(value)
+
+
+def checkNumber(value) -> None:
+    '''
+    Check if the value is a float or an int
+
+    Parameters
+    ----------
+    value: any
+        The value to check
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the value is not a float or an int
+    '''
+    if not isinstance(value, float) and not isinstance(value, int):
+        raise ValueError(
+            f'The value {value} is not an instance of float or int.')
+
+
+def checkHelperType(value) -> None:
+    '''
+    Check if the rate helper type is a HelperType value or a registered type, see registerRateHelperDefinition
+
+    Parameters
+    ----------
+    value: str
+        The value to check
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the type is unknown, with the message of checkIsInEnum
+    '''
+    if isinstance(value, str) and value not in HELPER_TYPE_VALUES and findRateHelperDefinition(value) is not None:
+        return
+    checkIsInEnum(value, HELPER_TYPE_VALUES)
+
+
+def checkCurveType(value) -> None:
+    '''
+    Check if the curve type is a CurveType value or a registered type, see registerCurveDefinition
+
+    Parameters
+    ----------
+    value: str
+        The value to check
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the type is unknown, with the message of checkIsInEnum
+    '''
+    if isinstance(value, str) and value not in CURVE_TYPE_VALUES and findCurveDefinition(value) is not None:
+        return
+    checkIsInEnum(value, CURVE_TYPE_VALUES)
+
+
+DATE_RULE = (DATE_PATTERN, checkDate)
+TENOR_RULE = (SIMPLE_TENORS, checkTenor)
+DAY_COUNTER_RULE = (DAY_COUNTERS, checkDayCounter)
+FREQUENCY_RULE = (FREQUENCIES, checkFrequency)
+CONVENTION_RULE = (CONVENTIONS, checkConvention)
+CALENDAR_RULE = (CALENDARS, checkCalendar)
+CURRENCY_RULE = (CURRENCIES, checkCurrency)
+INDEX_TYPE_RULE = (INDEX_TYPES, partial(
+    checkIsInEnum, enum=IndexType.__members__))
+HELPER_TYPE_RULE = (frozenset(HELPER_TYPE_VALUES), checkHelperType)
+CURVE_TYPE_RULE = (frozenset(CURVE_TYPE_VALUES), checkCurveType)
+CURVE_CURRENCY_RULE = (frozenset(CURRENCY_NAMES), partial(
+    checkIsInEnum, enum=CURRENCY_NAMES))
+NUMBER_RULE = ((float, int), checkNumber)
+BOOL_RULE = (bool, partial(checkInstance, type=bool))
+# floats are left to checkInstance, which takes them as ints
+INT_RULE = (int, partial(checkInstance, type=int))
+FLOAT_RULE = (float, partial(checkInstance, type=float))
+STR_RULE = (str, partial(checkInstance, type=str))
+
+
 ## Rate helpers checks ##
 
+OIS_RATE_HELPER_STRUCTURE = compileStructure({
+    'tenor': TENOR_RULE,
+    'dayCounter': DAY_COUNTER_RULE,
+    'calendar': CALENDAR_RULE,
+    'convention': CONVENTION_RULE,
+    'endOfMonth': BOOL_RULE,
+    'frequency': FREQUENCY_RULE,
+    'settlementDays': INT_RULE,
+    'paymentLag': INT_RULE,
+    'telescopicValueDates': BOOL_RULE,
+    'index': STR_RULE,
+    'fixedLegFrequency': FREQUENCY_RULE,
+    'fwdStart': TENOR_RULE,
+    'discountCurve': STR_RULE
+})
+
 def checkOISRateHelper(data: dict) -> None:
     '''
     Check if the OIS rate helper is valid
@@ -425,27 +823,21 @@ def checkOISRateHelper(data: dict) -> None:
                     }
     ```
     '''
-    reference = {
-        "tenor": checkTenor,
-        "dayCounter": checkDayCounter,
-        "calendar": checkCalendar,
-        "convention": checkConvention,
-        "endOfMonth": partial(checkInstance, type=bool),
-        "frequency": checkFrequency,
-        "settlementDays": partial(checkInstance, type=int),
-        "paymentLag": partial(checkInstance, type=int),
-        "telescopicValueDates": partial(checkInstance, type=bool),
-        "index": partial(checkInstance, type=str),
-        "fixedLegFrequency": checkFrequency,
-        "fwdStart": checkTenor,
-        "discountCurve": partial(checkInstance, type=str)
-    }
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, OIS_RATE_HELPER_STRUCTURE)
     except Exception as exc:
         raise RateHelperConfigurationError('Invalid OIS rate helper') from exc
 
 
+DEPOSIT_RATE_HELPER_STRUCTURE = compileStructure({
+    'dayCounter': DAY_COUNTER_RULE,
+    'tenor': TENOR_RULE,
+    'calendar': CALENDAR_RULE,
+    'settlementDays': INT_RULE,
+    'endOfMonth': BOOL_RULE,
+    'convention': CONVENTION_RULE
+})
+
 def checkDepositRateHelper(data: dict) -> None:
     '''
     Check if the deposit rate helper is valid
@@ -478,21 +870,27 @@ def checkDepositRateHelper(data: dict) -> None:
                 }
     ```
     '''
-    reference = {
-        "dayCounter": checkDayCounter,
-        "tenor": checkTenor,
-        "calendar": checkCalendar,
-        "settlementDays": partial(checkInstance, type=int),
-        "endOfMonth": partial(checkInstance, type=bool),
-        "convention": checkConvention
-    }
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, DEPOSIT_RATE_HELPER_STRUCTURE)
     except Exception as exc:
         raise RateHelperConfigurationError(
             'Invalid deposit rate helper') from exc
 
 
+SWAP_RATE_HELPER_STRUCTURE = compileStructure({
+    'tenor': TENOR_RULE,
+    'dayCounter': DAY_COUNTER_RULE,
+    'calendar': CALENDAR_RULE,
+    'frequency': FREQUENCY_RULE,
+    'settlementDays': INT_RULE,
+    'discountCurve': STR_RULE,
+    'index': STR_RULE,
+    'endOfMonth': BOOL_RULE,
+    'convention': CONVENTION_RULE,
+    'fixedLegFrequency': FREQUENCY_RULE,
+    'fwdStart': TENOR_RULE
+})
+
 def checkSwapRateHelper(data: dict) -> None:
     '''
     Check if the swap rate helper is valid
@@ -530,25 +928,29 @@ def checkSwapRateHelper(data: dict) -> None:
                 }
     ```
     '''
-    reference = {
-        "tenor": checkTenor,
-        "dayCounter": checkDayCounter,
-        "calendar": checkCalendar,
-        "frequency": checkFrequency,
-        "settlementDays": partial(checkInstance, type=int),
-        "discountCurve": partial(checkInstance, type=str),
-        "index": partial(checkInstance, type=str),
-        "endOfMonth": partial(checkInstance, type=bool),
-        "convention": checkConvention,
-        "fixedLegFrequency": checkFrequency,
-        "fwdStart": checkTenor
-    }
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, SWAP_RATE_HELPER_STRUCTURE)
     except Exception as exc:
         raise RateHelperConfigurationError('Invalid swap rate helper') from exc
 
 
+BOND_RATE_HELPER_REFERENCE = {
+    'calendar': CALENDAR_RULE,
+    'convention': CONVENTION_RULE,
+    'settlementDays': INT_RULE,
+    'couponDayCounter': DAY_COUNTER_RULE,
+    'couponRate': FLOAT_RULE,
+    'frequency': FREQUENCY_RULE
+}
+BOND_RATE_HELPER_DATES_STRUCTURE = compileStructure({
+    **BOND_RATE_HELPER_REFERENCE, 'startDate': DATE_RULE, 'endDate': DATE_RULE})
+BOND_RATE_HELPER_TENOR_STRUCTURE = compileStructure({
+    **BOND_RATE_HELPER_REFERENCE, 'tenor': TENOR_RULE})
+BOND_RATE_HELPER_SWITCH = CompiledSwitch(
+    lambda data: 'startDate' in data or 'endDate' in data,
+    {True: BOND_RATE_HELPER_DATES_STRUCTURE, False: BOND_RATE_HELPER_TENOR_STRUCTURE})
+
+
 def checkFixedRateBondRateHelper(data: dict) -> None:
     '''
     Check if the bond rate helper is valid
@@ -584,28 +986,31 @@ def checkFixedRateBondRateHelper(data: dict) -> None:
                 }
     ```
     '''
-    reference = {
-        "calendar": checkCalendar,
-        "convention": checkConvention,
-        "settlementDays": partial(checkInstance, type=int),
-        "couponDayCounter": checkDayCounter,
-        "couponRate": partial(checkInstance, type=float),
-        "frequency": checkFrequency,
-    }
-
-    # check if the start date and end date are provided
-    if "startDate" in data or "endDate" in data:
-        reference["startDate"] = checkDate
-        reference["endDate"] = checkDate
-    else:
-        reference["tenor"] = checkTenor
-
+    structure = BOND_RATE_HELPER_SWITCH.structures[BOND_RATE_HELPER_SWITCH.selector(data)]
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, structure)
     except Exception as exc:
         raise RateHelperConfigurationError('Invalid bond rate helper') from exc
 
 
+FX_SWAP_RATE_HELPER_REFERENCE = {
+    'calendar': CALENDAR_RULE,
+    'fixingDays': INT_RULE,
+    'endOfMonth': BOOL_RULE,
+    'baseCurrencyAsCollateral': BOOL_RULE,
+    'convention': CONVENTION_RULE,
+    'discountCurve': STR_RULE,
+    'settlementDays': INT_RULE
+}
+FX_SWAP_RATE_HELPER_DATE_STRUCTURE = compileStructure({
+    **FX_SWAP_RATE_HELPER_REFERENCE, 'endDate': DATE_RULE})
+FX_SWAP_RATE_HELPER_TENOR_STRUCTURE = compileStructure({
+    **FX_SWAP_RATE_HELPER_REFERENCE, 'tenor': TENOR_RULE})
+FX_SWAP_RATE_HELPER_SWITCH = CompiledSwitch(
+    lambda data: 'endDate' in data,
+    {True: FX_SWAP_RATE_HELPER_DATE_STRUCTURE, False: FX_SWAP_RATE_HELPER_TENOR_STRUCTURE})
+
+
 def checkFxSwapRateHelper(data: dict) -> None:
     '''
     Check if the FX swap rate helper is valid
@@ -642,29 +1047,28 @@ def checkFxSwapRateHelper(data: dict) -> None:
     ```
     '''
 
-    reference = {
-        "calendar": checkCalendar,
-        "fixingDays": partial(checkInstance, type=int),
-        "endOfMonth": partial(checkInstance, type=bool),
-        "baseCurrencyAsCollateral": partial(checkInstance, type=bool),
-        "convention": checkConvention,
-        "discountCurve": partial(checkInstance, type=str),
-        "settlementDays": partial(checkInstance, type=int)
-    }
-
-    # check if the end date is provided
-    if "endDate" in data:
-        reference["endDate"] = checkDate
-    else:
-        reference["tenor"] = checkTenor
-
+    structure = FX_SWAP_RATE_HELPER_SWITCH.structures[FX_SWAP_RATE_HELPER_SWITCH.selector(data)]
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, structure)
     except Exception as exc:
         raise RateHelperConfigurationError(
             'Invalid FX swap rate helper') from exc
 
 
+XCCY_RATE_HELPER_STRUCTURE = compileStructure({
+    'tenor': TENOR_RULE,
+    'dayCounter': DAY_COUNTER_RULE,
+    'calendar': CALENDAR_RULE,
+    'convention': CONVENTION_RULE,
+    'endOfMonth': BOOL_RULE,
+    'settlementDays': INT_RULE,
+    'discountCurve': STR_RULE,
+    'index': STR_RULE,
+    'fixedLegCurrency': STR_RULE,
+    'fwdStart': TENOR_RULE,
+    'fixedLegFrequency': FREQUENCY_RULE
+})
+
 def checkCrossCcyFixFloatSwapRateHelper(data: dict) -> None:
     '''
     Check if the cross currency rate helper is valid
@@ -704,27 +1108,21 @@ def checkCrossCcyFixFloatSwapRateHelper(data: dict) -> None:
     ```
     '''
 
-    reference = {
-        "tenor": checkTenor,
-        "dayCounter": checkDayCounter,
-        "calendar": checkCalendar,
-        "convention": checkConvention,
-        "endOfMonth": partial(checkInstance, type=bool),
-        "settlementDays": partial(checkInstance, type=int),
-        "discountCurve": partial(checkInstance, type=str),
-        "index": partial(checkInstance, type=str),
-        "fixedLegCurrency": partial(checkInstance, type=str),
-        "fwdStart": checkTenor,
-        "fixedLegFrequency": checkFrequency
-    }
-
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, XCCY_RATE_HELPER_STRUCTURE)
     except Exception as exc:
         raise RateHelperConfigurationError(
             'Invalid cross currency rate helper') from exc
 
 
+TENOR_BASIS_RATE_HELPER_STRUCTURE = compileStructure({
+    'tenor': TENOR_RULE,
+    'longIndex': STR_RULE,
+    'shortIndex': STR_RULE,
+    'discountCurve': STR_RULE,
+    'spreadOnShort': BOOL_RULE
+})
+
 def checkTenorBasisSwapRateHelper(data: dict) -> None:
     '''
     Check if the tenor basis rate helper is valid
@@ -757,21 +1155,26 @@ def checkTenorBasisSwapRateHelper(data: dict) -> None:
     ```
     '''
 
-    reference = {
-        "tenor": checkTenor,
-        "longIndex": partial(checkInstance, type=str),
-        "shortIndex": partial(checkInstance, type=str),
-        "discountCurve": partial(checkInstance, type=str),
-        "spreadOnShort": partial(checkInstance, type=bool)
-    }
-
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, TENOR_BASIS_RATE_HELPER_STRUCTURE)
     except Exception as exc:
         raise RateHelperConfigurationError(
             'Invalid tenor basis rate helper') from exc
 
 
+XCCY_BASIS_RATE_HELPER_STRUCTURE = compileStructure({
+    'tenor': TENOR_RULE,
+    'calendar': CALENDAR_RULE,
+    'settlementDays': INT_RULE,
+    'endOfMonth': BOOL_RULE,
+    'convention': CONVENTION_RULE,
+    'flatIndex': STR_RULE,
+    'spreadIndex': STR_RULE,
+    'flatDiscountCurve': STR_RULE,
+    'spreadDiscountCurve': STR_RULE,
+    'flatIsDomestic': BOOL_RULE
+})
+
 def checkCrossCcyBasisSwapRateHelper(data: dict) -> None:
     '''
     Check if the cross currency basis rate helper is valid
@@ -809,27 +1212,153 @@ def checkCrossCcyBasisSwapRateHelper(data: dict) -> None:
     ```
     '''
 
-    reference = {
-        "tenor": checkTenor,
-        "calendar": checkCalendar,
-        "settlementDays": partial(checkInstance, type=int),
-        "endOfMonth": partial(checkInstance, type=bool),
-        "convention": checkConvention,
-        "flatIndex": partial(checkInstance, type=str),
-        "spreadIndex": partial(checkInstance, type=str),
-        "flatDiscountCurve": partial(checkInstance, type=str),
-        "spreadDiscountCurve": partial(checkInstance, type=str),
-        "flatIsDomestic": partial(checkInstance, type=bool)
-    }
-
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, XCCY_BASIS_RATE_HELPER_STRUCTURE)
     except Exception as exc:
         raise RateHelperConfigurationError(
             'Invalid cross currency basis rate helper') from exc
 
 
-def checkMarketConfig(data: dict, helperType: HelperType) -> None:
+def checkPrice(data: dict, template: bool = False) -> None:
+    '''
+    Check if the price of a market config is valid
+
+    Parameters
+    ----------
+    data: dict
+        The price, with a value and an optional ticker
+    template: bool, optional
+        If True, the value may be missing as long as there is a ticker
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigurationError
+        If the price is invalid
+    '''
+    if not isinstance(data, dict):
+        raise ConfigurationError(
+            'Invalid price, should be a dictionary')
+    if 'value' not in data:
+        if not template or 'ticker' not in data:
+            raise ConfigurationError(
+                'Invalid price, missing value')
+    elif not isinstance(data['value'], float) and not isinstance(data['value'], int):
+        raise ConfigurationError(
+            'Invalid price, value should be a float or int')
+    elif not math.isfinite(data['value']):
+        raise ConfigurationError(
+            'Invalid price, value should be finite')
+    if 'ticker' in data and not isinstance(data['ticker'], str):
+        raise ConfigurationError(
+            'Invalid price, ticker should be a string')
+
+
+def isValidPrice(data: dict, template: bool = False) -> bool:
+    '''
+    Check if the price of a market config is valid, without building the error, see checkPrice
+
+    Parameters
+    ----------
+    data: dict
+        The price, with a value and an optional ticker
+    template: bool, optional
+        If True, the value may be missing as long as there is a ticker
+
+    Returns
+    -------
+    bool
+        True if the price is valid
+    '''
+    if not isinstance(data, dict):
+        return False
+    if 'value' in data:
+        if not isinstance(data['value'], (float, int)) or not math.isfinite(data['value']):
+            return False
+    elif not template or 'ticker' not in data:
+        return False
+    return 'ticker' not in data or isinstance(data['ticker'], str)
+
+
+MARKET_CONFIG_FIELDS = {
+    HelperType.Deposit: ['rate'],
+    HelperType.Swap: ['rate', 'spread'],
+    HelperType.FxSwap: ['fxSpot', 'fxPoints'],
+    HelperType.Xccy: ['rate', 'spread', 'fxSpot'],
+    HelperType.TenorBasis: ['spread'],
+    HelperType.XccyBasis: ['spread', 'fxSpot'],
+    HelperType.OIS: ['spread'],
+    HelperType.Bond: ['rate']
+}
+
+
+def compileMarketConfigStructure(fields: list, template: bool = False) -> CompiledStructure:
+    '''
+    Compile the structure of a market config with the given fields, see checkMarketConfig
+
+    Parameters
+    ----------
+    fields: list
+        The fields, each one a price
+    template: bool, optional
+        If True, the value of a field may be missing as long as it has a ticker
+
+    Returns
+    -------
+    CompiledStructure
+        The structure of the market config
+    '''
+    return compileStructure({
+        field: (partial(isValidPrice, template=True) if template else isValidPrice,
+                partial(checkPrice, template=template))
+        for field in fields
+    })
+
+
+# the structures by helper type name, the registered types are compiled on first use
+MARKET_CONFIG_STRUCTURES = {
+    template: {
+        helperType.value: compileMarketConfigStructure(fields, template)
+        for helperType, fields in MARKET_CONFIG_FIELDS.items()
+    }
+    for template in [False, True]
+}
+
+
+def getMarketConfigStructure(helperType, template: bool = False):
+    '''
+    Get the compiled structure of the market config of a rate helper type, compiling it for a
+    registered type on first use
+
+    Parameters
+    ----------
+    helperType: HelperType or str
+        The type of the rate helper
+    template: bool, optional
+        If True, the value of a field may be missing as long as it has a ticker
+
+    Returns
+    -------
+    CompiledStructure or None
+        The structure, or None if the type is unknown
+    '''
+    name = getTypeName(helperType)
+    if not isinstance(name, str):
+        return None
+    structures = MARKET_CONFIG_STRUCTURES[bool(template)]
+    structure = structures.get(name)
+    if structure is None:
+        definition = findRateHelperDefinition(name)
+        if definition is None:
+            return None
+        structure = structures[name] = compileMarketConfigStructure(definition.marketFields, template)
+    return structure
+
+
+def checkMarketConfig(data: dict, helperType, template: bool = False) -> None:
     '''
     Check if the market config is valid
 
@@ -837,6 +1366,10 @@ def checkMarketConfig(data: dict, helperType: HelperType) -> None:
     ----------
     data: dict
         The market config
+    helperType: HelperType or str
+        The type of the rate helper, a member of HelperType or the name of a registered type
+    template: bool, optional
+        If True, the value of a field may be missing as long as it has a ticker
 
     Returns
     -------
@@ -871,7 +1404,8 @@ def checkMarketConfig(data: dict, helperType: HelperType) -> None:
                     }
     ```
 
-    Where each field has at least a value. The ticker is optional.    
+    Where each field has at least a value. The ticker is optional, except for templates where the
+    value may be left out and bound later by ticker.
     Each field is dependent on the helper type. The following table shows the required fields for each helper type:
 
     |Helper type             | Required fields                  |
@@ -884,71 +1418,133 @@ def checkMarketConfig(data: dict, helperType: HelperType) -> None:
     |XccyBasis               | spread, fxSpot                   |
     |OIS                     | spread                           |
     |Bond                    | rate                             |
-    '''
 
-    def checkPrice(data: dict) -> None:
-        if not isinstance(data, dict):
-            raise ConfigurationError(
-                'Invalid price, should be a dictionary')
-        if 'value' not in data:
-            raise ConfigurationError(
-                'Invalid price, missing value')
-        if not isinstance(data['value'], float) and not isinstance(data['value'], int):
-            raise ConfigurationError(
-                'Invalid price, value should be a float or int')
-        if 'ticker' in data and not isinstance(data['ticker'], str):
-            raise ConfigurationError(
-                'Invalid price, ticker should be a string')
+    The fields of a registered type are given by its definition, see RateHelperDefinition.
+    '''
 
-    reference = {}
-    if helperType == HelperType.Deposit:
-        reference = {
-            "rate": checkPrice
-        }
-    elif helperType == HelperType.Swap:
-        reference = {
-            "rate": checkPrice,
-            "spread": checkPrice
-        }
-    elif helperType == HelperType.FxSwap:
-        reference = {
-            "fxSpot": checkPrice,
-            "fxPoints": checkPrice
-        }
-    elif helperType == HelperType.Xccy:
-        reference = {
-            "rate": checkPrice,
-            "spread": checkPrice,
-            "fxSpot": checkPrice,
-        }
-    elif helperType == HelperType.TenorBasis:
-        reference = {
-            "spread": checkPrice
-        }
-    elif helperType == HelperType.XccyBasis:
-        reference = {
-            "spread": checkPrice,
-            "fxSpot": checkPrice
-        }
-    elif helperType == HelperType.OIS:
-        reference = {
-            "spread": checkPrice
-        }
-    elif helperType == HelperType.Bond:
-        reference = {
-            "rate": checkPrice
-        }
-    else:
+    structure = getMarketConfigStructure(helperType, template)
+    if structure is None:
         raise ConfigurationError('Invalid helper type')
 
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, structure)
     except Exception as exc:
         raise ConfigurationError(
             'Invalid market config') from exc
 
 
-def checkRateHelper(data: dict, pos: int) -> None:
+HELPER_CONFIG_RULES = {
+    HelperType.Deposit: (DEPOSIT_RATE_HELPER_STRUCTURE, checkDepositRateHelper),
+    HelperType.Swap: (SWAP_RATE_HELPER_STRUCTURE, checkSwapRateHelper),
+    HelperType.FxSwap: (FX_SWAP_RATE_HELPER_SWITCH, checkFxSwapRateHelper),
+    HelperType.Xccy: (XCCY_RATE_HELPER_STRUCTURE, checkCrossCcyFixFloatSwapRateHelper),
+    HelperType.TenorBasis: (TENOR_BASIS_RATE_HELPER_STRUCTURE, checkTenorBasisSwapRateHelper),
+    HelperType.XccyBasis: (XCCY_BASIS_RATE_HELPER_STRUCTURE, checkCrossCcyBasisSwapRateHelper),
+    HelperType.OIS: (OIS_RATE_HELPER_STRUCTURE, checkOISRateHelper),
+    HelperType.Bond: (BOND_RATE_HELPER_SWITCH, checkFixedRateBondRateHelper)
+}
+
+
+def compileRule(reference) -> tuple:
+    '''
+    Compile the rule of a nested dictionary, see CompiledStructure
+
+    Parameters
+    ----------
+    reference: dict or tuple
+        A reference structure, see compileStructure, or a (rule, check) pair whose rule is a
+        CompiledStructure or a CompiledSwitch
+
+    Returns
+    -------
+    tuple
+        The (rule, check) pair
+    '''
+    if isinstance(reference, dict):
+        structure = compileStructure(reference)
+        return (structure, partial(checkCompiledStructure, structure=structure))
+    return reference
+
+
+def compileRateHelperStructure(helperType, template: bool = False):
+    '''
+    Compile the structure of a rate helper of a given type, see checkRateHelper
+
+    Parameters
+    ----------
+    helperType: HelperType or str
+        The type of the rate helper, a member of HelperType or the name of a registered type
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
+
+    Returns
+    -------
+    CompiledStructure or None
+        The structure of the rate helper, or None if the type is unknown
+    '''
+    name = getTypeName(helperType)
+    builtIn = HELPER_TYPES_BY_VALUE.get(name)
+    if builtIn in HELPER_CONFIG_RULES:
+        rule = HELPER_CONFIG_RULES[builtIn]
+    else:
+        definition = findRateHelperDefinition(name)
+        if definition is None:
+            return None
+        rule = compileRule(definition.helperConfig)
+    checkMarket = partial(checkMarketConfig, helperType=name, template=template)
+    return compileStructure({
+        'helperType': (frozenset([name]), checkHelperType),
+        'marketConfig': (getMarketConfigStructure(name, template), checkMarket),
+        'helperConfig': rule
+    })
+
+
+# the structures by helper type name, the registered types are compiled on first use
+RATE_HELPER_TYPE_STRUCTURE = compileStructure({'helperType': HELPER_TYPE_RULE})
+RATE_HELPER_STRUCTURES = {
+    template: {helperType.value: compileRateHelperStructure(helperType, template)
+               for helperType in HELPER_CONFIG_RULES}
+    for template in [False, True]
+}
+
+
+def getRateHelperStructure(helperType, template: bool = False):
+    '''
+    Get the compiled structure of a rate helper type, compiling it for a registered type on first use
+
+    Parameters
+    ----------
+    helperType: HelperType or str
+        The type of the rate helper
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
+
+    Returns
+    -------
+    CompiledStructure or None
+        The structure, or None if the type is unknown
+    '''
+    name = getTypeName(helperType)
+    if not isinstance(name, str):
+        return None
+    structures = RATE_HELPER_STRUCTURES[bool(template)]
+    structure = structures.get(name)
+    if structure is None:
+        structure = compileRateHelperStructure(name, template)
+        if structure is not None:
+            structures[name] = structure
+    return structure
+
+
+RATE_HELPER_SWITCHES = {
+    template: CompiledSwitch(
+        itemgetter('helperType'), RATE_HELPER_STRUCTURES[template],
+        partial(getRateHelperStructure, template=template))
+    for template in [False, True]
+}
+
+
+def checkRateHelper(data: dict, pos: int, template: bool = False) -> None:
     '''
     Check if the rate helper is valid
 
@@ -956,6 +1552,10 @@ def checkRateHelper(data: dict, pos: int) -> None:
     ----------
     data: dict
         The rate helper
+    pos: int
+        The position of the rate helper in the curve
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
 
     Returns
     -------
@@ -982,38 +1582,23 @@ def checkRateHelper(data: dict, pos: int) -> None:
     ```
     '''
 
-    reference = {
-        "helperType": partial(checkIsInEnum, enum=[r.value for r in HelperType]),
-    }
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, RATE_HELPER_TYPE_STRUCTURE)
     except Exception as exc:
         raise ConfigurationError(
             'Invalid rate helper configuration or helper type at pos {}'.format(pos)) from exc
 
-    helperType = HelperType[data['helperType']]
-
-    reference["marketConfig"] = partial(
-        checkMarketConfig, helperType=helperType)
-    if helperType == HelperType.Deposit:
-        reference["helperConfig"] = checkDepositRateHelper
-    elif helperType == HelperType.Swap:
-        reference["helperConfig"] = checkSwapRateHelper
-    elif helperType == HelperType.FxSwap:
-        reference["helperConfig"] = checkFxSwapRateHelper
-    elif helperType == HelperType.Xccy:
-        reference["helperConfig"] = checkCrossCcyFixFloatSwapRateHelper
-    elif helperType == HelperType.TenorBasis:
-        reference["helperConfig"] = checkTenorBasisSwapRateHelper
-    elif helperType == HelperType.XccyBasis:
-        reference["helperConfig"] = checkCrossCcyBasisSwapRateHelper
-    elif helperType == HelperType.OIS:
-        reference["helperConfig"] = checkOISRateHelper
-    elif helperType == HelperType.Bond:
-        reference["helperConfig"] = checkFixedRateBondRateHelper
-
+    helperType = data['helperType']
+    structure = getRateHelperStructure(helperType, template)
+    # the built-in types are named by their HelperType member, as before the registry
+    helperType = HELPER_TYPES_BY_VALUE.get(helperType, helperType)
+    if structure is None:
+        # a built-in type without checks, e.g. SofrFuture, is rejected as by checkMarketConfig
+        raise RateHelperConfigurationError(
+            'Invalid rate helper {} configuration at pos {}'.format(helperType, pos)) \
+            from ConfigurationError('Invalid helper type')
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, structure)
     except Exception as exc:
         raise RateHelperConfigurationError(
             'Invalid rate helper {} configuration at pos {}'.format(helperType, pos)) from exc
@@ -1022,6 +1607,17 @@ def checkRateHelper(data: dict, pos: int) -> None:
 ## Index checks ##
 
 
+INDEX_STRUCTURE = compileStructure({
+    'indexType': INDEX_TYPE_RULE,
+    'tenor': TENOR_RULE,
+    'dayCounter': DAY_COUNTER_RULE,
+    'currency': CURRENCY_RULE,
+    'fixingDays': INT_RULE,
+    'calendar': CALENDAR_RULE,
+    'endOfMonth': BOOL_RULE,
+    'convention': CONVENTION_RULE
+})
+
 def checkIndex(data: dict) -> None:
     '''
     Check if the index is valid
@@ -1057,26 +1653,57 @@ def checkIndex(data: dict) -> None:
     ```
     '''
 
-    reference = {
-        "indexType": partial(checkIsInEnum, enum=IndexType.__members__),
-        "tenor": checkTenor,
-        "dayCounter": checkDayCounter,
-        "currency": checkCurrency,
-        "fixingDays": partial(checkInstance, type=int),
-        "calendar": checkCalendar,
-        "endOfMonth": partial(checkInstance, type=bool),
-        "convention": checkConvention
-    }
-
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, INDEX_STRUCTURE)
     except Exception as exc:
         raise RateIndexError('Invalid index configuration') from exc
 
 
 ## Curve checks ##
 
-def checkPiecewiseCurve(data: dict) -> None:
+def checkRateHelperList(l: list, template: bool = False) -> None:
+    '''
+    Check if the rate helpers of a piecewise curve are valid
+
+    Parameters
+    ----------
+    l: list
+        The rate helpers
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigurationError
+        If a rate helper is invalid or the list is empty
+    '''
+    checkInstance(l, type=list)
+    if len(l) == 0:
+        raise ConfigurationError(
+            'Invalid piecewise curve configuration, rateHelpers should not be empty')
+    for pos, helper in enumerate(l):
+        checkRateHelper(helper, pos, template)
+
+
+PIECEWISE_CURVE_STRUCTURES = {
+    template: compileStructure({
+        "curveType": CURVE_TYPE_RULE,
+        "dayCounter": DAY_COUNTER_RULE,
+        "enableExtrapolation": BOOL_RULE,
+        "currency": CURVE_CURRENCY_RULE,
+        "rateHelpers": (CompiledList(RATE_HELPER_SWITCHES[template],
+                                     partial(checkRateHelper, template=template)),
+                        partial(checkRateHelperList, template=template))
+    })
+    for template in [False, True]
+}
+
+
+def checkPiecewiseCurve(data: dict, template: bool = False) -> None:
     '''
     Check if the piecewise curve is valid
 
@@ -1084,6 +1711,8 @@ def checkPiecewiseCurve(data: dict) -> None:
     ----------
     data: dict
         The piecewise curve
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
 
     Returns
     -------
@@ -1110,29 +1739,56 @@ def checkPiecewiseCurve(data: dict) -> None:
         }
     ```
     '''
-    def checkRateHelperList(l: list) -> None:
-        checkInstance(l, type=list)
-        if len(l) == 0:
-            raise ConfigurationError(
-                'Invalid piecewise curve configuration, rateHelpers should not be empty')
-        for pos, helper in enumerate(l):
-            checkRateHelper(helper, pos)
-
-    reference = {
-        "curveType": partial(checkIsInEnum, enum=[r.value for r in CurveType]),
-        "dayCounter": checkDayCounter,
-        "enableExtrapolation": partial(checkInstance, type=bool),
-        "currency": partial(checkIsInEnum, enum=[r.name for r in Currency]),
-        "rateHelpers": checkRateHelperList
-    }
-
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, PIECEWISE_CURVE_STRUCTURES[bool(template)])
     except Exception as exc:
         raise ConfigurationError(
             'Invalid piecewise curve configuration') from exc
 
 
+NODE_STRUCTURE = compileStructure({
+    "date": DATE_RULE,
+    "value": NUMBER_RULE
+})
+
+
+def checkNodeList(l: list) -> None:
+    '''
+    Check if the nodes of a discount curve are valid
+
+    Parameters
+    ----------
+    l: list
+        The nodes, with a date and a value
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigurationError
+        If the list is empty
+    Exception
+        If a node is invalid
+    '''
+    checkInstance(l, type=list)
+    if len(l) == 0:
+        raise ConfigurationError(
+            'Invalid discount curve configuration, discountFactors should not be empty')
+    for node in l:
+        checkCompiledStructure(node, NODE_STRUCTURE)
+
+
+DISCOUNT_CURVE_STRUCTURE = compileStructure({
+    "curveType": CURVE_TYPE_RULE,
+    "dayCounter": DAY_COUNTER_RULE,
+    "enableExtrapolation": BOOL_RULE,
+    "currency": CURVE_CURRENCY_RULE,
+    "nodes": (CompiledList(NODE_STRUCTURE), checkNodeList)
+})
+
+
 def checkDiscountCurve(data: dict) -> None:
     '''
     Check if the discount curve is valid
@@ -1170,38 +1826,134 @@ def checkDiscountCurve(data: dict) -> None:
         }
     ```
     '''
-    def checkNodeList(l: list) -> None:
-        def checkValue(value):
-            if not isinstance(value, float) and not isinstance(value, int):
-                raise ValueError(
-                    f'The value {value} is not an instance of float or int.')
-        ref = {
-            "date": checkDate,
-            "value": checkValue
-        }
-        checkInstance(l, type=list)
-        if len(l) == 0:
-            raise ConfigurationError(
-                'Invalid discount curve configuration, discountFactors should not be empty')
-        for node in l:
-            checkDictStructure(node, ref)
-
-    reference = {
-        "curveType": partial(checkIsInEnum, enum=[r.value for r in CurveType]),
-        "dayCounter": checkDayCounter,
-        "enableExtrapolation": partial(checkInstance, type=bool),
-        "currency": partial(checkIsInEnum, enum=[r.name for r in Currency]),
-        "nodes": checkNodeList
+    try:
+        checkCompiledStructure(data, DISCOUNT_CURVE_STRUCTURE)
+    except Exception as exc:
+        raise ConfigurationError(
+            'Invalid discount curve configuration') from exc
+
+
+# the (structure, check) pair of the curve configuration by curve type name, the registered types are
+# compiled on first use
+CURVE_CONFIG_RULES = {
+    template: {
+        CurveType.Piecewise.value: (PIECEWISE_CURVE_STRUCTURES[template],
+                                    partial(checkPiecewiseCurve, template=template)),
+        CurveType.Discount.value: (DISCOUNT_CURVE_STRUCTURE, checkDiscountCurve)
     }
+    for template in [False, True]
+}
+
+
+def getCurveConfigRule(curveType, template: bool = False):
+    '''
+    Get the (structure, check) pair of the configuration of a curve type, compiling it for a registered
+    type on first use
+
+    Parameters
+    ----------
+    curveType: CurveType or str
+        The type of the curve
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
 
+    Returns
+    -------
+    tuple or None
+        The pair, or None if the type is unknown
+    '''
+    name = getTypeName(curveType)
+    if not isinstance(name, str):
+        return None
+    rules = CURVE_CONFIG_RULES[bool(template)]
+    rule = rules.get(name)
+    if rule is None:
+        definition = findCurveDefinition(name)
+        if definition is None:
+            return None
+        reference = definition.curveConfig
+        if callable(reference):
+            reference = reference(bool(template))
+        if isinstance(reference, dict):
+            reference = dict(reference, curveType=(frozenset([name]), checkCurveType))
+        rule = rules[name] = compileRule(reference)
+    return rule
+
+
+def getCurveConfigStructure(curveType, template: bool = False):
+    '''
+    Get the compiled structure of the configuration of a curve type, see getCurveConfigRule
+
+    Parameters
+    ----------
+    curveType: CurveType or str
+        The type of the curve
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
+
+    Returns
+    -------
+    CompiledStructure or None
+        The structure, or None if the type is unknown
+    '''
+    rule = getCurveConfigRule(curveType, template)
+    return None if rule is None else rule[0]
+
+
+def checkBaseCurve(data: dict, template: bool = False) -> None:
+    '''
+    Check if the configuration of a curve is valid, according to its curve type
+
+    Parameters
+    ----------
+    data: dict
+        The curve configuration
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigurationError
+        If the curve configuration is invalid
+    '''
+    if "curveType" not in data:
+        raise ConfigurationError(
+            'Invalid curve configuration, curveType should be defined')
+    rule = getCurveConfigRule(data["curveType"], template)
+    if rule is None:
+        raise ConfigurationError(
+            'Invalid curve configuration, curveType should be Piecewise or Discount')
     try:
-        checkDictStructure(data, reference)
+        rule[1](data)
+    except ConfigurationError:
+        raise
     except Exception as exc:
         raise ConfigurationError(
-            'Invalid discount curve configuration') from exc
+            'Invalid {} curve configuration'.format(data["curveType"])) from exc
+
+
+CURVE_CONFIG_SWITCHES = {
+    template: CompiledSwitch(
+        itemgetter('curveType'),
+        {curveType: rule[0] for curveType, rule in CURVE_CONFIG_RULES[template].items()},
+        partial(getCurveConfigStructure, template=template))
+    for template in [False, True]
+}
+CURVE_STRUCTURES = {
+    template: compileStructure({
+        "curveName": STR_RULE,
+        "curveConfig": (CURVE_CONFIG_SWITCHES[template], partial(checkBaseCurve, template=template)),
+        "curveIndex": (INDEX_STRUCTURE, checkIndex)
+    })
+    for template in [False, True]
+}
 
 
-def checkCurve(data: dict, pos: int) -> None:
+def checkCurve(data: dict, pos: int, template: bool = False) -> None:
     '''
     Check if the curve is valid
 
@@ -1209,6 +1961,10 @@ def checkCurve(data: dict, pos: int) -> None:
     ----------
     data: dict
         The curve
+    pos: int
+        The position of the curve in the configuration
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
 
     Returns
     -------
@@ -1238,26 +1994,8 @@ def checkCurve(data: dict, pos: int) -> None:
     }
     ```
     '''
-    def checkBaseCurve(dict: dict) -> None:
-        if "curveType" not in dict:
-            raise ConfigurationError(
-                'Invalid curve configuration, curveType should be defined')
-        if dict["curveType"] == CurveType.Piecewise.value:
-            checkPiecewiseCurve(dict)
-        elif dict["curveType"] == CurveType.Discount.value:
-            checkDiscountCurve(dict)
-        else:
-            raise ConfigurationError(
-                'Invalid curve configuration, curveType should be Piecewise or Discount')
-
-    reference = {
-        "curveName": partial(checkInstance, type=str),
-        "curveConfig": checkBaseCurve,
-        "curveIndex": checkIndex
-    }
-
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, CURVE_STRUCTURES[bool(template)])
     except ConfigurationError as exc:
         raise ConfigurationError(
             'Invalid curve configuration for {} curve'.format(data['curveName'])) from exc
@@ -1266,7 +2004,45 @@ def checkCurve(data: dict, pos: int) -> None:
             'Invalid curve configuration at pos {}'.format(pos)) from exc
 
 
-def checkConfiguration(data: dict) -> None:
+def checkCurveList(l: list, template: bool = False) -> None:
+    '''
+    Check if the curves of a configuration are valid
+
+    Parameters
+    ----------
+    l: list
+        The curves
+    template: bool, optional
+        If True, market values may be missing as long as they have a ticker
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigurationError
+        If a curve is invalid or the list is empty
+    '''
+    checkInstance(l, type=list)
+    if len(l) == 0:
+        raise ConfigurationError(
+            'Invalid configuration, curves should not be empty')
+    for pos, curve in enumerate(l):
+        checkCurve(curve, pos, template)
+
+
+CONFIGURATION_STRUCTURES = {
+    template: compileStructure({
+        "refDate": DATE_RULE,
+        "curves": (CompiledList(CURVE_STRUCTURES[template], partial(checkCurve, template=template)),
+                   partial(checkCurveList, template=template))
+    })
+    for template in [False, True]
+}
+
+
+def checkConfiguration(data: dict, template: bool = False) -> None:
     '''
     Check if the configuration is valid
 
@@ -1274,6 +2050,9 @@ def checkConfiguration(data: dict) -> None:
     ----------
     data: dict
         The configuration
+    template: bool, optional
+        If True, the configuration is a template: market values may be missing as long as they
+        have a ticker, to be bound later. The default is False.
 
     Returns
     -------
@@ -1312,20 +2091,7 @@ def checkConfiguration(data: dict) -> None:
     }
     ```
     '''
-    def checkCurveList(l: list) -> None:
-        checkInstance(l, type=list)
-        if len(l) == 0:
-            raise ConfigurationError(
-                'Invalid configuration, curves should not be empty')
-        for pos, curve in enumerate(l):
-            checkCurve(curve, pos)
-
-    reference = {
-        "refDate": checkDate,
-        "curves": checkCurveList
-    }
-
     try:
-        checkDictStructure(data, reference)
+        checkCompiledStructure(data, CONFIGURATION_STRUCTURES[bool(template)])
     except Exception as exc:
         raise ConfigurationError('Invalid configuration') from exc
@@ -0,0 +1,1094 @@
+import hashlib
+from collections import OrderedDict
+from .parsers import *
+from .others import *
+from .checks import *
+from .serialization import *
+
+# the keys whose values are parsed as nested configurations, walked while they are checked
+NESTED_KEYS = frozenset(['helperConfig', 'curveIndex', 'curveConfig', 'curves', 'rateHelpers'])
+# the error raised for an invalid value under each key
+ERROR_TYPES = {'rateHelpers': RateHelperConfigurationError, 'curveIndex': RateIndexError}
+# the parsers returning a member of an enum, whose values can be parsed in advance
+ENUM_PARSERS = frozenset([parseDayCounter, parseCalendar, parseBusinessDayConvention, parseFrequency,
+                          parseCurrency, parseCompounding, parseMonth, parseHelperType, parseCurveType,
+                          IndexType])
+# the FieldTable of each structure, built on first use
+FIELD_TABLES = {}
+# the structures of the conventions and of the rate helpers referencing them, see getConventionStructure
+CONVENTION_STRUCTURES = {}
+
+
+def parseConfiguration(data: dict, template: bool = False, structureCache=None) -> dict:
+    """
+    Check and parse a configuration in a single traversal. Each value is checked against the compiled
+    structures of checkConfiguration and parsed as by parse, and the dependencies between the curves are
+    collected on the way, as by getDependencyList. A configuration whose structure, everything but its
+    market values, is in the structure cache only has its market values checked, see StructureCache.
+
+    Parameters
+    ----------
+    data : dict
+        The configuration, see checkConfiguration
+    template : bool, optional
+        If True, the configuration is a template whose market values may be missing as long as they
+        have a ticker. The default is False.
+    structureCache : StructureCache, optional
+        The cache of the parsed structures. The default is None, STRUCTURE_CACHE. False disables the cache.
+
+    Returns
+    -------
+    dict
+        The parsed reference date ("refDate"), the parsed curves by curve name ("curves"), in the order of
+        the configuration, the set of names of the curves each curve depends on ("dependencies") and the
+        conventions by name ("conventions"), see resolveConventions. A curve name appearing twice keeps its
+        last curve.
+
+    Raises
+    ------
+    ConfigurationError
+        If the configuration is invalid. The message and the pointer attribute give the JSON pointer
+        (RFC 6901) of the invalid value, e.g. /curves/0/curveConfig/rateHelpers/3/helperConfig/tenor.
+        A RateHelperConfigurationError is raised for an invalid rate helper and a RateIndexError for
+        an invalid index.
+    """
+    structureCache = STRUCTURE_CACHE if structureCache is None else structureCache
+    key = getStructureKey(data, template) if structureCache is not False else None
+    if key is not None:
+        entry = structureCache.get(key)
+        if entry is not None and hasValidMarketValues(data, template):
+            return bindMarketConfigs(entry, data)
+
+    structure = CONFIGURATION_STRUCTURES[bool(template)]
+    try:
+        valid = structure.hasValidLeaves(data)
+    except Exception:
+        valid = False
+    if not valid:
+        checkLeaves(structure, data, '', ConfigurationError)
+
+    curves = data['curves']
+    if not isinstance(curves, list) or len(curves) == 0:
+        raiseInvalid('/curves', ConfigurationError, structure.rules['curves'][1], curves)
+    data = resolveConventions(data)
+    parsedCurves = {}
+    dependencies = {}
+    positions = {}
+    for pos, curve in enumerate(data['curves']):
+        parsed, deps = parseCurve(curve, (('', 'curves'), pos), template)
+        parsedCurves[parsed['curveName']] = parsed
+        dependencies[parsed['curveName']] = deps
+        positions[parsed['curveName']] = pos
+    configuration = {'refDate': parseDate(data['refDate']), 'curves': parsedCurves, 'dependencies': dependencies,
+                     'conventions': data.get('conventions', {})}
+    if key is not None:
+        structureCache.put(key, (configuration, positions))
+        return bindMarketConfigs((configuration, positions), data)
+    return configuration
+
+
+def getStructureKey(data: dict, template: bool = False):
+    """
+    Get the structural hash of a configuration, from its canonical encoding without the market values, so
+    that configurations differing only in their market values have the same hash, see StructureCache
+
+    Parameters
+    ----------
+    data : dict
+        The configuration, see checkConfiguration
+    template : bool, optional
+        If True, the configuration is a template, see parseConfiguration. The default is False.
+
+    Returns
+    -------
+    str or None
+        The hash, as a hexadecimal SHA-256 digest, or None if the configuration is too malformed to be hashed
+    """
+    try:
+        curves = []
+        for curve in data['curves']:
+            curveConfig = curve['curveConfig']
+            rateHelpers = curveConfig.get('rateHelpers')
+            if isinstance(rateHelpers, list):
+                # the prices are left to hasValidMarketValues, only the fields of the market configs are
+                # structural
+                rateHelpers = [{**rateHelper, 'marketConfig': list(rateHelper['marketConfig'])}
+                               for rateHelper in rateHelpers]
+                curve = {**curve, 'curveConfig': {**curveConfig, 'rateHelpers': rateHelpers}}
+            curves.append(curve)
+        structure = {**data, 'curves': curves}
+        if 'conventions' in data:
+            structure['conventions'] = {
+                name: convention.values if type(convention) is Convention else convention
+                for name, convention in data['conventions'].items()}
+        return hashlib.sha256(dumpJSON([bool(template), structure], sortKeys=True)).hexdigest()
+    except Exception:
+        return None
+
+
+def hasValidMarketValues(data: dict, template: bool = False) -> bool:
+    """
+    Check the market values of a configuration whose structure is valid, see StructureCache: each value
+    is a finite number, or is missing with a ticker in a template
+
+    Parameters
+    ----------
+    data : dict
+        The configuration, with a valid structure
+    template : bool, optional
+        If True, the configuration is a template, see parseConfiguration. The default is False.
+
+    Returns
+    -------
+    bool
+        True if the market values are valid
+    """
+    for curve in data['curves']:
+        for rateHelper in curve['curveConfig'].get('rateHelpers', []):
+            for price in rateHelper['marketConfig'].values():
+                if not isValidPrice(price, template):
+                    return False
+    return True
+
+
+def bindMarketConfigs(entry: tuple, data: dict) -> dict:
+    """
+    Bind the market configurations of a configuration to its parsed structure, see StructureCache
+
+    Parameters
+    ----------
+    entry : tuple
+        The parsed configuration, see parseConfiguration, and the position of each curve in the curves of the
+        configuration
+    data : dict
+        The configuration, with the same structure
+
+    Returns
+    -------
+    dict
+        A copy of the parsed configuration whose rate helpers have the market configurations of the
+        configuration, see parseConfiguration. The parsed values are shared with the entry.
+    """
+    configuration, positions = entry
+    curves = data['curves']
+    parsedCurves = {}
+    for curveName, parsed in configuration['curves'].items():
+        curveConfig = parsed['curveConfig']
+        if 'rateHelpers' in curveConfig:
+            rateHelpers = curves[positions[curveName]]['curveConfig']['rateHelpers']
+            parsed = {**parsed, 'curveConfig': {**curveConfig, 'rateHelpers': [
+                {**rateHelper, 'marketConfig': raw['marketConfig']}
+                for rateHelper, raw in zip(curveConfig['rateHelpers'], rateHelpers)]}}
+        parsedCurves[curveName] = parsed
+    return {**configuration, 'curves': parsedCurves,
+            'dependencies': {curveName: set(deps) for curveName, deps in configuration['dependencies'].items()}}
+
+
+class StructureCache:
+    '''
+    In-process cache of the parsed structures of the configurations, keyed by their structural hash, see
+    getStructureKey. A configuration differing from a cached one only in its market values is not checked
+    and parsed again: its market values are checked, see hasValidMarketValues, and bound to the cached
+    structure, see bindMarketConfigs. Only valid configurations are cached. The least recently used entries
+    are evicted beyond maxSize entries.
+
+    Parameters
+    ----------
+    maxSize : int, optional
+        The maximum number of entries. The default is 64.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, maxSize=64):
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+
+    '''
+    Get a parsed structure.
+
+    Parameters
+    ----------
+    key : str
+        The hash of the structure.
+
+    Returns
+    -------
+    tuple or None
+        The parsed configuration and the position of each curve, or None if the structure is not cached.
+    '''
+
+    def get(self, key):
+        if key not in self.__entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key]
+
+    '''
+    Add a parsed structure, evicting the least recently used entries if needed.
+
+    Parameters
+    ----------
+    key : str
+        The hash of the structure.
+    entry : tuple
+        The parsed configuration and the position of each curve.
+
+    Returns
+    -------
+    None
+    '''
+
+    def put(self, key, entry):
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.maxSize:
+            self.__entries.popitem(last=False)
+
+    '''
+    Clear the cache. The hit and miss counters are kept.
+
+    Returns
+    -------
+    None
+    '''
+
+    def clear(self):
+        self.__entries.clear()
+
+    '''
+    Get the cache statistics.
+
+    Returns
+    -------
+    dict
+        The number of hits ("hits") and misses ("misses"), the maximum size ("maxSize") and the current size
+        ("size") of the cache, in entries.
+    '''
+
+    def cacheInfo(self):
+        return {'hits': self.hits, 'misses': self.misses, 'maxSize': self.maxSize, 'size': len(self.__entries)}
+
+
+# the cache shared by the configurations parsed in the process, see parseConfiguration
+STRUCTURE_CACHE = StructureCache()
+
+
+def indexConfiguration(data: dict) -> dict:
+    """
+    Index a configuration without checking its curves, for engines parsing each curve on first use.
+    Only the reference date and the curve names are checked; the dependencies and tickers are read
+    from the raw curves, see indexCurve.
+
+    Parameters
+    ----------
+    data : dict
+        The configuration, see checkConfiguration
+
+    Returns
+    -------
+    dict
+        The parsed reference date ("refDate"), the raw curves by curve name ("curves"), in the order of
+        the configuration and with their conventions resolved, see resolveConventions, their JSON pointers
+        ("pointers"), the set of names of the curves each curve depends on ("dependencies"), the set of
+        tickers of each curve ("tickers") and the conventions by name ("conventions"). A curve name
+        appearing twice keeps its last curve.
+
+    Raises
+    ------
+    ConfigurationError
+        If the reference date, the curve list, a curve name or a convention is invalid
+    """
+    structure = CONFIGURATION_STRUCTURES[False]
+    checkLeaves(structure, data, '', ConfigurationError)
+
+    curves = data['curves']
+    if not isinstance(curves, list) or len(curves) == 0:
+        raiseInvalid('/curves', ConfigurationError, structure.rules['curves'][1], curves)
+    data = resolveConventions(data)
+    configuration = {'refDate': parseDate(data['refDate']), 'curves': {}, 'pointers': {},
+                     'dependencies': {}, 'tickers': {}, 'conventions': data.get('conventions', {})}
+    for pos, curve in enumerate(data['curves']):
+        curveName, dependencies, tickers = indexCurve(curve, pos)
+        configuration['curves'][curveName] = curve
+        configuration['pointers'][curveName] = (('', 'curves'), pos)
+        configuration['dependencies'][curveName] = dependencies
+        configuration['tickers'][curveName] = tickers
+    return configuration
+
+
+def indexCurve(data: dict, pos: int) -> tuple:
+    """
+    Read the name, dependencies and tickers of a raw curve, see indexConfiguration. A curve too
+    malformed to read its dependencies and tickers from is left without them, its errors being
+    raised when it is parsed, see parseCurve.
+
+    Parameters
+    ----------
+    data : dict
+        The curve
+    pos : int
+        The position of the curve in the configuration
+
+    Returns
+    -------
+    tuple
+        The curve name, the set of names of the curves it depends on, see getDependencyList, and the
+        set of its tickers, see getTickers
+
+    Raises
+    ------
+    ConfigurationError
+        If the curve name is invalid
+    """
+    curveName = data.get('curveName') if isinstance(data, dict) else None
+    if not isinstance(curveName, str):
+        raiseInvalid('/curves/{}/curveName'.format(pos), ConfigurationError, None)
+    try:
+        return curveName, getCurveDependencies(data), getTickers(data)
+    except Exception:
+        return curveName, set(), set()
+
+
+class Convention:
+    '''
+    A named set of rate helper configuration values, given in the conventions section of a configuration
+    and referenced by the convention key of the rate helpers, see resolveConventions. Its values are checked
+    and parsed once for each structure of rate helper configuration, see walkConventionConfig.
+
+    Parameters
+    ----------
+    name : str
+        The name of the convention
+    values : dict
+        The rate helper configuration values, e.g. calendar, dayCounter and settlementDays
+    path : tuple or str, optional
+        The path of the convention, see formatPointer. The default is '', the root.
+
+    Returns
+    -------
+    None
+    '''
+
+    __slots__ = ('name', 'values', 'keys', 'path', 'parsed')
+
+    def __init__(self, name: str, values: dict, path=''):
+        self.name = name
+        self.values = values
+        self.keys = frozenset(values.keys())
+        self.path = path
+        # the parsed values by structure of rate helper configuration
+        self.parsed = {}
+
+    def __getstate__(self):
+        return (self.name, self.values, self.path)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+class ConventionHelperConfig(dict):
+    '''
+    Configuration of a rate helper referencing a convention: the values of the convention updated with
+    the own values of the rate helper, see resolveConventions.
+
+    Parameters
+    ----------
+    convention : Convention
+        The convention
+    own : dict
+        The own values of the rate helper
+
+    Returns
+    -------
+    None
+    '''
+
+    __slots__ = ('convention', 'own', 'overridden')
+
+    def __init__(self, convention: Convention, own: dict):
+        dict.__init__(self, convention.values, **own)
+        self.convention = convention
+        self.own = own
+        # the values of the convention given again by the rate helper
+        self.overridden = convention.keys.intersection(own)
+
+    def __reduce__(self):
+        return (ConventionHelperConfig, (self.convention, self.own))
+
+
+def readConventions(data: dict) -> dict:
+    """
+    Read the conventions section of a configuration
+
+    Parameters
+    ----------
+    data : dict
+        The configuration, with an optional conventions section giving the rate helper configuration
+        values of each convention by name
+
+    Returns
+    -------
+    dict
+        The conventions by name, see Convention
+
+    Raises
+    ------
+    ConfigurationError
+        If the section or a convention is not a dictionary
+    """
+    section = data.get('conventions', {})
+    if not isinstance(section, dict):
+        raiseInvalid('/conventions', ConfigurationError, checkInstance, section, dict)
+    conventions = {}
+    for name, values in section.items():
+        if isinstance(values, Convention):
+            conventions[name] = values
+            continue
+        path = (('', 'conventions'), name)
+        if not isinstance(values, dict):
+            raiseInvalid(formatPointer(path), ConfigurationError, checkInstance, values, dict)
+        conventions[name] = Convention(name, values, path)
+    return conventions
+
+
+def resolveCurve(data: dict, conventions: dict, pointer: str = '') -> dict:
+    """
+    Resolve the conventions referenced by the rate helpers of a curve, see resolveConventions. A curve
+    too malformed to have rate helpers is returned as it is, its errors being raised when it is parsed.
+
+    Parameters
+    ----------
+    data : dict
+        The curve
+    conventions : dict
+        The conventions by name, see readConventions
+    pointer : str, optional
+        The JSON pointer of the curve, prefixed to the pointers of the errors. The default is '', the root.
+
+    Returns
+    -------
+    dict
+        The curve, or a copy of it if a rate helper references a convention, where the rate helper has
+        the convention values updated with its own values as configuration, see ConventionHelperConfig
+
+    Raises
+    ------
+    ConfigurationError
+        If a rate helper references an unknown convention
+    """
+    try:
+        rateHelpers = data['curveConfig']['rateHelpers']
+        if not any('convention' in rateHelper for rateHelper in rateHelpers):
+            return data
+    except Exception:
+        return data
+
+    resolved = []
+    for pos, rateHelper in enumerate(rateHelpers):
+        if 'convention' not in rateHelper:
+            resolved.append(rateHelper)
+            continue
+        name = rateHelper['convention']
+        convention = conventions.get(name) if isinstance(name, str) else None
+        if convention is None:
+            conventionPointer = '{}/curveConfig/rateHelpers/{}/convention'.format(pointer, pos)
+            raise RateHelperConfigurationError('Invalid configuration at {}: Unknown convention {}'.format(
+                conventionPointer, name), pointer=conventionPointer)
+        rateHelper = dict(rateHelper)
+        del rateHelper['convention']
+        own = rateHelper.get('helperConfig', {})
+        if isinstance(own, dict):
+            rateHelper['helperConfig'] = ConventionHelperConfig(convention, own)
+        resolved.append(rateHelper)
+    return {**data, 'curveConfig': {**data['curveConfig'], 'rateHelpers': resolved}}
+
+
+def resolveConventions(data: dict) -> dict:
+    """
+    Resolve the conventions of a configuration. A rate helper given a convention by name, as in
+    "convention": "USD-SOFR-OIS" next to its helperType, takes the values of the convention in the
+    conventions section as configuration, updated with the values of its own helperConfig, so that
+    only the tenor and the market data need to vary between rate helpers:
+    ```
+    "conventions": {
+        "USD-SOFR-OIS": {
+            "dayCounter": "Actual360",
+            "calendar": "NullCalendar",
+            ...
+        }
+    },
+    "curves": [
+        {
+            "curveName": "SOFR",
+            "curveConfig": {
+                "rateHelpers": [
+                    {
+                        "helperType": "OIS",
+                        "convention": "USD-SOFR-OIS",
+                        "helperConfig": {"tenor": "1Y"},
+                        "marketConfig": {...}
+                    },
+                    ...
+    ```
+
+    Parameters
+    ----------
+    data : dict
+        The configuration
+
+    Returns
+    -------
+    dict
+        The configuration, or a copy of it with the conventions by name ("conventions"), see Convention,
+        and the curves resolved, see resolveCurve. A resolved configuration is returned as it is.
+
+    Raises
+    ------
+    ConfigurationError
+        If a convention is invalid, or a rate helper references an unknown convention
+    """
+    conventions = readConventions(data)
+    curves = data['curves']
+    resolved = [resolveCurve(curve, conventions, '/curves/{}'.format(pos)) for pos, curve in enumerate(curves)]
+    if all(curve is resolvedCurve for curve, resolvedCurve in zip(curves, resolved)) and \
+            all(type(convention) is Convention for convention in data.get('conventions', {}).values()):
+        return data
+    return {**data, 'conventions': conventions, 'curves': resolved}
+
+
+def parseCurve(data: dict, pointer='', template: bool = False) -> tuple:
+    """
+    Check and parse a curve in a single traversal, see parseConfiguration
+
+    Parameters
+    ----------
+    data : dict
+        The curve, see checkCurve
+    pointer : str or tuple, optional
+        The JSON pointer of the curve, or its path, see formatPointer, prefixed to the pointers of the errors.
+        The default is '', the root.
+    template : bool, optional
+        If True, market values may be missing as long as they have a ticker. The default is False.
+
+    Returns
+    -------
+    tuple
+        The parsed curve, as returned by parse, and the set of names of the curves it depends on
+
+    Raises
+    ------
+    ConfigurationError
+        If the curve is invalid, see parseConfiguration
+    """
+    dependencies = set()
+    parsed = walkStructure(CURVE_STRUCTURES[bool(template)], data, pointer, ConfigurationError,
+                           dependencies, True)
+    return parsed, dependencies
+
+
+def formatPointer(path) -> str:
+    """
+    Format the path of a value as a JSON pointer (RFC 6901). The path is built while walking a
+    configuration as nested (parent, key) pairs, and only formatted on errors.
+
+    Parameters
+    ----------
+    path : tuple or str
+        The path, a (parent path, key) pair, or the JSON pointer of the root
+
+    Returns
+    -------
+    str
+        The JSON pointer
+    """
+    tokens = []
+    while isinstance(path, tuple):
+        path, key = path
+        tokens.append(escapePointer(key))
+    return path + ''.join('/' + token for token in reversed(tokens))
+
+
+def escapePointer(key) -> str:
+    """
+    Escape a key as a JSON pointer reference token (RFC 6901)
+
+    Parameters
+    ----------
+    key : str or int
+        The key, or the position in a list
+
+    Returns
+    -------
+    str
+        The escaped key
+    """
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def getErrorReason(exc: Exception) -> str:
+    """
+    Get the reason of an error, the message of the innermost error of its chain
+
+    Parameters
+    ----------
+    exc : Exception
+        The error
+
+    Returns
+    -------
+    str
+        The reason
+    """
+    while exc.__cause__ is not None:
+        exc = exc.__cause__
+    return str(exc.args[0]) if exc.args else type(exc).__name__
+
+
+def raiseInvalid(pointer: str, errorType: type, check, *args) -> None:
+    """
+    Raise the error of an invalid value, with the reason given by its check
+
+    Parameters
+    ----------
+    pointer : str
+        The JSON pointer of the value
+    errorType : type
+        The ConfigurationError subclass to raise
+    check : callable
+        The check of the value, or None
+    *args
+        The arguments of the check
+
+    Raises
+    ------
+    ConfigurationError
+        Always
+    """
+    reason = 'Invalid value'
+    if check is not None:
+        try:
+            check(*args)
+        except Exception as exc:
+            raise errorType('Invalid configuration at {}: {}'.format(
+                pointer or '/', getErrorReason(exc)), pointer=pointer) from exc
+    raise errorType('Invalid configuration at {}: {}'.format(pointer or '/', reason), pointer=pointer)
+
+
+def checkLeaves(structure: CompiledStructure, data: dict, pointer: str, errorType: type) -> None:
+    """
+    Check the values of a dictionary that failed CompiledStructure.hasValidLeaves, raising the error of
+    the first invalid value. A value that fails its rule but passes its check is valid.
+
+    Parameters
+    ----------
+    structure : CompiledStructure
+        The structure of the dictionary
+    data : dict
+        The dictionary
+    pointer : str
+        The JSON pointer of the dictionary
+    errorType : type
+        The ConfigurationError subclass to raise
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigurationError
+        If the dictionary or one of its values is invalid
+    """
+    if not isinstance(data, dict):
+        raise errorType('Invalid configuration at {}: The value {} is not an instance of {}.'.format(
+            pointer or '/', data, dict), pointer=pointer)
+    for key in structure.requiredKeys:
+        if key not in data:
+            keyPointer = pointer + '/' + escapePointer(key)
+            raise errorType('Invalid configuration at {}: The required key "{}" is missing.'.format(
+                keyPointer, key), pointer=keyPointer)
+    for key, value in data.items():
+        if key in structure.nodes or key not in structure.rules:
+            continue
+        spec, check = structure.rules[key]
+        if not isValidBySpec(spec, value):
+            try:
+                check(value)
+            except Exception as exc:
+                keyPointer = pointer + '/' + escapePointer(key)
+                raise errorType('Invalid configuration at {}: {}'.format(keyPointer, getErrorReason(exc)),
+                                pointer=keyPointer) from exc
+
+
+def isValidBySpec(spec, value) -> bool:
+    """
+    Check a value against the spec of its rule, see CompiledStructure
+
+    Parameters
+    ----------
+    spec : frozenset, re.Pattern, type, tuple or callable
+        The allowed values, the pattern a string must match, the allowed types or a predicate
+    value : any
+        The value
+
+    Returns
+    -------
+    bool
+        True if the value is valid, False otherwise, also if the spec raises on it
+    """
+    try:
+        if isinstance(spec, frozenset):
+            return value in spec
+        if isinstance(spec, re.Pattern):
+            return spec.match(value) is not None
+        if isinstance(spec, (type, tuple)):
+            return isinstance(value, spec)
+        return bool(spec(value))
+    except Exception:
+        return False
+
+
+def walkNode(key: str, rule: tuple, value, path: tuple, errorType: type, dependencies: set, convert: bool):
+    """
+    Check and parse the value of a key with a nested rule, see CompiledStructure.nodes
+
+    Parameters
+    ----------
+    key : str
+        The key
+    rule : tuple
+        The (rule, check) pair of the key, where the rule is a CompiledStructure, a CompiledList or a
+        CompiledSwitch
+    value : any
+        The value
+    path : tuple
+        The path of the value, see formatPointer
+    errorType : type
+        The ConfigurationError subclass raised for an invalid value
+    dependencies : set
+        The set collecting the curves referenced by the rate helpers, or None
+    convert : bool
+        If True, the value is parsed as by parse, otherwise it is only checked
+
+    Returns
+    -------
+    any
+        The parsed value, or the value itself if convert is False
+    """
+    node, check = rule
+    errorType = ERROR_TYPES.get(key, errorType)
+    nested = convert and key in NESTED_KEYS
+    if type(node) is CompiledStructure:
+        if nested and type(value) is ConventionHelperConfig:
+            parsed = walkConventionConfig(node, value, path, errorType, dependencies)
+        else:
+            parsed = walkStructure(node, value, path, errorType, dependencies, nested)
+    elif type(node) is CompiledList:
+        parsed = walkList(node, value, path, errorType, dependencies, nested, check)
+    else:
+        parsed = walkSwitch(node, value, path, errorType, dependencies, nested, check, value)
+    if dependencies is not None and key == 'helperConfig':
+        for dependencyKey in DEPENDENCY_KEYS:
+            if dependencyKey in value:
+                dependencies.add(value[dependencyKey])
+    if nested:
+        return parsed
+    return parseField(key, value) if convert else value
+
+
+def walkConventionConfig(structure: CompiledStructure, value, path: tuple, errorType: type, dependencies: set):
+    """
+    Check and parse the configuration of a rate helper referencing a convention, see ConventionHelperConfig.
+    The values of the convention are checked and parsed on the first rate helper of each structure and
+    shared with the next ones, whose own values are checked and parsed against the rest of the structure.
+
+    Parameters
+    ----------
+    structure : CompiledStructure
+        The structure of the rate helper configuration
+    value : ConventionHelperConfig
+        The rate helper configuration
+    path : tuple
+        The path of the value, see formatPointer
+    errorType : type
+        The ConfigurationError subclass raised for an invalid value
+    dependencies : set
+        The set collecting the curves referenced by the rate helpers, or None
+
+    Returns
+    -------
+    dict
+        The parsed configuration
+    """
+    convention = value.convention
+    parsed = convention.parsed.get(structure)
+    if parsed is None:
+        conventionStructure = getConventionStructure(structure, convention.keys)
+        parsed = convention.parsed[structure] = walkStructure(
+            conventionStructure, convention.values, convention.path, errorType, dependencies, True)
+
+    # the values of the convention given again by the rate helper are checked as its own
+    ownStructure = getConventionStructure(structure, convention.keys, value.overridden)
+    return {**parsed, **walkStructure(ownStructure, value.own, path, errorType, dependencies, True)}
+
+
+def getConventionStructure(structure: CompiledStructure, keys: frozenset, overridden: frozenset = None):
+    """
+    Get the structure of the values of a convention, or of the values left to the rate helpers
+    referencing it, see walkConventionConfig. The structures are compiled on first use and kept, so
+    their field tables are built once, see FieldTable.
+
+    Parameters
+    ----------
+    structure : CompiledStructure
+        The structure of the rate helper configuration
+    keys : frozenset
+        The keys of the convention
+    overridden : frozenset, optional
+        The keys of the convention given again by the rate helper. The default is None, for the structure
+        of the convention.
+
+    Returns
+    -------
+    CompiledStructure
+        The structure
+    """
+    cacheKey = (structure, keys, overridden)
+    compiled = CONVENTION_STRUCTURES.get(cacheKey)
+    if compiled is None:
+        if overridden is None:
+            rules = {key: rule for key, rule in structure.rules.items() if key in keys}
+        else:
+            rules = {key: rule for key, rule in structure.rules.items() if key not in keys or key in overridden}
+        compiled = CONVENTION_STRUCTURES[cacheKey] = CompiledStructure(rules)
+    return compiled
+
+
+def walkList(node: CompiledList, value, path: tuple, errorType: type, dependencies: set, convert: bool, check):
+    """
+    Check and parse a non-empty list with a compiled rule, item by item
+
+    Parameters
+    ----------
+    node : CompiledList
+        The rule of the list
+    value : any
+        The value, expected to be a non-empty list
+    path : tuple
+        The path of the value, see formatPointer
+    errorType : type
+        The ConfigurationError subclass raised for an invalid value
+    dependencies : set
+        The set collecting the curves referenced by the rate helpers, or None
+    convert : bool
+        If True, the items are parsed as by parse, otherwise they are only checked
+    check : callable
+        The check giving the reason of an invalid list, or None
+
+    Returns
+    -------
+    list
+        The parsed items, or the items themselves if convert is False
+
+    Raises
+    ------
+    ConfigurationError
+        If the value is not a non-empty list or an item is invalid, with the pointer of the value
+    """
+    if not isinstance(value, list) or len(value) == 0:
+        raiseInvalid(formatPointer(path), errorType, check, value)
+    item, itemCheck = node.item, node.check
+    isSwitch = type(item) is CompiledSwitch
+    results = []
+    for pos, itemValue in enumerate(value):
+        if isSwitch:
+            results.append(walkSwitch(item, itemValue, (path, pos), errorType, dependencies, convert,
+                                      itemCheck, itemValue, pos))
+        else:
+            results.append(walkStructure(item, itemValue, (path, pos), errorType, dependencies, convert))
+    return results
+
+
+def walkSwitch(node: CompiledSwitch, value, path: tuple, errorType: type, dependencies: set, convert: bool,
+               check, *args):
+    """
+    Check and parse a dictionary with the structure of its case, see CompiledSwitch
+
+    Parameters
+    ----------
+    node : CompiledSwitch
+        The rule of the dictionary
+    value : any
+        The value, expected to be a dictionary
+    path : tuple
+        The path of the value, see formatPointer
+    errorType : type
+        The ConfigurationError subclass raised for an invalid value
+    dependencies : set
+        The set collecting the curves referenced by the rate helpers, or None
+    convert : bool
+        If True, the value is parsed as by parse, otherwise it is only checked
+    check : callable
+        The check giving the reason of a value without a valid case, or None
+    *args
+        The arguments of the check
+
+    Returns
+    -------
+    dict
+        The parsed value, or the value itself if convert is False
+
+    Raises
+    ------
+    ConfigurationError
+        If the value has no valid case or is invalid for the structure of its case
+    """
+    # an input of an unknown case gets the error of its check
+    try:
+        structure = node.select(value)
+    except Exception:
+        structure = None
+    if structure is None:
+        raiseInvalid(formatPointer(path), errorType, check, *args)
+    return walkStructure(structure, value, path, errorType, dependencies, convert)
+
+
+def walkStructure(structure: CompiledStructure, data: dict, path: tuple, errorType: type, dependencies: set,
+                  convert: bool):
+    """
+    Check and parse a dictionary with a compiled structure. The leaves are checked at once, and parsed
+    from the field table of the structure; the values are only checked one by one, to report the first
+    invalid one, when this fails.
+
+    Parameters
+    ----------
+    structure : CompiledStructure
+        The structure of the dictionary
+    data : dict
+        The dictionary
+    path : tuple
+        The path of the dictionary, see formatPointer
+    errorType : type
+        The ConfigurationError subclass raised for an invalid value
+    dependencies : set
+        The set collecting the curves referenced by the rate helpers, or None
+    convert : bool
+        If True, the dictionary is parsed as by parse, otherwise it is only checked
+
+    Returns
+    -------
+    dict
+        The parsed dictionary, or the dictionary itself if convert is False
+
+    Raises
+    ------
+    ConfigurationError
+        If a value is invalid, with the pointer of the first invalid value
+    """
+    if not convert:
+        try:
+            valid = structure.hasValidLeaves(data)
+        except Exception:
+            valid = False
+        if not valid:
+            checkLeaves(structure, data, formatPointer(path), errorType)
+        for key, rule in structure.nodes.items():
+            walkNode(key, rule, data[key], (path, key), errorType, dependencies, False)
+        return data
+
+    table = FIELD_TABLES.get(structure)
+    if table is None:
+        table = FIELD_TABLES[structure] = FieldTable(structure)
+    try:
+        valid = table.residual.hasValidLeaves(data)
+    except Exception:
+        valid = False
+    if valid:
+        fields = table.fields
+        results = {}
+        matched = 0
+        try:
+            for key, value in data.items():
+                field = fields.get(key)
+                if field is None:
+                    results[key] = value
+                elif type(field) is dict:
+                    results[key] = field[value]
+                    matched += 1
+                elif type(field) is tuple:
+                    results[key] = walkNode(key, field, value, (path, key), errorType, dependencies, True)
+                    matched += 1
+                else:
+                    results[key] = field(value)
+        except ConfigurationError:
+            raise
+        except Exception:
+            matched = -1
+        if matched == table.expected:
+            return results
+
+    # an invalid value, a valid value missing from a table or a value its parser rejects
+    checkLeaves(structure, data, formatPointer(path), errorType)
+    nodes = structure.nodes
+    results = {}
+    for key, value in data.items():
+        if key in nodes:
+            results[key] = walkNode(key, nodes[key], value, (path, key), errorType, dependencies, True)
+            continue
+        try:
+            results[key] = parseField(key, value)
+        except Exception as exc:
+            pointer = formatPointer((path, key))
+            raise errorType('Invalid configuration at {}: {}'.format(pointer, getErrorReason(exc)),
+                            pointer=pointer) from exc
+    return results
+
+
+class FieldTable:
+    '''
+    Parsing table of a compiled structure, see walkStructure. The values of the keys with an enum rule and
+    an enum parser are checked and parsed at once, by a lookup in a table of their parsed values. The other
+    values are checked by the residual structure and parsed by their parser, see FIELD_PARSERS. The nested
+    rules are walked, see walkNode.
+
+    Parameters
+    ----------
+    structure: CompiledStructure
+        The structure
+
+    Returns
+    -------
+    None
+    '''
+
+    __slots__ = ('fields', 'residual', 'expected')
+
+    def __init__(self, structure: CompiledStructure):
+        self.fields = dict(FIELD_PARSERS)
+        residual = {}
+        for key, rule in structure.rules.items():
+            spec, check = rule
+            parser = FIELD_PARSERS.get(key)
+            if key in structure.nodes:
+                if type(spec) is CompiledStructure and not spec.nodes and key not in NESTED_KEYS:
+                    # a flat structure kept as it is, e.g. marketConfig, is checked as a single value
+                    residual[key] = (spec.isValid, check)
+                else:
+                    self.fields[key] = rule
+            elif isinstance(spec, frozenset) and parser in ENUM_PARSERS:
+                try:
+                    self.fields[key] = {value: parser(value) for value in spec}
+                except Exception:
+                    residual[key] = rule
+            else:
+                residual[key] = rule
+        self.residual = CompiledStructure(residual)
+        # the number of required keys checked by lookup, all of them should be found
+        self.expected = len(structure.rules) - len(residual)
@@ -0,0 +1,120 @@
+from .parsers import *
+from .others import *
+from .ratehelpers import *
+from .checks import *
+from .registry import *
+
+
+def createPiecewiseCurve(data: dict, refDate: ore.Date, curveHandles: dict, indexes: dict, *args,
+                         quotes: dict = None, **kwargs):
+    """
+    Create a piecewise curve, bootstrapped from its rate helpers
+
+    Parameters
+    ----------
+    data : dict
+        The parsed curve, see parse
+    refDate : ore.Date
+        The reference date
+    curveHandles : dict
+        The curve handles by curve name
+    indexes : dict
+        The indexes by name
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
+
+    Returns
+    -------
+    ore.PiecewiseLogLinearDiscount
+        The curve
+
+    Raises
+    ------
+    ConfigurationError
+        If the type of a rate helper is not registered
+    """
+    config = data['curveConfig']
+    rateHelpers = []
+    for rateHelper in config['rateHelpers']:
+        definition = findRateHelperDefinition(rateHelper['helperType'])
+        if definition is None:
+            raise ConfigurationError('Failed to create curve {}: unknown rate helper type {}'.format(
+                data['curveName'], getTypeName(rateHelper['helperType'])))
+        rateHelpers.append(definition.builder(rateHelper['helperConfig'], rateHelper['marketConfig'],
+                                              curveHandles, indexes, quotes=quotes, refDate=refDate))
+
+    curve = ore.PiecewiseLogLinearDiscount(refDate, rateHelpers, config['dayCounter'])
+    if config.get('enableExtrapolation', False):
+        curve.enableExtrapolation()
+    return curve
+
+
+def createDiscountCurve(data: dict, refDate: ore.Date, *args, **kwargs):
+    """
+    Create a discount curve, interpolating its discount factor nodes
+
+    Parameters
+    ----------
+    data : dict
+        The parsed curve, see parse
+    refDate : ore.Date
+        The reference date
+
+    Returns
+    -------
+    ore.DiscountCurve
+        The curve
+    """
+    config = data['curveConfig']
+    dates = [node['date'] for node in config['nodes']]
+    dfs = [node['value'] for node in config['nodes']]
+    if dates[0] != refDate:
+        raise Exception(
+            'Failed to create curve {}: first date in discount curve must be the reference date'.format(data['curveName']))
+
+    if dfs[0] != 1.0:
+        raise Exception(
+            'Failed to create curve {}: first discount factor in discount curve must be 1.0'.format(data['curveName']))
+
+    curve = ore.DiscountCurve(dates, dfs, config['dayCounter'])
+    if config.get('enableExtrapolation', False):
+        curve.enableExtrapolation()
+    return curve
+
+
+# the builders of the built-in rate helper types. SofrFuture is left out, as checkRateHelper rejects it
+# until it has checks, see createSofrFutureRateHelper
+RATE_HELPER_BUILDERS = {
+    HelperType.Deposit: createDepositRateHelper,
+    HelperType.Swap: createSwapRateHelper,
+    HelperType.FxSwap: createFxSwapRateHelper,
+    HelperType.Xccy: createCrossCcyFixFloatSwapRateHelper,
+    HelperType.TenorBasis: createTenorBasisSwapRateHelper,
+    HelperType.XccyBasis: createCrossCcyBasisSwapRateHelper,
+    HelperType.OIS: createOISRateHelper,
+    HelperType.Bond: createFixedRateBondRateHelper
+}
+CURVE_BUILDERS = {
+    CurveType.Piecewise: createPiecewiseCurve,
+    CurveType.Discount: createDiscountCurve
+}
+
+
+def registerBuiltInDefinitions() -> None:
+    """
+    Register the built-in rate helper and curve types, whose rules are the ones of checkRateHelper
+    and checkBaseCurve
+
+    Returns
+    -------
+    None
+    """
+    for helperType, builder in RATE_HELPER_BUILDERS.items():
+        registerRateHelperDefinition(RateHelperDefinition(
+            helperType.value, builder, HELPER_CONFIG_RULES[helperType], MARKET_CONFIG_FIELDS[helperType]))
+    for curveType, builder in CURVE_BUILDERS.items():
+        registerCurveDefinition(CurveDefinition(
+            curveType.value, builder, partial(getCurveConfigRule, curveType)))
+
+
+registerBuiltInDefinitions()
@@ -0,0 +1,302 @@
+import re
+import json
+import codecs
+from collections.abc import MutableMapping
+from .parsers import *
+from .others import *
+from .checks import *
+from .configuration import *
+from .serialization import *
+
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_DECODER = json.JSONDecoder()
+
+
+class JSONReader:
+    '''
+    Incremental reader of the JSON values of a binary file, keeping in memory only the part of the file
+    not read yet, and the byte offset and length of each value read, see CurveSetFile.
+
+    Parameters
+    ----------
+    file : file object
+        The file, opened in binary mode, UTF-8 encoded
+    chunkSize : int, optional
+        The number of bytes read at a time, doubled while a value does not fit. The default is 1 MiB.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, file, chunkSize: int = 2 ** 20):
+        self.file = file
+        self.chunkSize = chunkSize
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    '''
+    Read more of the file, dropping the part of the buffer already read.
+
+    Parameters
+    ----------
+    size : int
+        The number of bytes to read.
+
+    Returns
+    -------
+    None
+    '''
+
+    def fill(self, size):
+        chunk = self.file.read(size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    '''
+    Skip the whitespace and get the next character, without reading it.
+
+    Returns
+    -------
+    str
+        The next character, or an empty string at the end of the file.
+    '''
+
+    def peek(self):
+        while True:
+            end = JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            # the JSON whitespace is ASCII, one byte per character
+            self.offset += end - self.pos
+            self.pos = end
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ''
+            self.fill(self.chunkSize)
+
+    '''
+    Read the next character, which must be one of the given ones.
+
+    Parameters
+    ----------
+    chars : str
+        The expected characters.
+
+    Returns
+    -------
+    str
+        The character read.
+
+    Raises
+    ------
+    ConfigurationError
+        If the next character is not expected
+    '''
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ConfigurationError('Invalid JSON at byte {}: expected one of {}'.format(self.offset, chars))
+        self.pos += 1
+        self.offset += 1
+        return char
+
+    '''
+    Read the next value.
+
+    Returns
+    -------
+    tuple
+        The value, and its byte offset and length in the file.
+
+    Raises
+    ------
+    ConfigurationError
+        If the value is not valid JSON
+    '''
+
+    def value(self):
+        self.peek()
+        size = self.chunkSize
+        while True:
+            try:
+                value, end = JSON_DECODER.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer may continue in the file
+                if end < len(self.buffer) or self.eof:
+                    break
+            except json.JSONDecodeError as exc:
+                if self.eof:
+                    raise ConfigurationError('Invalid JSON at byte {}: {}'.format(self.offset, exc.msg)) from exc
+            self.fill(size)
+            size *= 2
+        length = len(self.buffer[self.pos:end].encode('utf-8'))
+        offset = self.offset
+        self.pos = end
+        self.offset += length
+        return value, offset, length
+
+
+class CurveSetFile(MutableMapping):
+    '''
+    Index of a curve set file, streaming its curves one at a time. Each curve is checked as it is read,
+    and only its byte offset and length, dependencies and tickers are kept, see indexCurve. As a mapping,
+    it gives the raw curves by curve name, with their conventions resolved, see resolveConventions,
+    reading a curve from the file on first access and keeping it; a curve set replaces the one of the
+    file. The conventions, if any, must come before the curves in the file. With a lazy CurveEngine, only the curves used are read, so
+    the memory used follows the curves used rather than the size of the file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file, a configuration as in checkConfiguration, UTF-8 encoded
+    validate : bool, optional
+        If True, each curve is checked and parsed as it is read, see parseCurve, and the parsed curve is
+        dropped. Otherwise, only the curve names are checked. The default is True.
+    template : bool, optional
+        If True, market values may be missing as long as they have a ticker. The default is False.
+    chunkSize : int, optional
+        The number of bytes read at a time. The default is 1 MiB.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ConfigurationError
+        If the file is not valid JSON, or the configuration is invalid. The pointer attribute gives the
+        JSON pointer of the invalid value.
+    '''
+
+    def __init__(self, path, validate=True, template=False, chunkSize=2 ** 20):
+        self.path = path
+        self.template = template
+        self.fields = {}
+        self.offsets = {}
+        self.pointers = {}
+        self.dependencies = {}
+        self.tickers = {}
+        self.conventions = {}
+        self.loaded = {}
+        with open(path, 'rb') as f:
+            self.__index(JSONReader(f, chunkSize), validate)
+
+    '''
+    Get the index of the configuration, as returned by indexConfiguration, with the file as the raw
+    curves.
+
+    Returns
+    -------
+    dict
+        The index of the configuration.
+    '''
+
+    def getConfiguration(self):
+        return {
+            'refDate': parseDate(self.fields['refDate']),
+            'curves': self,
+            'pointers': dict(self.pointers),
+            'dependencies': {curveName: set(deps) for curveName, deps in self.dependencies.items()},
+            'tickers': dict(self.tickers),
+            'conventions': self.conventions
+        }
+
+    '''
+    Read the whole configuration.
+
+    Returns
+    -------
+    dict
+        The configuration, with the curves in the order of the file, a curve name appearing twice
+        keeping its last curve.
+    '''
+
+    def load(self):
+        return {**self.fields, 'curves': list(self.values())}
+
+    def __getitem__(self, curveName):
+        if curveName not in self.loaded.keys():
+            offset, length = self.offsets[curveName]
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                self.loaded[curveName] = resolveCurve(
+                    loadJSON(f.read(length)), self.conventions, formatPointer(self.pointers[curveName]))
+        return self.loaded[curveName]
+
+    def __setitem__(self, curveName, curve):
+        if curveName not in self.offsets.keys():
+            self.offsets[curveName] = None
+        self.loaded[curveName] = curve
+
+    def __delitem__(self, curveName):
+        del self.offsets[curveName]
+        self.loaded.pop(curveName, None)
+
+    def __contains__(self, curveName):
+        return curveName in self.offsets.keys()
+
+    def __iter__(self):
+        return iter(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __index(self, reader, validate):
+        reader.expect('{')
+        if reader.peek() == '}':
+            reader.expect('}')
+        else:
+            while True:
+                key, _, _ = reader.value()
+                if not isinstance(key, str):
+                    raise ConfigurationError('Invalid JSON at byte {}: expected a key'.format(reader.offset))
+                reader.expect(':')
+                if key == 'curves':
+                    self.__indexCurves(reader, validate)
+                    self.fields[key] = None
+                else:
+                    self.fields[key], _, _ = reader.value()
+                if key == 'conventions':
+                    if 'curves' in self.fields.keys():
+                        raise ConfigurationError('Invalid configuration at /conventions: the conventions of a '
+                                                 'streamed file must come before the curves', pointer='/conventions')
+                    self.conventions = readConventions(self.fields)
+                if reader.expect(',}') == '}':
+                    break
+        if reader.peek():
+            raise ConfigurationError('Invalid JSON at byte {}: extra data'.format(reader.offset))
+
+        structure = CONFIGURATION_STRUCTURES[bool(self.template)]
+        checkLeaves(structure, self.fields, '', ConfigurationError)
+        self.fields.pop('curves')
+        if not self.offsets:
+            raiseInvalid('/curves', ConfigurationError, structure.rules['curves'][1], [])
+
+    def __indexCurves(self, reader, validate):
+        if reader.peek() != '[':
+            value, _, _ = reader.value()
+            raiseInvalid('/curves', ConfigurationError, checkInstance, value, list)
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.expect(']')
+            return
+        pos = 0
+        while True:
+            curve, offset, length = reader.value()
+            pointer = (('', 'curves'), pos)
+            curve = resolveCurve(curve, self.conventions, formatPointer(pointer))
+            curveName, dependencies, tickers = indexCurve(curve, pos)
+            if validate:
+                parseCurve(curve, pointer, self.template)
+            # a curve name appearing twice keeps its last curve, as in parseConfiguration
+            self.offsets[curveName] = (offset, length)
+            self.pointers[curveName] = pointer
+            self.dependencies[curveName] = dependencies
+            self.tickers[curveName] = tickers
+            pos += 1
+            if reader.expect(',]') == ']':
+                return
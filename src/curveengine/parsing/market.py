@@ -0,0 +1,99 @@
+import csv
+import json
+import math
+import os
+from .checks import MarketConfigurationError
+
+
+def readQuoteTable(source) -> dict:
+    """
+    Read a flat table of market quotes
+
+    Parameters
+    ----------
+    source : dict, tuple or str
+        The quote table. It can be given as:
+        - a dictionary of values by ticker
+        - a dictionary with "ticker" and "value" columns
+        - a (tickers, values) pair of columns, e.g. lists or NumPy arrays
+        - a path to a CSV file with "ticker" and "value" columns
+        - a path to a JSON file containing any of the dictionaries above
+        - a path to a NumPy .npz file with "ticker" and "value" arrays
+
+    Returns
+    -------
+    dict
+        Dictionary with the ticker as key and the quote value as value
+
+    Raises
+    ------
+    MarketConfigurationError
+        If the table cannot be read or a value is not a finite number
+    """
+    if isinstance(source, (str, os.PathLike)):
+        tickers, values = readQuoteFile(source)
+    elif isinstance(source, dict) and set(source.keys()) == {'ticker', 'value'} \
+            and not isinstance(source['ticker'], str):
+        tickers, values = source['ticker'], source['value']
+    elif isinstance(source, dict):
+        tickers, values = source.keys(), source.values()
+    elif isinstance(source, (tuple, list)) and len(source) == 2:
+        tickers, values = source
+    else:
+        raise MarketConfigurationError(
+            'Invalid quote table, expected a dictionary, a pair of columns or a file path')
+
+    table = {}
+    for ticker, value in zip(tickers, values):
+        ticker = str(ticker)
+        try:
+            value = float(value)
+        except (TypeError, ValueError) as exc:
+            raise MarketConfigurationError(
+                'Invalid quote table, value of {} is not a number'.format(ticker)) from exc
+        if not math.isfinite(value):
+            raise MarketConfigurationError(
+                'Invalid quote table, value of {} is not finite'.format(ticker))
+        table[ticker] = value
+    return table
+
+
+def readQuoteFile(path) -> tuple:
+    """
+    Read the ticker and value columns of a quote file
+
+    Parameters
+    ----------
+    path : str
+        Path to a .csv, .json or .npz file
+
+    Returns
+    -------
+    tuple
+        The ticker and value columns
+
+    See Also
+    ----------
+    readQuoteTable
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        if rows and not {'ticker', 'value'}.issubset(rows[0].keys()):
+            raise MarketConfigurationError(
+                'Invalid quote file {}, missing ticker or value column'.format(path))
+        return [row['ticker'] for row in rows], [row['value'] for row in rows]
+    elif extension == '.json':
+        with open(path) as f:
+            data = json.load(f)
+        if set(data.keys()) == {'ticker', 'value'} and isinstance(data['ticker'], list):
+            return data['ticker'], data['value']
+        return data.keys(), data.values()
+    elif extension == '.npz':
+        import numpy as np
+        with np.load(path) as data:
+            return data['ticker'].tolist(), data['value'].tolist()
+    else:
+        raise MarketConfigurationError(
+            'Invalid quote file {}, unsupported format'.format(path))
@@ -1,6 +1,7 @@
 from .parsers import *
 from .enums import *
 from collections import deque
+from contextlib import contextmanager
 
 
 def createOvernightIndex(name: str, indexConfig: dict, handle: ore.YieldTermStructureHandle):
@@ -60,6 +61,14 @@ def createIborIndex(name: str, indexConfig: dict, handle: ore.YieldTermStructure
     return index
 
 
+# Possible curve-related keys of a rate helper configuration
+CURVE_DEPENDENCY_KEYS = ['discountCurve', 'collateralCurve', 'flatDiscountCurve', 'spreadDiscountCurve']
+# Possible index related keys of a rate helper configuration
+INDEX_DEPENDENCY_KEYS = ['index', 'shortIndex', 'longIndex', 'flatIndex', 'spreadIndex']
+# All the dependency keys, extended by the registered rate helper types
+DEPENDENCY_KEYS = CURVE_DEPENDENCY_KEYS + INDEX_DEPENDENCY_KEYS
+
+
 def getDependencyList(data: dict) -> dict:
     """
     Get the dependency list for the curves.
@@ -80,31 +89,114 @@ def getDependencyList(data: dict) -> dict:
     curve names as value. The set contains the names of the curves that the
     curve depends on.
     """
-    # Possible curve-related keys
-    pc = ['discountCurve', 'collateralCurve', 'flatDiscountCurve', 'spreadDiscountCurve']
-    # Possible index related keys
-    pi = ['index', 'shortIndex', 'longIndex', 'flatIndex', 'spreadIndex']
-
     dependencies = {}
     for curve in data['curves']:
         curveName = curve['curveName']
         if curveName not in dependencies.keys():
             dependencies[curveName] = set()
+        dependencies[curveName].update(getCurveDependencies(curve))
+    return dependencies
 
-        curveConfig = curve['curveConfig']
-        curveType = CurveType(curveConfig['curveType'])
-        if curveType == CurveType.Piecewise:
-            for rateHelper in curveConfig['rateHelpers']:
-                helperConfig = rateHelper['helperConfig']
-                for key in pc:
-                    if key in helperConfig:
-                        dependencies[curveName].add(helperConfig[key])
-                    for key in pi:
-                        if key in helperConfig:
-                            dependencies[curveName].add(helperConfig[key])
+
+def getCurveDependencies(curve: dict) -> set:
+    """
+    Get the names of the curves a curve depends on, see getDependencyList.
+
+    Parameters
+    ----------
+    curve : dict
+        Dictionary containing the curve data.
+
+    Returns
+    -------
+    set
+        The curve names given under the dependency keys of the rate helpers.
+    """
+    dependencies = set()
+    for rateHelper in curve['curveConfig'].get('rateHelpers', []):
+        helperConfig = rateHelper['helperConfig']
+        for key in DEPENDENCY_KEYS:
+            if key in helperConfig:
+                dependencies.add(helperConfig[key])
     return dependencies
 
 
+def getMarketQuotes(curve: dict) -> dict:
+    """
+    Get the quoted market values of a curve.
+
+    Parameters
+    ----------
+    curve : dict
+        Dictionary containing the curve data.
+
+    Returns
+    -------
+    dict
+        Dictionary with the ticker as key and the quoted value as value, for every
+        market price of the rate helpers that has both.
+    """
+    quotes = {}
+    for rateHelper in curve['curveConfig'].get('rateHelpers', []):
+        for price in rateHelper['marketConfig'].values():
+            if isinstance(price, dict) and 'ticker' in price and 'value' in price:
+                quotes[price['ticker']] = price['value']
+    return quotes
+
+
+def getTickers(curve: dict) -> set:
+    """
+    Get the tickers of the market prices of a curve
+
+    Parameters
+    ----------
+    curve : dict
+        Dictionary containing the curve data
+
+    Returns
+    -------
+    set
+        The tickers of the market prices of the rate helpers, with or without a value
+    """
+    tickers = set()
+    for rateHelper in curve['curveConfig'].get('rateHelpers', []):
+        for price in rateHelper['marketConfig'].values():
+            if isinstance(price, dict) and 'ticker' in price:
+                tickers.add(price['ticker'])
+    return tickers
+
+
+def bindMarketValues(curve: dict, market: dict) -> dict:
+    """
+    Bind market values by ticker to a curve.
+
+    Parameters
+    ----------
+    curve : dict
+        Dictionary containing the curve data.
+    market : dict
+        Dictionary with the ticker as key and the market value as value.
+
+    Returns
+    -------
+    dict
+        A copy of the curve data where the value of every market price whose ticker is in
+        the market is replaced by the market value. The input is not modified.
+    """
+    curveConfig = curve['curveConfig']
+    if 'rateHelpers' not in curveConfig:
+        return curve
+
+    rateHelpers = []
+    for rateHelper in curveConfig['rateHelpers']:
+        marketConfig = {}
+        for key, price in rateHelper['marketConfig'].items():
+            if isinstance(price, dict) and price.get('ticker') in market:
+                price = {**price, 'value': market[price['ticker']]}
+            marketConfig[key] = price
+        rateHelpers.append({**rateHelper, 'marketConfig': marketConfig})
+    return {**curve, 'curveConfig': {**curveConfig, 'rateHelpers': rateHelpers}}
+
 def topologicalSort(dependencies):
     """
     Sort the dependency list topologically
@@ -140,3 +232,188 @@ def topologicalSort(dependencies):
                     noDependency.append(element)
 
     return sortedElements
+
+
+def getDependentsList(dependencies: dict) -> dict:
+    """
+    Get the reverse dependency list for the curves.
+
+    Parameters
+    ----------
+    dependencies : dict
+        Dictionary containing the dependency list, as returned by getDependencyList.
+
+    Returns
+    -------
+    dict
+        Dictionary with the curve name as key and the set of curve names that depend
+        on it as value.
+    """
+    dependents = {element: set() for element in dependencies.keys()}
+    for element, deps in dependencies.items():
+        for dep in deps:
+            if dep != element:
+                dependents.setdefault(dep, set()).add(element)
+    return dependents
+
+
+def getDownstreamCurves(dependents: dict, curveNames) -> set:
+    """
+    Get the transitive set of curves affected by a change in the given curves.
+
+    Parameters
+    ----------
+    dependents : dict
+        Dictionary containing the reverse dependency list, as returned by getDependentsList.
+    curveNames : iterable
+        Names of the changed curves
+
+    Returns
+    -------
+    set
+        Set with the changed curves and every curve that depends on them, directly or not.
+    """
+    downstream = set(curveNames)
+    pending = deque(downstream)
+    while pending:
+        currentElement = pending.popleft()
+        for element in dependents.get(currentElement, ()):
+            if element not in downstream:
+                downstream.add(element)
+                pending.append(element)
+    return downstream
+
+
+def getDependencyLevels(dependencies: dict) -> list:
+    """
+    Partition the dependency list into levels of independent curves
+
+    Parameters
+    ----------
+    dependencies : dict
+        Dictionary containing the dependency list
+
+    Returns
+    -------
+    list
+        List of levels, each one a list of curve names that only depend on curves
+        of previous levels. As in topologicalSort, curves with unresolved dependencies
+        are left out.
+    """
+    remaining = {element: set(deps) - {element}
+                 for element, deps in dependencies.items()}
+    done = set()
+    levels = []
+    while True:
+        level = [element for element, deps in remaining.items()
+                 if element not in done and deps <= done]
+        if not level:
+            return levels
+        levels.append(level)
+        done.update(level)
+
+
+@contextmanager
+def evaluationDateScope(date: ore.Date):
+    """
+    Context manager setting the global evaluation date, restoring the previous one on exit
+
+    Parameters
+    ----------
+    date : ore.Date
+        The evaluation date within the scope
+
+    Returns
+    -------
+    ore.Date
+        The evaluation date within the scope
+    """
+    settings = ore.Settings.instance()
+    previous = settings.evaluationDate
+    if previous != date:
+        settings.evaluationDate = date
+    try:
+        yield date
+    finally:
+        if settings.evaluationDate != previous:
+            settings.evaluationDate = previous
+
+
+def getFxPairs(data: dict) -> dict:
+    """
+    Get the FX spot prices of the FX swap rate helpers of the curves
+
+    Parameters
+    ----------
+    data : dict
+        Dictionary containing the curve data
+
+    Returns
+    -------
+    dict
+        Dictionary with the (base, quote) currency pair as key and the FX spot price, the number of
+        units of the quote currency per unit of the base currency, as value. The base currency is the
+        currency of the collateral curve if baseCurrencyAsCollateral is set, and the currency of the
+        curve otherwise. The first helper of each pair wins.
+    """
+    currencies = {curve['curveName']: curve['curveConfig'].get('currency') for curve in data['curves']}
+    pairs = {}
+    for curve in data['curves']:
+        curveConfig = curve['curveConfig']
+        for rateHelper in curveConfig.get('rateHelpers', []):
+            if rateHelper['helperType'] != HelperType.FxSwap.value:
+                continue
+            helperConfig = rateHelper['helperConfig']
+            currency = curveConfig.get('currency')
+            collateral = currencies.get(helperConfig['discountCurve'])
+            if currency is None or collateral is None or currency == collateral:
+                continue
+            if helperConfig['baseCurrencyAsCollateral']:
+                pair = (collateral, currency)
+            else:
+                pair = (currency, collateral)
+            if pair not in pairs.keys():
+                pairs[pair] = rateHelper['marketConfig']['fxSpot']
+    return pairs
+
+
+def getFxRate(rates: dict, fromCurrency: str, toCurrency: str) -> float:
+    """
+    Get the FX rate between two currencies, crossing the given rates as needed
+
+    Parameters
+    ----------
+    rates : dict
+        Dictionary with the (base, quote) currency pair as key and the number of units of the quote
+        currency per unit of the base currency as value
+    fromCurrency : str
+        The currency to convert from
+    toCurrency : str
+        The currency to convert to
+
+    Returns
+    -------
+    float
+        The number of units of toCurrency per unit of fromCurrency
+
+    Raises
+    ------
+    KeyError
+        If the currencies are not connected by the rates
+    """
+    edges = {}
+    for (base, quote), value in rates.items():
+        edges.setdefault(base, []).append((quote, value))
+        edges.setdefault(quote, []).append((base, 1.0 / value))
+
+    found = {fromCurrency: 1.0}
+    pending = deque([fromCurrency])
+    while pending:
+        currency = pending.popleft()
+        if currency == toCurrency:
+            return found[currency]
+        for other, value in edges.get(currency, ()):
+            if other not in found:
+                found[other] = found[currency] * value
+                pending.append(other)
+    raise KeyError('No FX rate from {} to {}'.format(fromCurrency, toCurrency))
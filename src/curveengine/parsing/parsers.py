@@ -1,64 +1,190 @@
+from functools import update_wrapper
 import ORE as ore
 from .enums import *
 
 
-def parse(**kwargs):
-    results = {}
-    for key, value in kwargs.items():
-        if key in ['helperConfig', 'curveIndex', 'curveConfig']:
-            results[key] = parse(**value)
+class InternTable:
+    '''
+    Bounded table of the values returned by a parser, by input, so identical inputs get the same object
+    instead of being parsed again. The parser should return immutable values, as ORE dates, periods
+    and enums. When the table is full, its oldest entry is dropped. Inputs that cannot be interned,
+    because they are not hashable or have no key, are parsed every time.
 
-        elif key == 'nodes':
-            results[key] = [parseNode(v) for v in value]
+    Parameters
+    ----------
+    parser : callable
+        The parser, taking a single input
+    maxSize : int, optional
+        The maximum number of entries. The default is 1024.
+    key : callable, optional
+        A function returning the key of an input, or None if the input should not be interned.
+        The default is None, the input itself.
 
-        elif key in ['curves', 'rateHelpers']:
-            results[key] = [parse(**v) for v in value]
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, parser, maxSize=1024, key=None):
+        update_wrapper(self, parser)
+        self.parser = parser
+        self.maxSize = maxSize
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self.__table = {}
+
+    def __call__(self, value):
+        key = value if self.key is None else self.key(value)
+        try:
+            result = self.__table[key]
+        except KeyError:
+            if key is None:
+                return self.parser(value)
+        except TypeError:
+            return self.parser(value)
+        else:
+            self.hits += 1
+            return result
 
-        elif key in ['date', 'startDate', 'endDate']:
-            results[key] = parseDate(value)
+        self.misses += 1
+        result = self.parser(value)
+        if self.maxSize > 0:
+            if len(self.__table) >= self.maxSize:
+                self.__table.pop(next(iter(self.__table)), None)
+            self.__table[key] = result
+        return result
 
-        elif key == 'helperType':
-            results[key] = HelperType(value)
+    '''
+    Clear the table. The hit and miss counters are kept.
 
-        elif key == 'curveType':
-            results[key] = CurveType(value)
+    Returns
+    -------
+    None
+    '''
 
-        elif key == 'indexType':
-            results[key] = IndexType(value)
+    def clear(self):
+        self.__table.clear()
 
-        elif key in ['dayCounter', 'couponDayCounter', 'yieldDayCounter']:
-            results[key] = parseDayCounter(value)
+    '''
+    Get the table statistics.
 
-        elif key == 'compounding':
-            results[key] = parseCompounding(value)
+    Returns
+    -------
+    dict
+        The number of hits ("hits") and misses ("misses"), the hit rate ("hitRate"), the maximum
+        size ("maxSize") and the current size ("size") of the table.
+    '''
 
-        elif key in ['frequency', 'paymentFrequency', 'fixedLegFrequency', 'floatingLegFrequency']:
-            results[key] = parseFrequency(value)
+    def cacheInfo(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hitRate': self.hits / lookups if lookups else 0.0,
+                'maxSize': self.maxSize, 'size': len(self.__table)}
 
-        elif key in ['currency', 'fixedLegCurrency']:
-            results[key] = parseCurrency(value)
 
-        elif key == 'calendar':
-            results[key] = parseCalendar(value)
+# the intern table of each interned parser, by parser name
+INTERN_TABLES = {}
 
-        elif key == 'convention':
-            results[key] = parseBusinessDayConvention(value)
 
-        elif key in ['tenor', 'fwdStart', 'shortPayTenor']:
-            results[key] = parsePeriod(value)
+def interned(maxSize: int = 1024, key=None):
+    """
+    Decorator interning the values returned by a parser, see InternTable. The table is registered
+    by parser name, see getInternStats.
 
-        elif key in ['settlementDays', 'paymentLag', 'fixingDays']:
-            results[key] = int(value)
+    Parameters
+    ----------
+    maxSize : int, optional
+        The maximum number of interned values. The default is 1024.
+    key : callable, optional
+        A function returning the key of an input, or None if the input should not be interned.
+        The default is None, the input itself.
 
-        elif key == 'month':
-            results[key] = parseMonth(value)
+    Returns
+    -------
+    callable
+        The decorator
+    """
+    def decorator(parser):
+        table = InternTable(parser, maxSize=maxSize, key=key)
+        INTERN_TABLES[parser.__name__] = table
+        return table
+    return decorator
+
+
+def getInternStats() -> dict:
+    """
+    Get the statistics of the intern tables of the parsers
+
+    Returns
+    -------
+    dict
+        The statistics of each table, see InternTable.cacheInfo, by parser name
+    """
+    return {name: table.cacheInfo() for name, table in INTERN_TABLES.items()}
+
+
+def clearInternTables() -> None:
+    """
+    Clear the intern tables of the parsers and reset their counters
+
+    Returns
+    -------
+    None
+    """
+    for table in INTERN_TABLES.values():
+        table.clear()
+        table.hits = 0
+        table.misses = 0
+
+
+def getDateKey(date: str):
+    """
+    Get the intern key of a date string, its ISO date. 'today' is not interned, since it changes
+    from one day to the next.
+
+    Parameters
+    ----------
+    date : str
+        The date string
+
+    Returns
+    -------
+    str
+        The key, or None for 'today'
+    """
+    if date == 'today':
+        return None
+    return date[0:10]
 
-        else:
-            results[key] = value
 
+def parse(**kwargs):
+    results = {}
+    for key, value in kwargs.items():
+        parser = FIELD_PARSERS.get(key)
+        results[key] = value if parser is None else parser(value)
     return results
 
 
+def parseField(key: str, value):
+    """
+    Parse a single field of a configuration, as parse does for each key
+
+    Parameters
+    ----------
+    key : str
+        The key of the field
+    value : any
+        The value of the field
+
+    Returns
+    -------
+    any
+        The parsed value, or the value itself if the key has no parser
+    """
+    parser = FIELD_PARSERS.get(key)
+    return value if parser is None else parser(value)
+
+
 def parseOREDate(date: ore.Date) -> str:
     """
     Parse an ORE date to a string
@@ -100,6 +226,7 @@ def createInterestRate(
         parseFrequency(frequency))
 
 
+@interned()
 def parseCompounding(compounding: str):
     """
     Parse a compounding string to an ORE compounding enum
@@ -122,6 +249,7 @@ def parseCompounding(compounding: str):
     return value.value
 
 
+@interned()
 def parseFrequency(frequency: str):
     """
     Parse a frequency string to an ORE frequency enum
@@ -144,6 +272,7 @@ def parseFrequency(frequency: str):
     return value.value
 
 
+@interned()
 def parseDayCounter(dayCounter: ore.DayCounter) -> ore.DayCounter:
     """
     Parse a day counter string to an ORE day counter enum
@@ -166,6 +295,7 @@ def parseDayCounter(dayCounter: ore.DayCounter) -> ore.DayCounter:
     return value.value
 
 
+@interned()
 def parseCalendar(calendar: str) -> ore.Calendar:
     """
     Parse a calendar string to an ORE calendar enum
@@ -187,6 +317,7 @@ def parseCalendar(calendar: str) -> ore.Calendar:
     return value.value
 
 
+@interned()
 def parseBusinessDayConvention(businessDayConvention: str):
     """
     Parse a business day convention string to an ORE business day convention enum
@@ -210,6 +341,7 @@ def parseBusinessDayConvention(businessDayConvention: str):
     return value.value
 
 
+@interned()
 def parseTimeUnit(timeUnit: str):
     """
     Parse a time unit string to an ORE time unit enum
@@ -231,6 +363,7 @@ def parseTimeUnit(timeUnit: str):
     return value.value
 
 
+@interned()
 def parseDateGenerationRule(dateGenerationRule: str):
     """
     Parse a date generation rule string to an ORE date generation rule enum
@@ -253,6 +386,7 @@ def parseDateGenerationRule(dateGenerationRule: str):
     return value.value
 
 
+@interned(maxSize=4096, key=getDateKey)
 def parseDate(date: str) -> ore.Date:
     """
     Parse a date string to an ORE date
@@ -274,6 +408,7 @@ def parseDate(date: str) -> ore.Date:
         return ore.DateParser.parseISO(date[0:10])
 
 
+@interned()
 def parsePeriod(period: str) -> ore.Period:
     """
     Parse a period string to an ORE period
@@ -293,6 +428,7 @@ def parsePeriod(period: str) -> ore.Period:
     return tenor
 
 
+@interned()
 def parseCurrency(currency: str) -> ore.Currency:
     """
     Parse a currency string to an ORE currency
@@ -314,6 +450,7 @@ def parseCurrency(currency: str) -> ore.Currency:
     return value.value
 
 
+@interned()
 def parseMonth(month: str):
     """
     Parse a month string to an ORE month enum
@@ -333,3 +470,51 @@ def parseMonth(month: str):
     except KeyError:
         raise NotImplementedError('unknown month: {0}'.format(month))
     return value.value
+
+
+def parseStructure(value: dict) -> dict:
+    return parse(**value)
+
+
+def parseStructureList(value: list) -> list:
+    return [parse(**v) for v in value]
+
+
+def parseNodeList(value: list) -> list:
+    return [parseNode(v) for v in value]
+
+
+# parser of each configuration key, the keys without parser are kept as they are
+FIELD_PARSERS = {
+    'helperConfig': parseStructure,
+    'curveIndex': parseStructure,
+    'curveConfig': parseStructure,
+    'nodes': parseNodeList,
+    'curves': parseStructureList,
+    'rateHelpers': parseStructureList,
+    'date': parseDate,
+    'startDate': parseDate,
+    'endDate': parseDate,
+    'helperType': HelperType,
+    'curveType': CurveType,
+    'indexType': IndexType,
+    'dayCounter': parseDayCounter,
+    'couponDayCounter': parseDayCounter,
+    'yieldDayCounter': parseDayCounter,
+    'compounding': parseCompounding,
+    'frequency': parseFrequency,
+    'paymentFrequency': parseFrequency,
+    'fixedLegFrequency': parseFrequency,
+    'floatingLegFrequency': parseFrequency,
+    'currency': parseCurrency,
+    'fixedLegCurrency': parseCurrency,
+    'calendar': parseCalendar,
+    'convention': parseBusinessDayConvention,
+    'tenor': parsePeriod,
+    'fwdStart': parsePeriod,
+    'shortPayTenor': parsePeriod,
+    'settlementDays': int,
+    'paymentLag': int,
+    'fixingDays': int,
+    'month': parseMonth
+}
@@ -1,8 +1,49 @@
+import math
 from .parsers import *
 from .others import *
+from .checks import ConfigurationError
 
 
-def createOISRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createQuoteHandle(price: dict, quotes: dict = None) -> ore.QuoteHandle:
+    """
+    Create a quote handle for a market price
+
+    Parameters
+    ----------
+    price : dict
+        The market price, with a value and an optional ticker. The value may be missing for
+        templates, in which case the quote is left as NaN until it is bound.
+    quotes : dict, optional
+        A registry of quotes by ticker. If given and the price has a ticker, the quote is
+        taken from (or added to) the registry, so helpers sharing a ticker share one quote.
+
+    Returns
+    -------
+    ore.QuoteHandle
+        The quote handle
+
+    Raises
+    ------
+    ConfigurationError
+        If the registry has a quote for the ticker with another value. A missing value, on
+        either side, is not a conflict.
+    """
+    value = price.get('value', float('nan'))
+    if quotes is None or 'ticker' not in price:
+        return ore.QuoteHandle(ore.SimpleQuote(value))
+
+    ticker = price['ticker']
+    if ticker not in quotes:
+        quotes[ticker] = ore.SimpleQuote(value)
+    else:
+        current = quotes[ticker].value()
+        if value != current and not math.isnan(value) and not math.isnan(current):
+            raise ConfigurationError('Conflicting values for ticker {}: {} and {}'.format(ticker, current, value))
+    return ore.QuoteHandle(quotes[ticker])
+
+
+
+def createOISRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, **kwargs):
     """
     Create an OIS rate helper
 
@@ -18,6 +59,8 @@ def createOISRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: di
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
 
     Returns
     -------
@@ -39,16 +82,15 @@ def createOISRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: di
     fwdStart = helperConfig['fwdStart']
     index = indexes[helperConfig['index']]
 
-    rate = marketConfig['rate']['value']
+    rate = createQuoteHandle(marketConfig['rate'], quotes)
     discountCurve = curveHandles[helperConfig['discountCurve']]
 
-    rate = ore.QuoteHandle(ore.SimpleQuote(rate))
     helper = ore.OISRateHelper(settlementDays, tenor, rate, index, discountCurve, endOfMonth,
                                paymentLag, businessDayConvention, fixedLegFrequency, calendar, fwdStart)
     return helper
 
 
-def createDepositRateHelper(helperConfig: dict, marketConfig: dict, *args, **kwargs):
+def createDepositRateHelper(helperConfig: dict, marketConfig: dict, *args, quotes: dict = None, **kwargs):
     """
     Create a deposit rate helper
 
@@ -59,7 +101,10 @@ def createDepositRateHelper(helperConfig: dict, marketConfig: dict, *args, **kwa
        
     marketConfig : dict
         The market configuration for the helper
-       
+
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
+
     Returns
     -------
     ore.DepositRateHelper
@@ -76,13 +121,13 @@ def createDepositRateHelper(helperConfig: dict, marketConfig: dict, *args, **kwa
     endOfMonth = helperConfig['endOfMonth']
     dayCounter = helperConfig['dayCounter']
 
-    rate = ore.QuoteHandle(ore.SimpleQuote(marketConfig['rate']['value']))
+    rate = createQuoteHandle(marketConfig['rate'], quotes)
     helper = ore.DepositRateHelper(rate, tenor, settlementDays, calendar,
                                    convention, endOfMonth, dayCounter)
     return helper
 
 
-def createFixedRateBondRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createFixedRateBondRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, refDate: ore.Date = None, **kwargs):
     """
     Create a fixed rate bond helper
 
@@ -98,6 +143,11 @@ def createFixedRateBondRateHelper(helperConfig: dict, marketConfig: dict, curveH
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
+    refDate : ore.Date, optional
+        The reference date of the curve, used as start date of tenor based instruments.
+        The default is None, the evaluation date
 
     Returns
     -------
@@ -117,7 +167,7 @@ def createFixedRateBondRateHelper(helperConfig: dict, marketConfig: dict, curveH
 
     if 'tenor' in helperConfig.keys():
         tenor = helperConfig['tenor']
-        startDate = ore.Settings.instance().evaluationDate
+        startDate = ore.Settings.instance().evaluationDate if refDate is None else refDate
         maturityDate = startDate + tenor
     else:
         startDate = helperConfig['startDate']
@@ -135,7 +185,7 @@ def createFixedRateBondRateHelper(helperConfig: dict, marketConfig: dict, curveH
         False
     )
 
-    rate = marketConfig['rate']['value']
+    rate = marketConfig['rate'].get('value', float('nan'))
     if isinstance(rate, float):
         rateDayCounter = ore.Actual365Fixed()
         rateCompounding = ore.Compounded
@@ -144,8 +194,10 @@ def createFixedRateBondRateHelper(helperConfig: dict, marketConfig: dict, curveH
         rateDayCounter = rate.dayCounter()
         rateCompounding = rate.compounding()
         rateFrequency = rate.frequency()
+        rate = rate.rate()
     else:
         raise Exception('rate is not a float or an InterestRate')
+    rateQuote = createQuoteHandle({**marketConfig['rate'], 'value': rate}, quotes)
 
     # Create a fixed rate bond
     fixedRateBond = ore.FixedRateBond(
@@ -156,23 +208,26 @@ def createFixedRateBondRateHelper(helperConfig: dict, marketConfig: dict, curveH
         couponDayCounter,
     )
 
-    # Calculate the clean price
-    cleanPrice = fixedRateBond.cleanPrice(
-        rate,
-        rateDayCounter,
-        rateCompounding,
-        rateFrequency)
+    # Calculate the clean price from the quoted rate, following its updates
+    cleanPrice = ore.DerivedQuote(
+        rateQuote,
+        lambda value: fixedRateBond.cleanPrice(
+            value,
+            rateDayCounter,
+            rateCompounding,
+            rateFrequency)
+    )
 
     # Bond helper
     bondHelper = ore.BondHelper(
-        ore.QuoteHandle(ore.SimpleQuote(cleanPrice)),
+        ore.QuoteHandle(cleanPrice),
         fixedRateBond
     )
 
     return bondHelper
 
 
-def createSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, **kwargs):
     """
     Create a swap rate helper
 
@@ -188,6 +243,8 @@ def createSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: d
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
 
     Returns
     -------
@@ -206,10 +263,8 @@ def createSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: d
     fwdStart = helperConfig['fwdStart']
 
     # QuoteHandle
-    rate = marketConfig['rate']['value']
-    spread = marketConfig['spread']['value']
-    rateQuote = ore.QuoteHandle(ore.SimpleQuote(rate))
-    spreadQuote = ore.QuoteHandle(ore.SimpleQuote(spread))
+    rateQuote = createQuoteHandle(marketConfig['rate'], quotes)
+    spreadQuote = createQuoteHandle(marketConfig['spread'], quotes)
 
     # Index
     index = indexes[helperConfig['index']]
@@ -224,7 +279,7 @@ def createSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: d
     return swapRateHelper
 
 
-def createFxSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createFxSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, refDate: ore.Date = None, **kwargs):
     """
     Create a fx swap rate helper
 
@@ -240,6 +295,11 @@ def createFxSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles:
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
+    refDate : ore.Date, optional
+        The reference date of the curve, used as start date of tenor based instruments.
+        The default is None, the evaluation date
 
     Returns
     -------
@@ -250,9 +310,6 @@ def createFxSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles:
     ----------
     checkFxSwapRateHelper
     """
-    fxPoints = marketConfig['fxPoints']['value']
-    spotFx = marketConfig['fxSpot']['value']
-
     fixingDays = helperConfig['fixingDays']
     calendar = helperConfig['calendar']
     convention = helperConfig['convention']
@@ -262,14 +319,14 @@ def createFxSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles:
     if 'tenor' in helperConfig.keys():
         tenor = helperConfig['tenor']
     else:
-        startDate = ore.Settings.instance().evaluationDate
+        startDate = ore.Settings.instance().evaluationDate if refDate is None else refDate
         maturityDate = helperConfig['endDate']
         days = maturityDate - startDate
         tenor = ore.Period(days, ore.Days)
 
     # QuoteHandle
-    fwdPointQuote = ore.QuoteHandle(ore.SimpleQuote(fxPoints))
-    spotFxQuote = ore.QuoteHandle(ore.SimpleQuote(spotFx))
+    fwdPointQuote = createQuoteHandle(marketConfig['fxPoints'], quotes)
+    spotFxQuote = createQuoteHandle(marketConfig['fxSpot'], quotes)
 
     # Discounting curve
     discountCurve = curveHandles[helperConfig['discountCurve']]
@@ -290,7 +347,7 @@ def createFxSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles:
     return fxSwapRateHelper
 
 
-def createSofrFutureRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createSofrFutureRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, **kwargs):
     """
     Create a sofr future rate helper
 
@@ -306,6 +363,8 @@ def createSofrFutureRateHelper(helperConfig: dict, marketConfig: dict, curveHand
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
 
     Returns
     -------
@@ -336,7 +395,7 @@ def createSofrFutureRateHelper(helperConfig: dict, marketConfig: dict, curveHand
     return sofrFutureRateHelper
 
 
-def createTenorBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createTenorBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, **kwargs):
     """
     Create a tenor basis swap rate helper
 
@@ -352,6 +411,8 @@ def createTenorBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, curve
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
 
     Returns
     -------
@@ -370,8 +431,7 @@ def createTenorBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, curve
     shortIndex = indexes[helperConfig['shortIndex']]
 
     # QuoteHandle
-    spread = marketConfig['spread']['value']
-    spreadQuote = ore.QuoteHandle(ore.SimpleQuote(spread))
+    spreadQuote = createQuoteHandle(marketConfig['spread'], quotes)
 
     # Discounting curve
     discountCurve = curveHandles[helperConfig['discountCurve']]
@@ -391,7 +451,7 @@ def createTenorBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, curve
     return tenorBasisSwapHelper
 
 
-def createCrossCcyFixFloatSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createCrossCcyFixFloatSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, **kwargs):
     """
     Create a cross currency fix float swap rate helper
 
@@ -407,6 +467,8 @@ def createCrossCcyFixFloatSwapRateHelper(helperConfig: dict, marketConfig: dict,
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
 
     Returns
     -------
@@ -427,13 +489,9 @@ def createCrossCcyFixFloatSwapRateHelper(helperConfig: dict, marketConfig: dict,
     calendar = helperConfig['calendar']
 
     # QuoteHandle
-    rate = marketConfig['rate']['value']
-    spotFx = marketConfig['fxSpot']['value']
-    spread = marketConfig['spread']['value']
-
-    rateQuote = ore.QuoteHandle(ore.SimpleQuote(rate))
-    spotFxQuote = ore.QuoteHandle(ore.SimpleQuote(spotFx))
-    spreadQuote = ore.QuoteHandle(ore.SimpleQuote(spread))
+    rateQuote = createQuoteHandle(marketConfig['rate'], quotes)
+    spotFxQuote = createQuoteHandle(marketConfig['fxSpot'], quotes)
+    spreadQuote = createQuoteHandle(marketConfig['spread'], quotes)
 
     # Index
     index = indexes[helperConfig['index']]
@@ -461,7 +519,7 @@ def createCrossCcyFixFloatSwapRateHelper(helperConfig: dict, marketConfig: dict,
     return crossCcyFixFloatSwapHelper
 
 
-def createCrossCcyBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, **kwargs):
+def createCrossCcyBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, curveHandles: dict, indexes: dict, *args, quotes: dict = None, **kwargs):
     """
     Create a cross currency basis swap rate helper
 
@@ -479,6 +537,8 @@ def createCrossCcyBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, cu
         The curveHandles
     indexes : dict
         The indexes
+    quotes : dict, optional
+        The quote registry by ticker, see createQuoteHandle
 
     Returns
     -------
@@ -505,11 +565,8 @@ def createCrossCcyBasisSwapRateHelper(helperConfig: dict, marketConfig: dict, cu
     spreadIndex = indexes[helperConfig['spreadIndex']]
     
     # QuoteHandle
-    spread = marketConfig['spread']['value']
-    spreadQuote = ore.QuoteHandle(ore.SimpleQuote(spread))
-
-    fxSpot = marketConfig['fxSpot']['value']
-    fxSpotQuote = ore.QuoteHandle(ore.SimpleQuote(fxSpot))
+    spreadQuote = createQuoteHandle(marketConfig['spread'], quotes)
+    fxSpotQuote = createQuoteHandle(marketConfig['fxSpot'], quotes)
 
     # CrossCcyBasisSwapHelper
     crossCcyBasisSwapHelper = ore.CrossCcyBasisSwapHelper(
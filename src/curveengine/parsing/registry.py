@@ -0,0 +1,325 @@
+from enum import Enum
+from importlib.metadata import entry_points
+from .enums import *
+from .parsers import *
+from .others import *
+
+'''
+Registry of the rate helper and curve types. Each type is described by a single definition, with its
+validation rules, parser hints, dependency keys and builder, and is looked up by its name. The built-in
+types are registered in definitions.py, third-party packages register their own types through the entry
+points below, which are loaded on the first lookup of an unknown type:
+
+[project.entry-points."curveengine.rate_helpers"]
+MyHelper = "mypackage.helpers:MY_HELPER_DEFINITION"
+
+[project.entry-points."curveengine.curves"]
+MyCurve = "mypackage.curves:MY_CURVE_DEFINITION"
+'''
+
+RATE_HELPER_ENTRY_POINTS = 'curveengine.rate_helpers'
+CURVE_ENTRY_POINTS = 'curveengine.curves'
+
+# the registered definitions by name
+RATE_HELPER_DEFINITIONS = {}
+CURVE_DEFINITIONS = {}
+# the groups whose entry points are loaded
+LOADED_ENTRY_POINTS = set()
+
+HELPER_TYPES_BY_VALUE = {helperType.value: helperType for helperType in HelperType}
+CURVE_TYPES_BY_VALUE = {curveType.value: curveType for curveType in CurveType}
+
+
+class RateHelperDefinition:
+    '''
+    Definition of a rate helper type, see registerRateHelperDefinition
+
+    Parameters
+    ----------
+    name : str
+        The helper type, as given in the helperType key of a rate helper
+    builder : callable
+        The function building the rate helper, called with the parsed helper and market configurations,
+        the curve handles and the indexes by name, and the quotes and refDate keyword arguments, like
+        createDepositRateHelper
+    helperConfig : dict or tuple
+        The rules of the helper configuration, a reference structure or a (rule, check) pair,
+        see compileStructure
+    marketFields : list
+        The fields of the market configuration, each one a price with a value and an optional ticker
+    parsers : dict, optional
+        The parser of each key of the helper configuration not known to parse, see FIELD_PARSERS.
+        The default is None.
+    dependencyKeys : list, optional
+        The keys of the helper configuration naming a curve or an index the rate helper depends on,
+        besides the keys of DEPENDENCY_KEYS. The default is None.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, name: str, builder, helperConfig, marketFields: list, parsers: dict = None,
+                 dependencyKeys: list = None):
+        self.name = name
+        self.builder = builder
+        self.helperConfig = helperConfig
+        self.marketFields = list(marketFields)
+        self.parsers = dict(parsers or {})
+        self.dependencyKeys = list(dependencyKeys or [])
+
+
+class CurveDefinition:
+    '''
+    Definition of a curve type, see registerCurveDefinition
+
+    Parameters
+    ----------
+    name : str
+        The curve type, as given in the curveType key of a curve configuration
+    builder : callable
+        The function building the curve, called with the parsed curve, the reference date, the curve
+        handles and the indexes by name, and the quotes keyword argument, like createPiecewiseCurve
+    curveConfig : dict, tuple or callable
+        The rules of the curve configuration, a reference structure or a (rule, check) pair,
+        see compileStructure, or a function returning them given the template flag
+    parsers : dict, optional
+        The parser of each key of the curve configuration not known to parse, see FIELD_PARSERS.
+        The default is None.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, name: str, builder, curveConfig, parsers: dict = None):
+        self.name = name
+        self.builder = builder
+        self.curveConfig = curveConfig
+        self.parsers = dict(parsers or {})
+
+
+def getTypeName(value) -> str:
+    """
+    Get the name of a rate helper or curve type
+
+    Parameters
+    ----------
+    value : Enum or str
+        The type, a member of HelperType or CurveType or the name of a registered type
+
+    Returns
+    -------
+    str
+        The name of the type
+    """
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def registerParsers(parsers: dict) -> None:
+    """
+    Add parser hints to FIELD_PARSERS
+
+    Parameters
+    ----------
+    parsers : dict
+        The parser of each key
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If a key already has a different parser
+    """
+    for key, parser in parsers.items():
+        if FIELD_PARSERS.get(key, parser) is not parser:
+            raise ValueError('The key {} already has a parser'.format(key))
+    FIELD_PARSERS.update(parsers)
+
+
+def registerRateHelperDefinition(definition: RateHelperDefinition) -> None:
+    """
+    Register a rate helper type. Its rules are compiled on the first check of a rate helper of the type.
+
+    Parameters
+    ----------
+    definition : RateHelperDefinition
+        The definition of the type
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the type is already registered, or a parser hint conflicts with another parser
+    """
+    if definition.name in RATE_HELPER_DEFINITIONS:
+        raise ValueError('The rate helper type {} is already registered'.format(definition.name))
+    registerParsers(definition.parsers)
+    for key in definition.dependencyKeys:
+        if key not in DEPENDENCY_KEYS:
+            DEPENDENCY_KEYS.append(key)
+    RATE_HELPER_DEFINITIONS[definition.name] = definition
+
+
+def registerCurveDefinition(definition: CurveDefinition) -> None:
+    """
+    Register a curve type. Its rules are compiled on the first check of a curve of the type.
+
+    Parameters
+    ----------
+    definition : CurveDefinition
+        The definition of the type
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the type is already registered, or a parser hint conflicts with another parser
+    """
+    if definition.name in CURVE_DEFINITIONS:
+        raise ValueError('The curve type {} is already registered'.format(definition.name))
+    registerParsers(definition.parsers)
+    CURVE_DEFINITIONS[definition.name] = definition
+
+
+def loadEntryPoints(group: str) -> None:
+    """
+    Register the definitions of the entry points of a group, once. Each entry point refers to a
+    definition, or to a list of definitions. A definition already registered is skipped.
+
+    Parameters
+    ----------
+    group : str
+        The group, RATE_HELPER_ENTRY_POINTS or CURVE_ENTRY_POINTS
+
+    Returns
+    -------
+    None
+    """
+    if group in LOADED_ENTRY_POINTS:
+        return
+    LOADED_ENTRY_POINTS.add(group)
+    if group == RATE_HELPER_ENTRY_POINTS:
+        register, registered = registerRateHelperDefinition, RATE_HELPER_DEFINITIONS
+    else:
+        register, registered = registerCurveDefinition, CURVE_DEFINITIONS
+    for entryPoint in entry_points(group=group):
+        definitions = entryPoint.load()
+        if not isinstance(definitions, (list, tuple)):
+            definitions = [definitions]
+        for definition in definitions:
+            if registered.get(definition.name) is not definition:
+                register(definition)
+
+
+def findRateHelperDefinition(helperType):
+    """
+    Find the definition of a rate helper type, loading the entry points on the first unknown type
+
+    Parameters
+    ----------
+    helperType : HelperType or str
+        The type
+
+    Returns
+    -------
+    RateHelperDefinition or None
+        The definition, or None if the type is unknown
+    """
+    name = getTypeName(helperType)
+    definition = RATE_HELPER_DEFINITIONS.get(name)
+    if definition is None and RATE_HELPER_ENTRY_POINTS not in LOADED_ENTRY_POINTS:
+        loadEntryPoints(RATE_HELPER_ENTRY_POINTS)
+        definition = RATE_HELPER_DEFINITIONS.get(name)
+    return definition
+
+
+def findCurveDefinition(curveType):
+    """
+    Find the definition of a curve type, loading the entry points on the first unknown type
+
+    Parameters
+    ----------
+    curveType : CurveType or str
+        The type
+
+    Returns
+    -------
+    CurveDefinition or None
+        The definition, or None if the type is unknown
+    """
+    name = getTypeName(curveType)
+    definition = CURVE_DEFINITIONS.get(name)
+    if definition is None and CURVE_ENTRY_POINTS not in LOADED_ENTRY_POINTS:
+        loadEntryPoints(CURVE_ENTRY_POINTS)
+        definition = CURVE_DEFINITIONS.get(name)
+    return definition
+
+
+def parseHelperType(value: str):
+    """
+    Parse a rate helper type
+
+    Parameters
+    ----------
+    value : str
+        The helper type
+
+    Returns
+    -------
+    HelperType or str
+        The member of HelperType, or the name of a registered type that is not built-in
+
+    Raises
+    ------
+    ValueError
+        If the type is unknown
+    """
+    helperType = HELPER_TYPES_BY_VALUE.get(value)
+    if helperType is not None:
+        return helperType
+    if findRateHelperDefinition(value) is None:
+        raise ValueError('Unknown rate helper type: {}'.format(value))
+    return value
+
+
+def parseCurveType(value: str):
+    """
+    Parse a curve type
+
+    Parameters
+    ----------
+    value : str
+        The curve type
+
+    Returns
+    -------
+    CurveType or str
+        The member of CurveType, or the name of a registered type that is not built-in
+
+    Raises
+    ------
+    ValueError
+        If the type is unknown
+    """
+    curveType = CURVE_TYPES_BY_VALUE.get(value)
+    if curveType is not None:
+        return curveType
+    if findCurveDefinition(value) is None:
+        raise ValueError('Unknown curve type: {}'.format(value))
+    return value
+
+
+# the types are parsed through the registry, so that parse accepts the registered types
+FIELD_PARSERS.update({'helperType': parseHelperType, 'curveType': parseCurveType})
@@ -0,0 +1,148 @@
+'''
+JSON encoding and decoding of configurations and curve outputs. The fastest installed backend is used, orjson
+or msgspec, falling back to the json module of the standard library. The backend can be set with
+setJSONBackend, e.g. to compare them. Every backend rejects non-finite numbers, NaN and infinities, which
+are not valid JSON.
+'''
+
+import json
+import math
+
+
+def rejectConstant(constant):
+    raise ValueError('Out of range float values are not JSON compliant: {}'.format(constant))
+
+
+def checkFinite(value):
+    # orjson and msgspec encode non-finite numbers as null, so a document with a null is checked
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                rejectConstant(value)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+
+def finiteEncoder(encode):
+    def encodeFinite(value, sortKeys=False):
+        data = encode(value, sortKeys)
+        if b'null' in data:
+            checkFinite(value)
+        return data
+    return encodeFinite
+
+
+JSON_BACKENDS = {
+    'json': (lambda data: json.loads(data, parse_constant=rejectConstant), lambda value, sortKeys=False: json.dumps(
+        value, separators=(',', ':'), sort_keys=sortKeys, allow_nan=False).encode('utf-8'))
+}
+try:
+    import orjson
+    JSON_BACKENDS['orjson'] = (orjson.loads, finiteEncoder(lambda value, sortKeys=False: orjson.dumps(
+        value, option=orjson.OPT_SORT_KEYS if sortKeys else None)))
+except ImportError:
+    pass
+try:
+    import msgspec
+
+    def decodeMsgspec(data):
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    JSON_BACKENDS['msgspec'] = (decodeMsgspec, finiteEncoder(lambda value, sortKeys=False: msgspec.json.encode(
+        value, order='sorted' if sortKeys else None)))
+except ImportError:
+    pass
+
+# the backend in use, the fastest installed one, see getJSONBackend
+JSON_BACKEND = next(name for name in ['orjson', 'msgspec', 'json'] if name in JSON_BACKENDS)
+
+
+def setJSONBackend(name: str) -> None:
+    """
+    Set the JSON backend
+
+    Parameters
+    ----------
+    name : str
+        The backend, "orjson", "msgspec" or "json"
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the backend is not installed
+    """
+    global JSON_BACKEND
+    if name not in JSON_BACKENDS:
+        raise ValueError('JSON backend {} is not installed, available backends: {}'.format(
+            name, ', '.join(JSON_BACKENDS)))
+    JSON_BACKEND = name
+
+
+def getJSONBackend() -> str:
+    """
+    Get the JSON backend in use
+
+    Returns
+    -------
+    str
+        The backend, see setJSONBackend
+    """
+    return JSON_BACKEND
+
+
+def loadJSON(data):
+    """
+    Decode a JSON document with the backend in use
+
+    Parameters
+    ----------
+    data : bytes or str
+        The document, UTF-8 encoded if bytes
+
+    Returns
+    -------
+    any
+        The decoded value
+
+    Raises
+    ------
+    ValueError
+        If the document is not valid JSON, e.g. if it has NaN or Infinity
+    """
+    return JSON_BACKENDS[JSON_BACKEND][0](data)
+
+
+def dumpJSON(value, sortKeys: bool = False) -> bytes:
+    """
+    Encode a value as a compact JSON document with the backend in use
+
+    Parameters
+    ----------
+    value : any
+        The value, made of dictionaries with string keys, lists, strings, numbers, booleans and None
+    sortKeys : bool, optional
+        If True, the keys of the dictionaries are sorted, so that equal values have the same encoding.
+        The default is False.
+
+    Returns
+    -------
+    bytes
+        The UTF-8 encoded document
+
+    Raises
+    ------
+    ValueError
+        If the value has a non-finite number
+    """
+    return JSON_BACKENDS[JSON_BACKEND][1](value, sortKeys)
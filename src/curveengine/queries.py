@@ -0,0 +1,491 @@
+import numpy as np
+import ORE as ore
+
+# serial number of 1970-01-01, the NumPy datetime64 epoch
+SERIAL_EPOCH = 25569
+# time step used by ORE for rates at a single date
+RATE_DT = 0.0001
+
+
+def toSerials(dates) -> np.ndarray:
+    """
+    Convert dates to an array of serial numbers
+
+    Parameters
+    ----------
+    dates : array_like
+        The dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects
+
+    Returns
+    -------
+    np.ndarray
+        The serial numbers, with the shape of the input
+    """
+    if isinstance(dates, ore.Date):
+        return np.array(dates.serialNumber(), dtype=np.int64)
+    values = np.asarray(dates)
+    if values.dtype.kind in 'US':
+        values = values.astype('datetime64[D]')
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[D]').astype(np.int64) + SERIAL_EPOCH
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int64)
+    if values.dtype.kind == 'f':
+        if not np.all(values == np.floor(values)):
+            raise ValueError('Serial numbers must be whole numbers')
+        return values.astype(np.int64)
+    if values.dtype.kind == 'O':
+        return np.array([toSerials(value) for value in values.ravel()],
+                        dtype=np.int64).reshape(values.shape)
+    raise TypeError('Unsupported date type: {}'.format(values.dtype))
+
+
+def toDatetimes(serials) -> np.ndarray:
+    """
+    Convert serial numbers to an array of datetime64 values
+
+    Parameters
+    ----------
+    serials : array_like
+        The serial numbers
+
+    Returns
+    -------
+    np.ndarray
+        The dates, as datetime64[D] values
+    """
+    return (np.asarray(serials, dtype=np.int64) - SERIAL_EPOCH).astype('datetime64[D]')
+
+
+def yearFractions(dayCounter, start, end) -> np.ndarray:
+    """
+    Compute the year fractions between two arrays of serial numbers
+
+    Parameters
+    ----------
+    dayCounter : ore.DayCounter or str
+        The day counter, or its name. Actual/360, Actual/365 (Fixed) and 30/360 (Bond Basis) are
+        computed in NumPy; other ORE day counters are called once per distinct pair of dates.
+    start : array_like
+        The start serial numbers
+    end : array_like
+        The end serial numbers
+
+    Returns
+    -------
+    np.ndarray
+        The year fractions, with the broadcast shape of start and end
+    """
+    start = np.asarray(start, dtype=np.int64)
+    end = np.asarray(end, dtype=np.int64)
+    name = dayCounter if isinstance(dayCounter, str) else dayCounter.name()
+    if name == 'Actual/360':
+        return (end - start) / 360.0
+    elif name == 'Actual/365 (Fixed)':
+        return (end - start) / 365.0
+    elif name == '30/360 (Bond Basis)':
+        y1, m1, d1 = splitSerials(start)
+        y2, m2, d2 = splitSerials(end)
+        d1 = np.where(d1 == 31, 30, d1)
+        d2 = np.where((d2 == 31) & (d1 >= 30), 30, d2)
+        return (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360.0
+    elif isinstance(dayCounter, str):
+        raise NotImplementedError('unsupported day counter: {}'.format(name))
+
+    start, end = np.broadcast_arrays(start, end)
+    pairs, inverse = np.unique(np.stack([start.ravel(), end.ravel()], axis=1),
+                               axis=0, return_inverse=True)
+    values = np.array([dayCounter.yearFraction(ore.Date(int(s)), ore.Date(int(e))) for s, e in pairs])
+    return values[inverse.ravel()].reshape(start.shape)
+
+
+def splitSerials(serials) -> tuple:
+    """
+    Split serial numbers into years, months and days
+
+    Parameters
+    ----------
+    serials : array_like
+        The serial numbers
+
+    Returns
+    -------
+    tuple
+        The years, months and days, as integer arrays
+    """
+    dates = toDatetimes(serials)
+    months = dates.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+    days = (dates - months).astype(np.int64) + 1
+    return years, months.astype(np.int64) % 12 + 1, days
+
+
+def interpolateDiscounts(nodeTimes, logDiscounts, times) -> np.ndarray:
+    """
+    Evaluate a log-linear discount curve, extrapolating with the last instantaneous forward as ORE does
+
+    Parameters
+    ----------
+    nodeTimes : np.ndarray
+        The node times, increasing
+    logDiscounts : np.ndarray
+        The logarithms of the node discount factors
+    times : array_like
+        The times to evaluate
+
+    Returns
+    -------
+    np.ndarray
+        The discount factors
+    """
+    times = np.asarray(times, dtype=np.float64)
+    slopes = (logDiscounts[1:] - logDiscounts[:-1]) / (nodeTimes[1:] - nodeTimes[:-1])
+    i = np.clip(np.searchsorted(nodeTimes, times, side='right') - 1, 0, len(nodeTimes) - 2)
+    discounts = np.exp(logDiscounts[i] + (times - nodeTimes[i]) * slopes[i])
+
+    tMax = nodeTimes[-1]
+    beyond = times > tMax
+    if np.any(beyond):
+        dMax = np.exp(logDiscounts[-1])
+        derivative = np.exp(logDiscounts[-2] + (tMax - nodeTimes[-2]) * slopes[-1]) * slopes[-1]
+        forward = -derivative / dMax
+        discounts = np.where(beyond, dMax * np.exp(-forward * (times - tMax)), discounts)
+    return discounts
+
+
+def impliedRates(compound, times, compounding=ore.Continuous, frequency=ore.Annual) -> np.ndarray:
+    """
+    Compute the rates implied by compound factors, as ore.InterestRate.impliedRate
+
+    Parameters
+    ----------
+    compound : array_like
+        The compound factors
+    times : array_like
+        The accrual times
+    compounding : int, optional
+        The ORE compounding. The default is ore.Continuous.
+    frequency : int, optional
+        The ORE frequency, used by compounded rates. The default is ore.Annual.
+
+    Returns
+    -------
+    np.ndarray
+        The rates
+    """
+    compound, times = np.broadcast_arrays(np.asarray(compound, dtype=np.float64),
+                                          np.asarray(times, dtype=np.float64))
+    if np.any(compound <= 0.0):
+        raise ValueError('positive compound factor required')
+    unit = compound == 1.0
+    if np.any(times[~unit] <= 0.0) or np.any(times[unit] < 0.0):
+        raise ValueError('positive time required')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        simple = (compound - 1.0) / times
+        if compounding == ore.Simple:
+            rates = simple
+        elif compounding == ore.Continuous:
+            rates = np.log(compound) / times
+        else:
+            f = float(frequency)
+            compounded = (np.power(compound, 1.0 / (f * times)) - 1.0) * f
+            if compounding == ore.Compounded:
+                rates = compounded
+            elif compounding == ore.SimpleThenCompounded:
+                rates = np.where(times <= 1.0 / f, simple, compounded)
+            elif compounding == ore.CompoundedThenSimple:
+                rates = np.where(times > 1.0 / f, simple, compounded)
+            else:
+                raise NotImplementedError('unknown compounding: {}'.format(compounding))
+    return np.where(unit, 0.0, rates)
+
+
+def checkTimes(times, maxTime, extrapolate):
+    """
+    Check that times are within the range of a curve
+
+    Parameters
+    ----------
+    times : np.ndarray
+        The times to check
+    maxTime : float
+        The maximum time of the curve
+    extrapolate : bool
+        Whether the curve allows extrapolation
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If a time is negative, or past the maximum time without extrapolation
+    """
+    if np.any(times < 0.0):
+        raise ValueError('negative time given')
+    if not extrapolate and np.any(times > maxTime):
+        raise ValueError('time ({}) is past max curve time ({})'.format(np.max(times), maxTime))
+
+
+def zeroRatesAt(nodeTimes, logDiscounts, times, rateTimes, atReference, compounding=ore.Continuous,
+                frequency=ore.Annual) -> np.ndarray:
+    """
+    Compute the zero rates of a log-linear discount curve, as ore.YieldTermStructure.zeroRate
+
+    Parameters
+    ----------
+    nodeTimes : np.ndarray
+        The node times, increasing
+    logDiscounts : np.ndarray
+        The logarithms of the node discount factors
+    times : array_like
+        The times of the dates, with the day counter of the curve
+    rateTimes : array_like
+        The times of the dates, with the day counter of the rates
+    atReference : array_like
+        Whether each date is the reference date of the curve, where the rate over a short
+        period is returned
+    compounding : int, optional
+        The ORE compounding. The default is ore.Continuous.
+    frequency : int, optional
+        The ORE frequency. The default is ore.Annual.
+
+    Returns
+    -------
+    np.ndarray
+        The zero rates
+    """
+    discounts = interpolateDiscounts(nodeTimes, logDiscounts, np.where(atReference, RATE_DT, times))
+    return impliedRates(1.0 / discounts, np.where(atReference, RATE_DT, rateTimes), compounding, frequency)
+
+
+def forwardRatesAt(nodeTimes, logDiscounts, startTimes, endTimes, rateTimes, instantaneous,
+                   compounding=ore.Continuous, frequency=ore.Annual) -> np.ndarray:
+    """
+    Compute the forward rates of a log-linear discount curve, as ore.YieldTermStructure.forwardRate
+
+    Parameters
+    ----------
+    nodeTimes : np.ndarray
+        The node times, increasing
+    logDiscounts : np.ndarray
+        The logarithms of the node discount factors
+    startTimes : array_like
+        The times of the start dates, with the day counter of the curve
+    endTimes : array_like
+        The times of the end dates, with the day counter of the curve
+    rateTimes : array_like
+        The times between the start and end dates, with the day counter of the rates
+    instantaneous : array_like
+        Whether the start and end dates are equal, where the rate over a short period is returned
+    compounding : int, optional
+        The ORE compounding. The default is ore.Continuous.
+    frequency : int, optional
+        The ORE frequency. The default is ore.Annual.
+
+    Returns
+    -------
+    np.ndarray
+        The forward rates
+    """
+    startTimes = np.asarray(startTimes, dtype=np.float64)
+    shortStart = np.maximum(startTimes - RATE_DT / 2.0, 0.0)
+    t1 = np.where(instantaneous, shortStart, startTimes)
+    t2 = np.where(instantaneous, shortStart + RATE_DT, endTimes)
+    compound = interpolateDiscounts(nodeTimes, logDiscounts, t1) / \
+        interpolateDiscounts(nodeTimes, logDiscounts, t2)
+    return impliedRates(compound, np.where(instantaneous, RATE_DT, rateTimes), compounding, frequency)
+
+
+def createBusinessCalendar(calendar: ore.Calendar, start, end) -> np.busdaycalendar:
+    """
+    Create a NumPy business day calendar with the holidays and weekends of an ORE calendar
+
+    Parameters
+    ----------
+    calendar : ore.Calendar
+        The calendar
+    start : int
+        The first serial number covered. Earlier dates are business days.
+    end : int
+        The last serial number covered. Later dates are business days.
+
+    Returns
+    -------
+    np.busdaycalendar
+        The business day calendar
+    """
+    holidays = calendar.holidayList(ore.Date(int(start)), ore.Date(int(end)), True)
+    return np.busdaycalendar(weekmask='1111111',
+                             holidays=toDatetimes([date.serialNumber() for date in holidays]))
+
+
+def adjustSerials(serials, convention, busdaycal: np.busdaycalendar) -> np.ndarray:
+    """
+    Adjust serial numbers to business days, as ore.Calendar.adjust
+
+    Parameters
+    ----------
+    serials : array_like
+        The serial numbers
+    convention : int
+        The ORE business day convention: Following, ModifiedFollowing, Preceding, ModifiedPreceding
+        or Unadjusted
+    busdaycal : np.busdaycalendar
+        The business day calendar, see createBusinessCalendar
+
+    Returns
+    -------
+    np.ndarray
+        The adjusted serial numbers
+    """
+    serials = np.asarray(serials, dtype=np.int64)
+    if convention == ore.Unadjusted:
+        return serials
+    dates = toDatetimes(serials)
+    following = np.busday_offset(dates, 0, roll='forward', busdaycal=busdaycal)
+    preceding = np.busday_offset(dates, 0, roll='backward', busdaycal=busdaycal)
+    months = dates.astype('datetime64[M]')
+    if convention == ore.Following:
+        adjusted = following
+    elif convention == ore.Preceding:
+        adjusted = preceding
+    elif convention == ore.ModifiedFollowing:
+        adjusted = np.where(following.astype('datetime64[M]') != months, preceding, following)
+    elif convention == ore.ModifiedPreceding:
+        adjusted = np.where(preceding.astype('datetime64[M]') != months, following, preceding)
+    else:
+        raise NotImplementedError('unsupported business day convention: {}'.format(convention))
+    return toSerials(adjusted)
+
+
+def advanceSerials(serials, n, unit, convention, endOfMonth, busdaycal: np.busdaycalendar) -> np.ndarray:
+    """
+    Advance serial numbers by a period, as ore.Calendar.advance
+
+    Parameters
+    ----------
+    serials : array_like
+        The serial numbers
+    n : int
+        The length of the period
+    unit : int
+        The ORE time unit of the period: Days, Weeks, Months or Years
+    convention : int
+        The ORE business day convention, see adjustSerials
+    endOfMonth : bool
+        Whether dates at the end of the month are moved to the end of the month
+    busdaycal : np.busdaycalendar
+        The business day calendar, see createBusinessCalendar
+
+    Returns
+    -------
+    np.ndarray
+        The advanced serial numbers
+    """
+    serials = np.asarray(serials, dtype=np.int64)
+    if n == 0:
+        return adjustSerials(serials, convention, busdaycal)
+    if unit == ore.Days:
+        # from a holiday, rolling against the direction counts n business days from the date itself
+        roll = 'backward' if n > 0 else 'forward'
+        return toSerials(np.busday_offset(toDatetimes(serials), n, roll=roll, busdaycal=busdaycal))
+    if unit == ore.Weeks:
+        return adjustSerials(serials + 7 * n, convention, busdaycal)
+    if unit not in (ore.Months, ore.Years):
+        raise NotImplementedError('unsupported time unit: {}'.format(unit))
+
+    advanced = addMonths(serials, n if unit == ore.Months else 12 * n)
+    adjusted = adjustSerials(advanced, convention, busdaycal)
+    if not endOfMonth:
+        return adjusted
+    if convention == ore.Unadjusted:
+        atEnd = lastDayOfMonth(serials) == serials
+        return np.where(atEnd, lastDayOfMonth(advanced), adjusted)
+    nextMonths = toDatetimes(adjustSerials(serials + 1, ore.Following, busdaycal)).astype('datetime64[M]')
+    atEnd = nextMonths != toDatetimes(serials).astype('datetime64[M]')
+    return np.where(atEnd, adjustSerials(lastDayOfMonth(advanced), ore.Preceding, busdaycal), adjusted)
+
+
+def addMonths(serials, months: int) -> np.ndarray:
+    """
+    Add months to serial numbers, moving days past the end of the month to its last day
+
+    Parameters
+    ----------
+    serials : array_like
+        The serial numbers
+    months : int
+        The number of months
+
+    Returns
+    -------
+    np.ndarray
+        The serial numbers
+    """
+    dates = toDatetimes(serials)
+    monthStarts = dates.astype('datetime64[M]')
+    days = (dates - monthStarts).astype(np.int64)
+    target = monthStarts + months
+    lengths = ((target + 1).astype('datetime64[D]') - target.astype('datetime64[D]')).astype(np.int64)
+    return toSerials(target.astype('datetime64[D]')) + np.minimum(days, lengths - 1)
+
+
+def lastDayOfMonth(serials) -> np.ndarray:
+    """
+    Get the last day of the month of serial numbers
+
+    Parameters
+    ----------
+    serials : array_like
+        The serial numbers
+
+    Returns
+    -------
+    np.ndarray
+        The serial numbers of the last days of the months
+    """
+    months = toDatetimes(serials).astype('datetime64[M]')
+    return toSerials((months + 1).astype('datetime64[D]')) - 1
+
+
+def indexFixingPeriods(index: ore.IborIndex, fixingSerials) -> tuple:
+    """
+    Get the value and maturity dates of the fixings of an index, as ore.IborIndex.valueDate and
+    maturityDate
+
+    Parameters
+    ----------
+    index : ore.IborIndex
+        The index, an ibor or overnight index
+    fixingSerials : array_like
+        The serial numbers of the fixing dates
+
+    Returns
+    -------
+    tuple
+        The serial numbers of the value and maturity dates
+
+    Raises
+    ------
+    ValueError
+        If a fixing date is not a business day of the fixing calendar of the index
+    """
+    fixingSerials = np.asarray(fixingSerials, dtype=np.int64)
+    if fixingSerials.size == 0:
+        return fixingSerials, fixingSerials
+    tenor = index.tenor()
+    unitDays = {ore.Days: 1, ore.Weeks: 7, ore.Months: 31, ore.Years: 366}[tenor.units()]
+    busdaycal = createBusinessCalendar(
+        index.fixingCalendar(), fixingSerials.min() - 40,
+        fixingSerials.max() + 40 + 2 * index.fixingDays() + tenor.length() * unitDays)
+    invalid = ~np.is_busday(toDatetimes(fixingSerials), busdaycal=busdaycal)
+    if np.any(invalid):
+        raise ValueError('{}: invalid fixing date {}'.format(
+            index.name(), toDatetimes(fixingSerials[invalid][0])))
+    valueSerials = advanceSerials(fixingSerials, index.fixingDays(), ore.Days, ore.Following, False, busdaycal)
+    maturitySerials = advanceSerials(valueSerials, tenor.length(), tenor.units(),
+                                     index.businessDayConvention(), index.endOfMonth(), busdaycal)
+    return valueSerials, maturitySerials
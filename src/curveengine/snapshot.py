@@ -0,0 +1,254 @@
+import json
+import numpy as np
+from .queries import *
+
+# the only interpolation of the curves built by the engine
+LOG_LINEAR = 'LogLinear'
+
+
+class CurveSnapshot:
+    '''
+    Immutable, array-backed copy of a bootstrapped curve. It holds no ORE objects, so it can be
+    pickled, sent to other processes or stored, and it is queried in NumPy as CurveEngine.discounts.
+
+    Parameters
+    ----------
+    curveName : str
+        The name of the curve.
+    refDate : int
+        The serial number of the reference date of the curve.
+    dayCounter : str
+        The name of the day counter of the curve, see yearFractions.
+    serials : array_like
+        The serial numbers of the nodes, increasing, starting at the reference date.
+    logDiscounts : array_like
+        The logarithms of the discount factors of the nodes.
+    interpolation : str, optional
+        The interpolation of the discount factors. The default, and only supported value, is LogLinear.
+    extrapolation : bool, optional
+        Whether the curve allows extrapolation. The default is False.
+
+    Returns
+    -------
+    None
+    '''
+
+    __slots__ = ('curveName', 'refDate', 'dayCounter', 'interpolation', 'extrapolation',
+                 'serials', 'logDiscounts', 'times')
+
+    def __init__(self, curveName, refDate, dayCounter, serials, logDiscounts, interpolation=LOG_LINEAR,
+                 extrapolation=False):
+        if interpolation != LOG_LINEAR:
+            raise NotImplementedError('unsupported interpolation: {}'.format(interpolation))
+        serials = np.asarray(serials, dtype=np.int64).view()
+        logDiscounts = np.asarray(logDiscounts, dtype=np.float64).view()
+        if serials.ndim != 1 or serials.shape != logDiscounts.shape or len(serials) < 2:
+            raise ValueError('Curve {}: expected matching arrays of at least two nodes'.format(curveName))
+        if np.any(np.diff(serials) <= 0):
+            raise ValueError('Curve {}: node dates must be increasing'.format(curveName))
+        times = yearFractions(dayCounter, int(refDate), serials)
+        for array in [serials, logDiscounts, times]:
+            array.flags.writeable = False
+
+        values = {'curveName': curveName, 'refDate': int(refDate), 'dayCounter': dayCounter,
+                  'interpolation': interpolation, 'extrapolation': bool(extrapolation),
+                  'serials': serials, 'logDiscounts': logDiscounts, 'times': times}
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CurveSnapshot is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('CurveSnapshot is immutable')
+
+    def __reduce__(self):
+        # the node arrays are pickled out of band with protocol 5
+        return (CurveSnapshot, (self.curveName, self.refDate, self.dayCounter, self.serials,
+                                self.logDiscounts, self.interpolation, self.extrapolation))
+
+    def __repr__(self):
+        return 'CurveSnapshot({}, {}, {} nodes)'.format(
+            self.curveName, toDatetimes(self.refDate), len(self.serials))
+
+    '''
+    Get the nodes of the curve.
+
+    Returns
+    -------
+    tuple
+        The node dates, as datetime64 values, and the node discount factors.
+    '''
+
+    def nodes(self):
+        return toDatetimes(self.serials), np.exp(self.logDiscounts)
+
+    '''
+    Get the discount factors at many dates, see CurveEngine.discounts.
+
+    Parameters
+    ----------
+    dates : array_like
+        The dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+
+    Returns
+    -------
+    np.ndarray
+        The discount factors, with the shape of dates.
+    '''
+
+    def discounts(self, dates):
+        times = yearFractions(self.dayCounter, self.refDate, toSerials(dates))
+        self.__checkTimes(times)
+        return interpolateDiscounts(self.times, self.logDiscounts, times)
+
+    '''
+    Get the zero rates at many dates, see CurveEngine.zeroRates.
+
+    Parameters
+    ----------
+    dates : array_like
+        The dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+    dayCounter : str or ore.DayCounter, optional
+        The day counter of the rates. The default is None, the day counter of the curve.
+    compounding : int, optional
+        The ORE compounding of the rates. The default is ore.Continuous.
+    frequency : int, optional
+        The ORE frequency of the rates. The default is ore.Annual.
+
+    Returns
+    -------
+    np.ndarray
+        The zero rates, with the shape of dates.
+    '''
+
+    def zeroRates(self, dates, dayCounter=None, compounding=ore.Continuous, frequency=ore.Annual):
+        dayCounter = self.dayCounter if dayCounter is None else dayCounter
+        serials = toSerials(dates)
+        times = yearFractions(self.dayCounter, self.refDate, serials)
+        self.__checkTimes(times)
+        return zeroRatesAt(self.times, self.logDiscounts, times, yearFractions(dayCounter, self.refDate, serials),
+                           serials == self.refDate, compounding, frequency)
+
+    '''
+    Get the forward rates between many pairs of dates, see CurveEngine.forwardRates.
+
+    Parameters
+    ----------
+    startDates : array_like
+        The start dates, as serial numbers, datetime64 values, ISO strings or ore.Date objects.
+    endDates : array_like
+        The end dates, in the same formats.
+    dayCounter : str or ore.DayCounter, optional
+        The day counter of the rates. The default is None, the day counter of the curve.
+    compounding : int, optional
+        The ORE compounding of the rates. The default is ore.Continuous.
+    frequency : int, optional
+        The ORE frequency of the rates. The default is ore.Annual.
+
+    Returns
+    -------
+    np.ndarray
+        The forward rates, with the broadcast shape of the start and end dates.
+    '''
+
+    def forwardRates(self, startDates, endDates, dayCounter=None, compounding=ore.Continuous,
+                     frequency=ore.Annual):
+        dayCounter = self.dayCounter if dayCounter is None else dayCounter
+        startSerials, endSerials = np.broadcast_arrays(toSerials(startDates), toSerials(endDates))
+        if np.any(startSerials > endSerials):
+            raise ValueError('Start dates must not be later than end dates')
+        startTimes = yearFractions(self.dayCounter, self.refDate, startSerials)
+        endTimes = yearFractions(self.dayCounter, self.refDate, endSerials)
+        self.__checkTimes(startTimes)
+        self.__checkTimes(endTimes)
+        return forwardRatesAt(self.times, self.logDiscounts, startTimes, endTimes,
+                              yearFractions(dayCounter, startSerials, endSerials),
+                              startSerials == endSerials, compounding, frequency)
+
+    def __checkTimes(self, times):
+        try:
+            checkTimes(times, self.times[-1], self.extrapolation)
+        except ValueError as exc:
+            raise ValueError('Curve {}: {}'.format(self.curveName, exc)) from None
+
+
+def createCurveSnapshot(curveName: str, curve: ore.YieldTermStructure) -> CurveSnapshot:
+    """
+    Create the snapshot of a log-linear discount curve
+
+    Parameters
+    ----------
+    curveName : str
+        The name of the curve
+    curve : ore.YieldTermStructure
+        The curve, a PiecewiseLogLinearDiscount or a DiscountCurve
+
+    Returns
+    -------
+    CurveSnapshot
+        The snapshot of the curve
+    """
+    nodes = curve.nodes()
+    return CurveSnapshot(curveName, curve.referenceDate().serialNumber(), curve.dayCounter().name(),
+                         [date.serialNumber() for date, _ in nodes],
+                         np.log([value for _, value in nodes]),
+                         extrapolation=curve.allowsExtrapolation())
+
+
+def packSnapshots(snapshots: dict) -> bytes:
+    """
+    Serialize curve snapshots to a single buffer: a JSON header followed by the node arrays,
+    8-byte aligned, so they can be read back without copies, see unpackSnapshots
+
+    Parameters
+    ----------
+    snapshots : dict
+        The snapshots by curve name
+
+    Returns
+    -------
+    bytes
+        The serialized snapshots
+    """
+    header = [{'curveName': snapshot.curveName, 'refDate': snapshot.refDate,
+               'dayCounter': snapshot.dayCounter, 'interpolation': snapshot.interpolation,
+               'extrapolation': snapshot.extrapolation, 'size': len(snapshot.serials)}
+              for snapshot in snapshots.values()]
+    header = json.dumps(header).encode()
+    header += b' ' * (-len(header) % 8)
+    parts = [np.array([len(header)], dtype='<i8').tobytes(), header]
+    for snapshot in snapshots.values():
+        parts.append(snapshot.serials.astype('<i8').tobytes())
+        parts.append(snapshot.logDiscounts.astype('<f8').tobytes())
+    return b''.join(parts)
+
+
+def unpackSnapshots(buffer) -> dict:
+    """
+    Deserialize curve snapshots serialized by packSnapshots. The node arrays are read-only views
+    of the buffer, which can be a bytes object, a memory map or shared memory.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        The serialized snapshots
+
+    Returns
+    -------
+    dict
+        The snapshots by curve name
+    """
+    headerSize = int(np.frombuffer(buffer, dtype='<i8', count=1)[0])
+    header = json.loads(bytes(memoryview(buffer)[8:8 + headerSize]))
+    offset = 8 + headerSize
+    snapshots = {}
+    for item in header:
+        size = item['size']
+        serials = np.frombuffer(buffer, dtype='<i8', count=size, offset=offset)
+        logDiscounts = np.frombuffer(buffer, dtype='<f8', count=size, offset=offset + 8 * size)
+        offset += 16 * size
+        snapshots[item['curveName']] = CurveSnapshot(
+            item['curveName'], item['refDate'], item['dayCounter'], serials, logDiscounts,
+            item['interpolation'], item['extrapolation'])
+    return snapshots
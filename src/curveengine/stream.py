@@ -0,0 +1,216 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .engine import CurveEngine
+
+logger = logging.getLogger(__name__)
+
+
+class CurveStream:
+    '''
+    Asyncio front end for a CurveEngine, consuming a stream of market ticks.
+
+    Ticks are coalesced per ticker, keeping only the latest value, and applied to the engine in
+    batches. A batch is applied once no tick has arrived for the debounce window, or once the
+    minimum interval given by the maximum rebuild rate has elapsed since the first pending tick,
+    whichever comes first, but never more often than the maximum rebuild rate.
+
+    ORE objects are not thread safe, and the evaluation date is global. The stream therefore owns the
+    engine: it is only used from a dedicated worker thread, one batch at a time, so the event loop keeps
+    ingesting ticks during a rebuild. While the stream is open, the engine, its curves, indexes and quotes
+    must only be used through query, and no other thread may change the evaluation date. The worker
+    thread is released by close.
+
+    A batch the engine fails to apply is dropped and counted in failed; the error, like the error of a
+    subscriber, is logged and kept in lastError, and the stream goes on. A stream runs on one event loop.
+
+    Parameters
+    ----------
+    engine : CurveEngine
+        The engine to update.
+    maxRate : float, optional
+        The maximum number of rebuilds per second. The default is None, meaning no limit.
+    debounce : float, optional
+        The quiet period, in seconds, after which pending ticks are applied. The default is 0.0.
+
+    Returns
+    -------
+    None
+    '''
+
+    def __init__(self, engine: CurveEngine, maxRate: float = None, debounce: float = 0.0):
+        self.engine = engine
+        self.interval = 0.0 if maxRate is None else 1.0 / maxRate
+        self.debounce = debounce
+        self.version = 0
+        self.subscribers = []
+        self.pending = {}
+        # the timestamp of the latest tick accepted for each ticker, pending or applied
+        self.timestamps = {}
+        self.ignored = 0
+        self.stale = 0
+        self.failed = 0
+        self.lastError = None
+        self.__arrived = asyncio.Event()
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='CurveStream')
+        self.__closed = False
+        self.__firstTick = self.__lastTick = None
+        self.__lastFlush = -float('inf')
+
+    '''
+    Subscribe to new curve versions.
+
+    Parameters
+    ----------
+    callback : callable
+        A function or coroutine function called as callback(version, rebuilt) after each rebuild,
+        where rebuilt is the list of re-bootstrapped curve names.
+
+    Returns
+    -------
+    None
+    '''
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    '''
+    Unsubscribe from new curve versions.
+
+    Parameters
+    ----------
+    callback : callable
+        A previously subscribed callback.
+
+    Returns
+    -------
+    None
+    '''
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    '''
+    Run a function on the worker thread owning the engine, after the batch being applied.
+
+    Parameters
+    ----------
+    function : callable
+        The function to run, typically a method of the engine such as engine.discounts.
+    *args, **kwargs
+        The arguments of the function.
+
+    Returns
+    -------
+    object
+        The result of the function.
+    '''
+
+    async def query(self, function, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__executor, lambda: function(*args, **kwargs))
+
+    '''
+    Release the worker thread owning the engine, once the pending work is done. The stream can no
+    longer be run or queried.
+
+    Returns
+    -------
+    None
+    '''
+
+    def close(self):
+        self.__executor.shutdown()
+
+    '''
+    Consume a stream of ticks until it is exhausted, applying the pending ticks at the end.
+
+    Parameters
+    ----------
+    ticks : async iterable
+        An async iterable of (ticker, value, timestamp) tuples. Ticks older than the latest tick
+        accepted for the same ticker are dropped and counted in stale. The tickers unknown to the
+        engine, once it has built the curves quoting them, are ignored and counted in ignored.
+
+    Returns
+    -------
+    int
+        The last published version.
+    '''
+
+    async def run(self, ticks):
+        loop = asyncio.get_running_loop()
+        self.__arrived.clear()
+        self.__closed = False
+        flusher = asyncio.ensure_future(self.__flushLoop())
+        try:
+            async for ticker, value, timestamp in ticks:
+                latest = self.timestamps.get(ticker)
+                if timestamp is not None and latest is not None and timestamp < latest:
+                    self.stale += 1
+                    continue
+                self.pending[ticker] = value
+                if timestamp is not None:
+                    self.timestamps[ticker] = timestamp
+                self.__lastTick = loop.time()
+                if self.__firstTick is None:
+                    self.__firstTick = self.__lastTick
+                self.__arrived.set()
+        finally:
+            self.__closed = True
+            self.__arrived.set()
+            await flusher
+        return self.version
+
+    async def __flushLoop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.__arrived.wait()
+            while not self.__closed:
+                deadline = self.__lastTick + self.debounce
+                if self.interval > 0:
+                    deadline = min(deadline, self.__firstTick + self.interval)
+                    deadline = max(deadline, self.__lastFlush + self.interval)
+                wait = deadline - loop.time()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self.__arrived.clear()
+            if self.pending:
+                await self.__flush()
+            # the ticks arrived while the last batch was applied are applied before closing
+            if self.__closed and not self.pending:
+                return
+
+    async def __flush(self):
+        market = self.pending
+        self.pending = {}
+        self.__firstTick = None
+        self.__lastFlush = asyncio.get_running_loop().time()
+
+        try:
+            rebuilt = await asyncio.get_running_loop().run_in_executor(self.__executor, self.__apply, market)
+        except Exception as exc:
+            self.failed += 1
+            self.lastError = exc
+            logger.exception('Failed to apply %d ticks', len(market))
+            return
+        if rebuilt is None:
+            return
+        self.version += 1
+        for callback in list(self.subscribers):
+            try:
+                result = callback(self.version, rebuilt)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as exc:
+                self.lastError = exc
+                logger.exception('Subscriber failed on version %d', self.version)
+
+    def __apply(self, market):
+        # a lazy engine builds the curves quoting the tickers before telling which ones it knows
+        known = self.engine.getKnownTickers(market.keys())
+        self.ignored += len(market) - len(known)
+        if not known:
+            return None
+        return self.engine.update(market={ticker: market[ticker] for ticker in known})
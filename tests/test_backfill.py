@@ -0,0 +1,78 @@
+import sys, os
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+
+import json
+import tempfile
+import unittest
+from curveengine import *
+from curveengine.backfill import *
+from test_engine import loadConfig
+
+
+class TestBackfill(unittest.TestCase):
+
+    def test_business_dates(self):
+        self.assertEqual(getBusinessDates('2023-05-19', '2023-05-23', 'TARGET'),
+                         ['2023-05-19', '2023-05-22', '2023-05-23'])
+        self.assertEqual(len(getBusinessDates('2023-05-19', '2023-05-23')), 5)
+
+    def test_run_backfill(self):
+        template = loadConfig(('SOFR', 'CF_CLP_PASIVO'))
+        market = {}
+        for curve in template['curves']:
+            for helper in curve['curveConfig']['rateHelpers']:
+                for price in helper['marketConfig'].values():
+                    market[price['ticker']] = price.pop('value')
+        dates = ['2023-05-22', '2023-05-23', '2023-05-24']
+
+        with tempfile.TemporaryDirectory() as folder:
+            marketFolder = os.path.join(folder, 'market')
+            output = os.path.join(folder, 'output')
+            os.makedirs(marketFolder)
+            for date in dates[:2]:
+                with open(os.path.join(marketFolder, date + '.json'), 'w') as f:
+                    json.dump(market, f)
+
+            logs = []
+            stats = runBackfill(template, dates, marketFolder, output,
+                                chunkSize=1, maxWorkers=2, log=logs.append)
+            self.assertEqual(stats['processed'], 2)
+            self.assertEqual(list(stats['failed'].keys()), ['2023-05-24'])
+            self.assertEqual(set(stats['curveSeconds'].keys()), {'SOFR', 'CF_CLP_PASIVO'})
+            self.assertTrue(all(seconds > 0 for seconds in stats['curveSeconds'].values()))
+            self.assertTrue(logs)
+
+            results = readBackfill(output)
+            self.assertEqual(sorted(set(str(d) for d in results['refDate'])), dates[:2])
+            selected = (results['refDate'] == np.datetime64('2023-05-23')) & (results['curveName'] == 'SOFR')
+            expected = CurveEngine({**template, 'refDate': '2023-05-23'}, template=True)
+            expected.bindMarket(market)
+            self.assertEqual(results['discount'][selected].tolist(),
+                             [value for _, value in expected.getCurve('SOFR').nodes()])
+
+            with open(os.path.join(marketFolder, dates[2] + '.json'), 'w') as f:
+                json.dump(market, f)
+            stats = runBackfill(template, dates, marketFolder, output, log=logs.append)
+            self.assertEqual(stats['processed'], 1)
+            self.assertEqual(stats['skipped'], 2)
+            self.assertEqual(len(set(readBackfill(output)['refDate'].tolist())), 3)
+
+    def test_curve_timings(self):
+        template = loadConfig(('SOFR', 'CF_CLP_PASIVO'))
+        market = getMarketQuotes(template['curves'][0])
+        market.update(getMarketQuotes(template['curves'][1]))
+        columns, timings, failed = backfillChunk(template, ['2023-05-22'], lambda date: market)
+        self.assertEqual(failed, {})
+
+        # the bootstrap recorded by the engine, not the read of the bootstrapped nodes
+        engine = CurveEngine({**template, 'refDate': '2023-05-22'}, template=True)
+        engine.bindMarket(market)
+        self.assertEqual(set(engine.bootstrapTimes.keys()), set(engine.sortedCurves))
+        for curveName in engine.sortedCurves:
+            self.assertGreater(timings[curveName][0], 0)
+            self.assertGreater(engine.bootstrapTimes[curveName], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys, os
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+
+import unittest
+import numpy as np
+from curveengine import *
+
+
+def createCurve(discount):
+    dates = [ore.Date(25, 5, 2023), ore.Date(25, 5, 2024), ore.Date(25, 5, 2026)]
+    return ore.DiscountCurve(dates, [1.0, discount, discount ** 3], ore.Actual360())
+
+
+class TestCachedCurve(unittest.TestCase):
+
+    def test_getQueryKey(self):
+        date = ore.Date(25, 5, 2024)
+        self.assertEqual(getQueryKey('discount', (date,), {}), ('discount', ('Date', date.serialNumber())))
+        self.assertEqual(getQueryKey('zeroRate', (date, ore.Actual360(), ore.Continuous), {}),
+                         getQueryKey('zeroRate', (ore.Date(25, 5, 2024), ore.Actual360(), ore.Continuous), {}))
+        self.assertNotEqual(getQueryKey('discount', (1.0,), {}), getQueryKey('discount', (1,), {}))
+        self.assertIsNone(getQueryKey('discount', (object(),), {}))
+
+    def test_cache(self):
+        curve = createCurve(0.96)
+        cached = CachedCurve(curve, maxSize=2)
+        dates = [ore.Date(25, 5, 2024), ore.Date(25, 5, 2025), ore.Date(25, 5, 2026)]
+        self.assertEqual(cached.discount(dates[0]), curve.discount(dates[0]))
+        cached.discount(dates[0])
+        cached.discount(dates[1])
+        cached.discount(dates[2])
+        self.assertEqual(cached.cacheInfo(), {'hits': 1, 'misses': 3, 'maxSize': 2, 'size': 2})
+        cached.discount(dates[0])
+        self.assertEqual(cached.cacheInfo()['misses'], 4)
+        self.assertEqual(cached.zeroRate(dates[1], ore.Actual360(), ore.Continuous).rate(),
+                         curve.zeroRate(dates[1], ore.Actual360(), ore.Continuous).rate())
+        self.assertEqual(cached.referenceDate(), curve.referenceDate())
+
+        other = createCurve(0.9)
+        cached.relink(other)
+        self.assertEqual(cached.cacheInfo()['size'], 0)
+        self.assertEqual(cached.discount(dates[0]), other.discount(dates[0]))
+
+
+class TestDiscountGrid(unittest.TestCase):
+
+    def test_grid(self):
+        curve = createCurve(0.96)
+        curve.enableExtrapolation()
+        source = lambda: createCurveSnapshot('TEST', curve)
+        grid = DiscountGrid(curve, source, 2000)
+        refDate = curve.referenceDate().serialNumber()
+        serials = np.arange(refDate, refDate + 2500, 7)
+        np.testing.assert_array_equal(grid.discounts(serials), source().discounts(serials))
+        self.assertEqual(len(grid.values()), 2000)
+        self.assertEqual(grid.discount(ore.Date(refDate + 10)), source().discounts(refDate + 10))
+        self.assertEqual(grid.discount(refDate + 2100), source().discounts(refDate + 2100))
+        self.assertEqual(grid.rebuilds, 1)
+
+        other = createCurve(0.9)
+        grid.relink(other)
+        source = lambda: createCurveSnapshot('TEST', other)
+        grid.source = source
+        np.testing.assert_array_equal(grid.discounts(serials[:10]), source().discounts(serials[:10]))
+        self.assertEqual(grid.rebuilds, 2)
+        self.assertEqual(len(grid.values()), len(range(refDate, other.maxDate().serialNumber() + 1)))
+
+
+class TestBuildCache(unittest.TestCase):
+
+    def test_getCurveHash(self):
+        curve = {'curveName': 'A', 'curveConfig': {'rate': 0.01, 'dayCounter': 'Actual360'}}
+        refDate = ore.Date(25, 5, 2023)
+        key = getCurveHash(curve, refDate, {})
+        reordered = {'curveConfig': {'dayCounter': 'Actual360', 'rate': 0.01}, 'curveName': 'A'}
+        self.assertEqual(getCurveHash(reordered, ore.Date(25, 5, 2023), {}), key)
+        self.assertNotEqual(getCurveHash(curve, ore.Date(26, 5, 2023), {}), key)
+        self.assertNotEqual(getCurveHash(curve, refDate, {'B': key}), key)
+        self.assertNotEqual(getCurveHash({**curve, 'curveConfig': {'rate': 0.02, 'dayCounter': 'Actual360'}},
+                                         refDate, {}), key)
+
+    def test_eviction(self):
+        nodes = list(createCurve(0.96).nodes())
+        cache = BuildCache(maxSize=2)
+        cache.put('a', nodes)
+        cache.put('b', nodes)
+        serials, values = cache.get('a')
+        self.assertEqual(list(serials), [date.serialNumber() for date, _ in nodes])
+        self.assertEqual(list(values), [value for _, value in nodes])
+        cache.put('c', nodes)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.cacheInfo(), {'hits': 1, 'misses': 1, 'maxSize': 2, 'size': 2,
+                                             'maxBytes': 16 * 2 ** 20, 'bytes': 2 * 16 * len(nodes)})
+
+        cache = BuildCache(maxBytes=16 * len(nodes))
+        cache.put('a', nodes)
+        cache.put('b', nodes)
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        cache.clear()
+        self.assertEqual(cache.cacheInfo()['bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -293,6 +293,18 @@ class TestChecks(unittest.TestCase):
         self.assertRaises(ConfigurationError,
                           checkMarketConfig, h1, HelperType.Deposit)
         self.assertIsNone(checkMarketConfig(h2,  HelperType.Deposit))
+
+    def test_market_config_template_check(self):
+        h1 = {
+            "rate": {
+                "ticker": "CLP_CU"
+            }
+        }
+        self.assertRaises(ConfigurationError,
+                          checkMarketConfig, h1, HelperType.Deposit)
+        self.assertIsNone(checkMarketConfig(h1, HelperType.Deposit, template=True))
+        self.assertRaises(ConfigurationError,
+                          checkMarketConfig, {"rate": {}}, HelperType.Deposit, template=True)
     # TODO: Add more tests for the other rate helpers
     # checkTenorBasisRateHelper
 
@@ -519,3 +531,34 @@ class TestChecks(unittest.TestCase):
         self.assertRaises(ConfigurationError,
                           checkCurve, c2, 0)
         self.assertIsNone(checkCurve(c3, 0))
+
+    def test_compiled_structure(self):
+        reference = {'a': INT_RULE, 'b': STR_RULE, 'c': TENOR_RULE,
+                     'd': partial(checkInstance, type=bool)}
+        structure = compileStructure(reference)
+        self.assertRaises(KeyError, checkCompiledStructure,
+                          {'a': 1, 'b': 'x', 'c': '1Y'}, structure)
+        self.assertRaises(ValueError, checkCompiledStructure,
+                          {'a': 1, 'b': 1, 'c': '1Y', 'd': True}, structure)
+        self.assertRaises(ValueError, checkCompiledStructure,
+                          {'a': 1, 'b': 'x', 'c': '1X', 'd': True}, structure)
+        self.assertRaises(ValueError, checkCompiledStructure,
+                          {'a': 1, 'b': 'x', 'c': '1Y', 'd': 1}, structure)
+        self.assertIsNone(checkCompiledStructure(
+            {'a': 1, 'b': 'x', 'c': '1Y', 'd': True, 'e': None}, structure))
+
+        # values failing a stricter rule are left to the check
+        self.assertIsNone(checkCompiledStructure(
+            {'a': 1.0, 'b': 'x', 'c': '1Y6M', 'd': False}, structure))
+
+    def test_compiled_errors(self):
+        # the compiled checks raise the errors of checkDictStructure, value by value
+        reference = {'a': partial(checkInstance, type=int), 'b': checkTenor}
+        structure = compileStructure({'a': INT_RULE, 'b': TENOR_RULE})
+        for data in [{'a': 'x', 'b': 'y'}, {'b': 'y', 'a': 'x'}, {'a': 1}, 1]:
+            with self.assertRaises(Exception) as expected:
+                checkDictStructure(data, reference)
+            with self.assertRaises(Exception) as compiled:
+                checkCompiledStructure(data, structure)
+            self.assertEqual(type(compiled.exception), type(expected.exception))
+            self.assertEqual(str(compiled.exception), str(expected.exception))
@@ -0,0 +1,205 @@
+import unittest
+import sys
+import os
+import copy
+import json
+import pickle
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+from curveengine import *
+
+
+def toComparable(value):
+    if isinstance(value, dict):
+        return {key: toComparable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [toComparable(item) for item in value]
+    if type(value).__module__ == 'ORE':
+        return (type(value).__name__, str(value))
+    return value
+
+
+class TestConfiguration(unittest.TestCase):
+    def setUp(self):
+        with open(parent_dir + '/../examples/config.json', 'r') as f:
+            self.data = json.load(f)
+
+    def test_parse_configuration(self):
+        configuration = parseConfiguration(self.data)
+        self.assertEqual(configuration['refDate'], parseDate(self.data['refDate']))
+        # a curve name appearing twice keeps its last curve, as in the engine
+        expected = {curve['curveName']: parse(**curve) for curve in self.data['curves']}
+        self.assertEqual(list(configuration['curves'].keys()), list(expected.keys()))
+        self.assertEqual(toComparable(configuration['curves']), toComparable(expected))
+        self.assertEqual(configuration['dependencies'], getDependencyList(self.data))
+
+    def test_parse_curve(self):
+        curve = self.data['curves'][0]
+        parsed, dependencies = parseCurve(curve)
+        self.assertEqual(toComparable(parsed), toComparable(parse(**curve)))
+        self.assertEqual(dependencies, getDependencyList({'curves': [curve]})[curve['curveName']])
+
+    def test_index_configuration(self):
+        data = copy.deepcopy(self.data)
+        data['curves'][1]['curveConfig']['rateHelpers'][3]['helperConfig']['tenor'] = '1X'
+        configuration = indexConfiguration(data)
+        self.assertEqual(configuration['refDate'], parseDate(data['refDate']))
+        self.assertIs(configuration['curves']['LIBOR3M'], data['curves'][1])
+        self.assertEqual(configuration['dependencies'], getDependencyList(data))
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseCurve(configuration['curves']['LIBOR3M'], configuration['pointers']['LIBOR3M'])
+        self.assertEqual(context.exception.pointer, '/curves/1/curveConfig/rateHelpers/3/helperConfig/tenor')
+
+        data['curves'][2].pop('curveName')
+        with self.assertRaises(ConfigurationError) as context:
+            indexConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/2/curveName')
+        self.assertRaises(ConfigurationError, indexConfiguration, {'refDate': 'x', 'curves': data['curves']})
+
+    def test_conventions(self):
+        with open(parent_dir + '/../examples/conventions.json', 'r') as f:
+            data = json.load(f)
+        expected = copy.deepcopy(self.data)
+        expected['curves'] = [curve for curve in expected['curves'] if curve['curveName'] in ['SOFR', 'LIBOR3M']]
+        configuration = parseConfiguration(data)
+        self.assertEqual(toComparable(configuration['curves']), toComparable(parseConfiguration(expected)['curves']))
+        self.assertEqual(configuration['dependencies'], getDependencyList(expected))
+
+        # the values of a convention are parsed once and shared
+        rateHelpers = configuration['curves']['SOFR']['curveConfig']['rateHelpers']
+        self.assertIs(rateHelpers[1]['helperConfig']['calendar'], rateHelpers[2]['helperConfig']['calendar'])
+        resolved = resolveConventions(data)
+        self.assertIs(resolveConventions(resolved), resolved)
+        helperConfig = resolved['curves'][0]['curveConfig']['rateHelpers'][1]['helperConfig']
+        self.assertEqual(helperConfig, expected['curves'][0]['curveConfig']['rateHelpers'][1]['helperConfig'])
+        self.assertEqual(pickle.loads(pickle.dumps(helperConfig)), helperConfig)
+
+        # the values given by a rate helper override those of its convention
+        rateHelper = data['curves'][0]['curveConfig']['rateHelpers'][1]
+        rateHelper['helperConfig']['settlementDays'] = 0
+        parsed = parseConfiguration(data)['curves']['SOFR']['curveConfig']['rateHelpers']
+        self.assertEqual(parsed[1]['helperConfig']['settlementDays'], 0)
+        self.assertEqual(parsed[2]['helperConfig']['settlementDays'], 2)
+        rateHelper['helperConfig']['settlementDays'] = 'x'
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/0/curveConfig/rateHelpers/1/helperConfig/settlementDays')
+
+        rateHelper['helperConfig'].pop('settlementDays')
+        data['conventions']['USD-SOFR-OIS']['calendar'] = 'Unknown'
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/conventions/USD-SOFR-OIS/calendar')
+        rateHelper['convention'] = 'Unknown'
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/0/curveConfig/rateHelpers/1/convention')
+
+    def test_template(self):
+        data = copy.deepcopy(self.data)
+        for curve in data['curves']:
+            for rateHelper in curve['curveConfig'].get('rateHelpers', []):
+                for price in rateHelper['marketConfig'].values():
+                    price.setdefault('ticker', 'TICKER')
+                    price.pop('value')
+        self.assertRaises(ConfigurationError, parseConfiguration, data)
+        self.assertEqual(len(parseConfiguration(data, template=True)['curves']),
+                         len(set(curve['curveName'] for curve in data['curves'])))
+
+    def test_error_pointers(self):
+        data = copy.deepcopy(self.data)
+        data['curves'][1]['curveConfig']['rateHelpers'][3]['helperConfig']['tenor'] = '1X'
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/1/curveConfig/rateHelpers/3/helperConfig/tenor')
+        self.assertTrue(str(context.exception).startswith(
+            'Invalid configuration at /curves/1/curveConfig/rateHelpers/3/helperConfig/tenor: '))
+
+        data = copy.deepcopy(self.data)
+        data['curves'][0]['curveIndex']['dayCounter'] = 'Actual999'
+        with self.assertRaises(RateIndexError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/0/curveIndex/dayCounter')
+
+        data = copy.deepcopy(self.data)
+        del data['curves'][2]['curveConfig']['rateHelpers'][0]['marketConfig']
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/2/curveConfig/rateHelpers/0/marketConfig')
+
+        data = copy.deepcopy(self.data)
+        data['curves'][0]['curveConfig']['rateHelpers'][0]['helperType'] = 'Unknown'
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/0/curveConfig/rateHelpers/0')
+
+        data = copy.deepcopy(self.data)
+        data['curves'][0]['curveConfig']['rateHelpers'] = []
+        with self.assertRaises(ConfigurationError) as context:
+            parseConfiguration(data)
+        self.assertEqual(context.exception.pointer, '/curves/0/curveConfig/rateHelpers')
+
+        self.assertRaises(ConfigurationError, parseConfiguration, {'refDate': '2020-13-45x', 'curves': []})
+
+    def test_checks_agree(self):
+        # the configurations rejected by checkConfiguration are rejected as well
+        for path, value in [(['refDate'], 1), (['curves', 0, 'curveName'], 1),
+                            (['curves', 0, 'curveConfig', 'enableExtrapolation'], 'x'),
+                            (['curves', 1, 'curveConfig', 'rateHelpers', 0, 'marketConfig', 'rate'], {})]:
+            data = copy.deepcopy(self.data)
+            target = data
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = value
+            self.assertRaises(ConfigurationError, checkConfiguration, data)
+            self.assertRaises(ConfigurationError, parseConfiguration, data)
+
+    def test_structure_cache(self):
+        cache = StructureCache(maxSize=2)
+        expected = parseConfiguration(self.data, structureCache=False)
+        configuration = parseConfiguration(self.data, structureCache=cache)
+        self.assertEqual(cache.cacheInfo(), {'hits': 0, 'misses': 1, 'maxSize': 2, 'size': 1})
+        self.assertEqual(toComparable(configuration), toComparable(expected))
+
+        # the same structure with other market values, in another key order
+        data = copy.deepcopy(self.data)
+        data = {key: data[key] for key in reversed(list(data.keys()))}
+        price = data['curves'][1]['curveConfig']['rateHelpers'][0]['marketConfig']['rate']
+        price['value'] = 0.07
+        self.assertEqual(getStructureKey(data), getStructureKey(self.data))
+        configuration['curves'].pop('SOFR')
+        configuration['dependencies']['LIBOR3M'].add('OTHER')
+        configuration = parseConfiguration(data, structureCache=cache)
+        self.assertEqual(cache.cacheInfo()['hits'], 1)
+        self.assertIs(configuration['curves']['LIBOR3M']['curveConfig']['rateHelpers'][0]['marketConfig']['rate'],
+                      price)
+        self.assertEqual(toComparable(configuration), toComparable(parseConfiguration(data, structureCache=False)))
+
+        # the market values of a cached structure are checked
+        for value in [float('inf'), float('nan'), '0.07', None]:
+            price['value'] = value
+            with self.assertRaises(RateHelperConfigurationError) as context:
+                parseConfiguration(data, structureCache=cache)
+            self.assertEqual(context.exception.pointer, '/curves/1/curveConfig/rateHelpers/0/marketConfig/rate')
+        price.pop('value')
+        self.assertRaises(RateHelperConfigurationError, parseConfiguration, data, structureCache=cache)
+        self.assertIsNotNone(parseConfiguration(data, template=True, structureCache=cache))
+        self.assertEqual(cache.cacheInfo()['size'], 2)
+
+        data = copy.deepcopy(self.data)
+        data['curves'][1]['curveConfig']['rateHelpers'][3]['helperConfig']['tenor'] = '2Y'
+        self.assertNotEqual(getStructureKey(data), getStructureKey(self.data))
+        self.assertNotEqual(getStructureKey(self.data, template=True), getStructureKey(self.data))
+        parseConfiguration(data, structureCache=cache)
+        self.assertEqual(cache.cacheInfo()['size'], 2)
+        self.assertIsNone(getStructureKey({'refDate': '2023-05-25', 'curves': [1]}))
+        cache.clear()
+        self.assertEqual(cache.cacheInfo()['size'], 0)
+
+    def test_escape_pointer(self):
+        self.assertEqual(escapePointer('a/b~c'), 'a~1b~0c')
+        self.assertEqual(formatPointer(((('', 'curves'), 0), 'x/y')), '/curves/0/x~1y')
+
+
+if __name__ == '__main__':
+    unittest.main()
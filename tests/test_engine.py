@@ -0,0 +1,434 @@
+import sys, os
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+
+import copy
+import json
+import unittest
+import numpy as np
+import numpy.lib.recfunctions
+from curveengine import *
+
+
+def loadConfig(curveNames=('SOFR', 'LIBOR3M', 'CF_CLP_PASIVO')):
+    # a subset of the example curve set, which keeps the tests fast
+    with open(parent_dir + '/../examples/config.json') as f:
+        data = json.load(f)
+    data['curves'] = [c for c in data['curves'] if c['curveName'] in curveNames]
+    return data
+
+
+class TestCurveEngine(unittest.TestCase):
+
+    def test_build(self):
+        engine = CurveEngine(loadConfig())
+        self.assertEqual(set(engine.curves.keys()), {'SOFR', 'LIBOR3M', 'CF_CLP_PASIVO'})
+        self.assertIsInstance(engine.getIndex('SOFR'), ore.OvernightIndex)
+        self.assertIsInstance(engine.getIndex('LIBOR3M'), ore.IborIndex)
+
+    def test_quote_registry(self):
+        engine = CurveEngine(loadConfig())
+        self.assertIn('USOSFR1Z CURNCY', engine.quotes)
+        self.assertIn('CF_CLP_PASIVO_2Y', engine.quotes)
+        self.assertRaises(KeyError, engine.setQuote, 'UNKNOWN', 0.01)
+
+        # a ticker quoted twice in the configuration must have a single value
+        data = loadConfig()
+        rateHelpers = data['curves'][0]['curveConfig']['rateHelpers']
+        rateHelpers[2]['marketConfig']['rate'] = dict(rateHelpers[1]['marketConfig']['rate'], value=0.5)
+        self.assertRaises(ConfigurationError, CurveEngine, data)
+        quotes = {rateHelpers[1]['marketConfig']['rate']['ticker']: ore.SimpleQuote(0.5)}
+        self.assertIsNotNone(CurveEngine(loadConfig(), quotes=quotes))
+
+    def test_set_quote(self):
+        engine = CurveEngine(loadConfig())
+        date = ore.Date(14, 2, 2033)
+        sofr = engine.getCurve('SOFR').discount(date)
+        libor = engine.getCurve('LIBOR3M').discount(date)
+        bond = engine.getCurve('CF_CLP_PASIVO').discount(date)
+
+        engine.setQuote('USOSFR10 CURNCY', engine.getQuote('USOSFR10 CURNCY').value() + 0.01)
+        engine.setQuote('CF_CLP_PASIVO_10Y', engine.getQuote('CF_CLP_PASIVO_10Y').value() + 0.01)
+        self.assertLess(engine.getCurve('SOFR').discount(date), sofr)
+        self.assertNotEqual(engine.getCurve('LIBOR3M').discount(date), libor)
+        self.assertLess(engine.getCurve('CF_CLP_PASIVO').discount(date), bond)
+
+    def test_set_quote_matches_rebuild(self):
+        engine = CurveEngine(loadConfig())
+        engine.setQuote('USOSFR5 CURNCY', 0.04)
+
+        data = loadConfig()
+        for helper in data['curves'][0]['curveConfig']['rateHelpers']:
+            if helper['marketConfig']['rate']['ticker'] == 'USOSFR5 CURNCY':
+                helper['marketConfig']['rate']['value'] = 0.04
+        rebuilt = CurveEngine(data)
+        date = ore.Date(14, 2, 2030)
+        self.assertAlmostEqual(engine.getCurve('LIBOR3M').discount(date),
+                               rebuilt.getCurve('LIBOR3M').discount(date), places=12)
+
+    def test_apply_market(self):
+        engine = CurveEngine(loadConfig())
+        date = ore.Date(14, 2, 2030)
+        for curve in engine.curves.values():
+            curve.discount(date)
+        market = {'USOSFR5 CURNCY': 0.04, 'USOSFR7 CURNCY': 0.039, 'CF_CLP_PASIVO_5Y': 0.05}
+        invalidated = engine.applyMarket(market)
+        self.assertEqual(invalidated, ['SOFR', 'CF_CLP_PASIVO', 'LIBOR3M'])
+        self.assertEqual(engine.getQuote('USOSFR5 CURNCY').value(), 0.04)
+
+        expected = CurveEngine(loadConfig())
+        for ticker, value in market.items():
+            expected.setQuote(ticker, value)
+        for curveName in ['SOFR', 'LIBOR3M', 'CF_CLP_PASIVO']:
+            self.assertAlmostEqual(engine.getCurve(curveName).discount(date),
+                                   expected.getCurve(curveName).discount(date), places=10)
+
+        self.assertEqual(engine.applyMarket(market), [])
+        self.assertRaises(KeyError, engine.applyMarket, {'UNKNOWN': 0.01, 'USOSFR5 CURNCY': 0.03})
+        self.assertEqual(engine.getQuote('USOSFR5 CURNCY').value(), 0.04)
+
+    def test_dependency_graph(self):
+        engine = CurveEngine(loadConfig())
+        self.assertEqual(engine.dependencies,
+                         {'SOFR': set(), 'LIBOR3M': {'SOFR'}, 'CF_CLP_PASIVO': set()})
+        self.assertEqual(engine.dependents['SOFR'], {'LIBOR3M'})
+        self.assertEqual(engine.sortedCurves, ['SOFR', 'CF_CLP_PASIVO', 'LIBOR3M'])
+
+    def test_update(self):
+        engine = CurveEngine(loadConfig())
+        date = ore.Date(14, 2, 2030)
+        self.assertEqual(engine.update(market={'CF_CLP_PASIVO_5Y': 0.05}), ['CF_CLP_PASIVO'])
+        self.assertEqual(engine.update(market={'USOSFR5 CURNCY': 0.04}), ['SOFR', 'LIBOR3M'])
+        self.assertEqual(engine.update(market={'USOSFR5 CURNCY': 0.04}), [])
+
+        sofr = copy.deepcopy(engine.curveConfigs['SOFR'])
+        for helper in sofr['curveConfig']['rateHelpers']:
+            if helper['marketConfig']['rate']['ticker'] == 'USOSFR10 CURNCY':
+                helper['marketConfig']['rate']['value'] = 0.04
+        libor = engine.getCurve('LIBOR3M').discount(date)
+        self.assertEqual(engine.update(curves=[sofr]), ['SOFR', 'LIBOR3M'])
+        self.assertEqual(engine.getQuote('USOSFR10 CURNCY').value(), 0.04)
+        self.assertNotEqual(engine.getCurve('LIBOR3M').discount(date), libor)
+        self.assertRaises(KeyError, engine.update, curves=[dict(sofr, curveName='UNKNOWN')])
+
+    def test_template(self):
+        data = loadConfig()
+        market = {}
+        for curve in data['curves']:
+            for helper in curve['curveConfig']['rateHelpers']:
+                for price in helper['marketConfig'].values():
+                    market[price['ticker']] = price.pop('value')
+        self.assertRaises(ConfigurationError, CurveEngine, copy.deepcopy(data))
+
+        engine = CurveEngine(data, template=True)
+        self.assertEqual(engine.curves, {})
+        value = market.pop('USOSFR5 CURNCY')
+        report = engine.bindMarket(market)
+        self.assertEqual(report['invalidated'], ['SOFR', 'CF_CLP_PASIVO', 'LIBOR3M'])
+        self.assertEqual(report['missing'], ['USOSFR5 CURNCY'])
+        self.assertIn('SPREAD_SOFR_1W', report['unused'])
+
+        report = engine.bindMarket({'USOSFR5 CURNCY': value, 'UNKNOWN': 1.0})
+        self.assertEqual(report, {'invalidated': ['SOFR', 'LIBOR3M'], 'missing': [], 'unused': ['UNKNOWN']})
+        expected = CurveEngine(loadConfig())
+        date = ore.Date(14, 2, 2030)
+        for curveName in ['SOFR', 'LIBOR3M', 'CF_CLP_PASIVO']:
+            self.assertAlmostEqual(engine.getCurve(curveName).discount(date),
+                                   expected.getCurve(curveName).discount(date), places=12)
+
+    def test_build_many(self):
+        data = loadConfig()
+        shifted = {'USOSFR5 CURNCY': 0.04, 'CF_CLP_PASIVO_5Y': 0.05}
+        results = CurveEngine.buildMany(data, [{}, shifted, {}])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(list(results[0].keys()), ['SOFR', 'CF_CLP_PASIVO', 'LIBOR3M'])
+
+        expected = CurveEngine(loadConfig())
+        for curveName, nodes in results[0].items():
+            self.assertEqual(nodes, list(expected.getCurve(curveName).nodes()))
+        expected.applyMarket(shifted)
+        for curveName, nodes in results[1].items():
+            for (date, value), (expectedDate, expectedValue) in zip(nodes, expected.getCurve(curveName).nodes()):
+                self.assertEqual(date, expectedDate)
+                self.assertAlmostEqual(value, expectedValue, places=12)
+        for curveName, nodes in results[2].items():
+            for (date, value), (expectedDate, expectedValue) in zip(nodes, results[0][curveName]):
+                self.assertAlmostEqual(value, expectedValue, places=12)
+
+        for helper in data['curves'][0]['curveConfig']['rateHelpers']:
+            helper['marketConfig']['rate'].pop('value')
+        self.assertRaises(MarketConfigurationError, CurveEngine.buildMany, data, [shifted])
+
+    def test_parallel(self):
+        with CurveEngine(loadConfig(), parallel=True, maxWorkers=2) as engine:
+            expected = CurveEngine(loadConfig())
+            date = ore.Date(14, 2, 2030)
+            for curveName in ['SOFR', 'LIBOR3M', 'CF_CLP_PASIVO']:
+                self.assertIsInstance(engine.getCurve(curveName), ore.DiscountCurve)
+                self.assertEqual(engine.getCurve(curveName).discount(date),
+                                 expected.getCurve(curveName).discount(date))
+            self.assertEqual(engine.quotes, {})
+
+            # the updated curves are bootstrapped by the same workers
+            sofr = copy.deepcopy(engine.curveConfigs['SOFR'])
+            for helper in sofr['curveConfig']['rateHelpers']:
+                if helper['marketConfig']['rate']['ticker'] == 'USOSFR5 CURNCY':
+                    helper['marketConfig']['rate']['value'] = 0.04
+            self.assertEqual(engine.update(curves=[sofr]), ['SOFR', 'LIBOR3M'])
+            self.assertIsInstance(engine.getCurve('SOFR'), ore.DiscountCurve)
+            self.assertIsInstance(engine.getCurve('LIBOR3M'), ore.DiscountCurve)
+            expected.setQuote('USOSFR5 CURNCY', 0.04)
+            self.assertAlmostEqual(engine.getCurve('LIBOR3M').discount(date),
+                                   expected.getCurve('LIBOR3M').discount(date), places=12)
+
+        engine.close()
+        self.assertEqual(engine.update(curves=[engine.curveConfigs['SOFR']]), ['SOFR', 'LIBOR3M'])
+        engine.close()
+
+    def test_build_cache(self):
+        cache = BuildCache()
+        engine = CurveEngine(loadConfig(), buildCache=cache)
+        self.assertEqual(cache.cacheInfo()['size'], 3)
+        self.assertEqual(engine.nodeCurves, set())
+
+        cached = CurveEngine(loadConfig(), buildCache=cache)
+        self.assertEqual(cache.cacheInfo()['hits'], 3)
+        self.assertEqual(cached.curveHashes, engine.curveHashes)
+        self.assertEqual(cached.nodeCurves, {'SOFR', 'LIBOR3M', 'CF_CLP_PASIVO'})
+        date = ore.Date(14, 2, 2030)
+        for curveName in ['SOFR', 'LIBOR3M', 'CF_CLP_PASIVO']:
+            self.assertIsInstance(cached.getCurve(curveName), ore.DiscountCurve)
+            self.assertAlmostEqual(cached.getCurve(curveName).discount(date),
+                                   engine.getCurve(curveName).discount(date), places=12)
+
+        # only the changed curve and the ones downstream are bootstrapped
+        data = loadConfig()
+        data['curves'][1]['curveConfig']['rateHelpers'][0]['marketConfig']['rate']['value'] += 0.001  # LIBOR3M
+        changed = CurveEngine(data, buildCache=cache)
+        self.assertEqual(changed.nodeCurves, {'SOFR', 'CF_CLP_PASIVO'})
+
+        # a curve built from the cache is bootstrapped when its quotes change
+        self.assertEqual(cached.getQuote('USOSFR5 CURNCY').value(), engine.getQuote('USOSFR5 CURNCY').value())
+        cached.setQuote('USOSFR5 CURNCY', 0.04)
+        engine.setQuote('USOSFR5 CURNCY', 0.04)
+        self.assertIsInstance(cached.getCurve('SOFR'), ore.PiecewiseLogLinearDiscount)
+        self.assertEqual(cached.nodeCurves, {'CF_CLP_PASIVO'})
+        for curveName in ['SOFR', 'LIBOR3M']:
+            self.assertAlmostEqual(cached.getCurve(curveName).discount(date),
+                                   engine.getCurve(curveName).discount(date), places=12)
+
+    def test_lazy(self):
+        data = loadConfig()
+        data['curves'].append({'curveName': 'BROKEN', 'curveConfig': {'curveType': 'Unknown'}, 'curveIndex': {}})
+        engine = CurveEngine(data, lazy=True)
+        self.assertEqual(engine.curves, {})
+        self.assertEqual(engine.parsedCurves, {})
+        self.assertEqual(engine.dependencies['LIBOR3M'], {'SOFR'})
+
+        # only the requested curve and the ones upstream are built
+        expected = CurveEngine(loadConfig())
+        date = ore.Date(14, 2, 2030)
+        self.assertEqual(engine.getCurve('LIBOR3M').discount(date), expected.getCurve('LIBOR3M').discount(date))
+        self.assertEqual(set(engine.curves.keys()), {'SOFR', 'LIBOR3M'})
+        self.assertIs(engine.getCurve('LIBOR3M'), engine.curves['LIBOR3M'])
+
+        # setting a quote of a curve not built yet builds it
+        value = expected.getQuote('CF_CLP_PASIVO_2Y').value() + 0.001
+        expected.setQuote('CF_CLP_PASIVO_2Y', value)
+        engine.setQuote('CF_CLP_PASIVO_2Y', value)
+        self.assertEqual(engine.discounts('CF_CLP_PASIVO', [date.serialNumber()])[0],
+                         expected.getCurve('CF_CLP_PASIVO').discount(date))
+        self.assertRaises(KeyError, engine.setQuote, 'UNKNOWN', 0.01)
+
+        self.assertRaises(ConfigurationError, engine.getCurve, 'BROKEN')
+        self.assertRaises(ConfigurationError, CurveEngine, {'refDate': '2023-02-14', 'curves': [{}]}, lazy=True)
+        self.assertRaises(ValueError, CurveEngine, data, template=True, lazy=True)
+
+    def test_conventions(self):
+        with open(parent_dir + '/../examples/conventions.json') as f:
+            data = json.load(f)
+        expected = CurveEngine(loadConfig(['SOFR', 'LIBOR3M']))
+        date = ore.Date(14, 2, 2030)
+        for engine in [CurveEngine(data), CurveEngine(data, lazy=True)]:
+            self.assertEqual(engine.getCurve('LIBOR3M').discount(date), expected.getCurve('LIBOR3M').discount(date))
+
+        # updated curves may reference the conventions
+        sofr = copy.deepcopy(data['curves'][0])
+        for rateHelper in sofr['curveConfig']['rateHelpers']:
+            if rateHelper['marketConfig']['rate']['ticker'] == 'USOSFR5 CURNCY':
+                rateHelper['marketConfig']['rate']['value'] = 0.04
+        self.assertEqual(engine.update(curves=[sofr]), ['SOFR', 'LIBOR3M'])
+        expected.setQuote('USOSFR5 CURNCY', 0.04)
+        self.assertEqual(engine.getCurve('LIBOR3M').discount(date), expected.getCurve('LIBOR3M').discount(date))
+
+    def test_evaluation_date_isolation(self):
+        settings = ore.Settings.instance()
+        previous = settings.evaluationDate
+        first = CurveEngine(loadConfig())
+        self.assertEqual(settings.evaluationDate, previous)
+
+        date = ore.Date(14, 2, 2030)
+        discounts = {curveName: first.getCurve(curveName).discount(date)
+                     for curveName in first.sortedCurves}
+        data = loadConfig()
+        data['refDate'] = '2023-06-26'
+        second = CurveEngine(data)
+        second.setQuote('USOSFR5 CURNCY', 0.04)
+        self.assertEqual(settings.evaluationDate, previous)
+
+        for curveName in first.sortedCurves:
+            self.assertEqual(first.getCurve(curveName).referenceDate(), first.refDate)
+            self.assertEqual(second.getCurve(curveName).referenceDate(), second.refDate)
+            self.assertEqual(first.getCurve(curveName).discount(date), discounts[curveName])
+            self.assertNotEqual(second.getCurve(curveName).discount(date), discounts[curveName])
+
+        first.setQuote('USOSFR5 CURNCY', 0.04)
+        expected = CurveEngine(loadConfig())
+        expected.setQuote('USOSFR5 CURNCY', 0.04)
+        self.assertEqual(first.getCurve('LIBOR3M').discount(date),
+                         expected.getCurve('LIBOR3M').discount(date))
+        with first.scope():
+            self.assertEqual(settings.evaluationDate, first.refDate)
+        self.assertEqual(settings.evaluationDate, previous)
+
+    def test_vectorized_queries(self):
+        engine = CurveEngine(loadConfig())
+        serials = np.arange(engine.refDate.serialNumber(), engine.refDate.serialNumber() + 365 * 30, 11)
+        dayCounter = ore.Thirty360(ore.Thirty360.BondBasis)
+        for curveName in engine.sortedCurves:
+            curve = engine.getCurve(curveName)
+            dates = [ore.Date(int(serial)) for serial in serials]
+            with engine.scope():
+                discounts = [curve.discount(date) for date in dates]
+                zeroRates = [curve.zeroRate(date, dayCounter, ore.Compounded, ore.Semiannual).rate()
+                             for date in dates]
+                forwardRates = [curve.forwardRate(date, date + 90, ore.Actual360(), ore.Simple).rate()
+                                for date in dates]
+            np.testing.assert_allclose(engine.discounts(curveName, serials), discounts, rtol=1e-15)
+            np.testing.assert_allclose(
+                engine.zeroRates(curveName, serials, dayCounter, ore.Compounded, ore.Semiannual),
+                zeroRates, rtol=0, atol=1e-14)
+            np.testing.assert_allclose(
+                engine.forwardRates(curveName, serials, serials + 90, ore.Actual360(), ore.Simple),
+                forwardRates, rtol=0, atol=1e-14)
+
+        datetimes = toDatetimes(serials[:10])
+        self.assertEqual(engine.discounts('SOFR', datetimes).tolist(),
+                         engine.discounts('SOFR', serials[:10]).tolist())
+        self.assertRaises(ValueError, engine.forwardRates, 'SOFR', serials[1:], serials[:-1])
+        self.assertRaises(KeyError, engine.discounts, 'UNKNOWN', serials)
+
+        # the snapshots are kept until the curves change
+        snapshots = engine.snapshot()
+        self.assertIs(engine.snapshot(['SOFR'])['SOFR'], snapshots['SOFR'])
+        discounts = engine.discounts('LIBOR3M', serials)
+        engine.applyMarket({'USOSFR5 CURNCY': 0.04})
+        self.assertIsNot(engine.snapshot(['SOFR'])['SOFR'], snapshots['SOFR'])
+        self.assertIs(engine.snapshot(['CF_CLP_PASIVO'])['CF_CLP_PASIVO'], snapshots['CF_CLP_PASIVO'])
+        self.assertFalse(np.array_equal(engine.discounts('LIBOR3M', serials), discounts))
+        with engine.scope():
+            np.testing.assert_allclose(engine.discounts('LIBOR3M', serials[:5]),
+                                       [engine.getCurve('LIBOR3M').discount(ore.Date(int(serial)))
+                                        for serial in serials[:5]], rtol=1e-15)
+        engine.update(curves=[engine.curveConfigs['CF_CLP_PASIVO']])
+        self.assertIsNot(engine.snapshot(['CF_CLP_PASIVO'])['CF_CLP_PASIVO'], snapshots['CF_CLP_PASIVO'])
+
+    def test_index_projection(self):
+        engine = CurveEngine(loadConfig())
+        refDate = engine.refDate.serialNumber()
+        for indexName in ['LIBOR3M', 'SOFR']:
+            index = engine.getIndex(indexName)
+            fixingDates = [serial for serial in range(refDate, refDate + 3650, 5)
+                           if index.isValidFixingDate(ore.Date(serial))]
+            with engine.scope():
+                expected = [index.fixing(ore.Date(serial)) for serial in fixingDates]
+            np.testing.assert_allclose(engine.indexForwards(indexName, fixingDates), expected, rtol=0, atol=1e-12)
+        self.assertRaises(ValueError, engine.indexForwards, 'LIBOR3M', [refDate - 1])
+
+        index = engine.getIndex('SOFR')
+        startDates = np.arange(refDate, refDate + 3650, 29)
+        endDates = startDates + 91
+        with engine.scope():
+            expected = [ore.OvernightIndexedCoupon(ore.Date(int(end)), 1.0, ore.Date(int(start)),
+                                                   ore.Date(int(end)), index).rate()
+                        for start, end in zip(startDates, endDates)]
+        np.testing.assert_allclose(engine.compoundedRates('SOFR', startDates, endDates), expected,
+                                   rtol=0, atol=1e-14)
+        self.assertRaises(ValueError, engine.compoundedRates, 'SOFR', endDates, startDates)
+
+    def test_query_cache(self):
+        engine = CurveEngine(loadConfig(), cacheSize=16)
+        date = ore.Date(14, 2, 2030)
+        curve = engine.getCachedCurve('LIBOR3M')
+        self.assertIs(engine.getCachedCurve('LIBOR3M'), curve)
+        self.assertIs(engine.getCurve('LIBOR3M'), engine.curves['LIBOR3M'])
+        discount = curve.discount(date)
+        self.assertEqual(curve.discount(date), discount)
+        self.assertEqual(engine.cacheInfo()['LIBOR3M'], {'hits': 1, 'misses': 1, 'maxSize': 16, 'size': 1})
+
+        engine.setQuote('USOSFR5 CURNCY', 0.04)
+        self.assertEqual(curve.cacheInfo()['size'], 0)
+        self.assertEqual(curve.discount(date), engine.curves['LIBOR3M'].discount(date))
+        self.assertNotEqual(curve.discount(date), discount)
+
+        libor = copy.deepcopy(engine.curveConfigs['LIBOR3M'])
+        libor['curveConfig']['rateHelpers'] = libor['curveConfig']['rateHelpers'][:-1]
+        engine.update(curves=[libor])
+        self.assertIs(curve.curve, engine.curves['LIBOR3M'])
+        self.assertEqual(curve.cacheInfo()['size'], 0)
+        self.assertIsInstance(engine.getCurve('SOFR'), ore.PiecewiseLogLinearDiscount)
+        self.assertEqual(CurveEngine(loadConfig()).getCachedCurve('SOFR').maxSize, 1024)
+
+    def test_pv(self):
+        data = loadConfig(('SOFR', 'CLP_COLLUSD', 'CF_CLP_PASIVO'))
+        for curve in data['curves']:
+            if curve['curveName'] == 'CLP_COLLUSD':
+                curve['curveConfig']['rateHelpers'] = [helper for helper in curve['curveConfig']['rateHelpers']
+                                                       if helper['helperType'] == 'FxSwap']
+        engine = CurveEngine(data)
+        self.assertEqual(engine.getFxRates(), {('USD', 'CLP'): 808.51})
+        refDate = engine.refDate.serialNumber()
+        cashflows = {
+            'date': np.array([refDate + 30, refDate + 400, refDate + 800, refDate + 90]),
+            'amount': np.array([100.0, -50.0, 1000.0, 10.0]),
+            'curveName': np.array(['SOFR', 'SOFR', 'CF_CLP_PASIVO', 'CLP_COLLUSD'])
+        }
+        expected = [amount * engine.getCurve(curveName).discount(ore.Date(int(date)))
+                    for date, amount, curveName in zip(*cashflows.values())]
+        result = engine.pv(cashflows)
+        np.testing.assert_allclose(result['pv'], expected, rtol=1e-15)
+        self.assertIsNone(result['total'])
+        self.assertAlmostEqual(result['byCurrency']['USD'], expected[0] + expected[1], places=10)
+        self.assertAlmostEqual(result['byCurve']['CF_CLP_PASIVO'], expected[2], places=10)
+
+        result = engine.pv(cashflows, currency='CLP')
+        self.assertAlmostEqual(result['pv'][0], expected[0] * 808.51, places=8)
+        self.assertAlmostEqual(result['total'], (expected[0] + expected[1]) * 808.51 + expected[2] + expected[3],
+                               places=8)
+        engine.setQuote('CLP CURNCY', 900.0)
+        self.assertAlmostEqual(engine.pv(cashflows, currency='USD')['pv'][2], expected[2] / 900.0, places=10)
+
+        table = np.array(list(zip(*cashflows.values())),
+                         dtype=[('date', 'i8'), ('amount', 'f8'), ('curveName', 'U16')])
+        table = np.lib.recfunctions.append_fields(table, 'currency', ['USD', 'USD', 'CLP', 'CLF'], usemask=False)
+        result = engine.pv(table, currency='CLP', fxRates={('CLF', 'CLP'): 36000.0})
+        self.assertAlmostEqual(result['pv'][3], engine.pv(cashflows)['pv'][3] * 36000.0, places=8)
+        self.assertRaises(KeyError, engine.pv, {'date': [refDate], 'amount': [1.0]})
+        self.assertRaises(KeyError, engine.pv, cashflows, currency='EUR')
+
+    def test_discount_grid(self):
+        engine = CurveEngine(loadConfig(), gridBudget=8 * 20000)
+        grid = engine.getDiscountGrid('SOFR')
+        self.assertIs(engine.getDiscountGrid('SOFR'), grid)
+        serials = np.arange(engine.refDate.serialNumber(), engine.refDate.serialNumber() + 365 * 60, 3)
+        np.testing.assert_array_equal(grid.discounts(serials), engine.discounts('SOFR', serials))
+
+        engine.setQuote('USOSFR5 CURNCY', 0.04)
+        np.testing.assert_array_equal(grid.discounts(serials), engine.discounts('SOFR', serials))
+        self.assertEqual(grid.rebuilds, 2)
+        self.assertEqual(engine.getDiscountGrid('LIBOR3M', '10Y').days, 20000 - grid.days)
+        self.assertRaises(MemoryError, engine.getDiscountGrid, 'CF_CLP_PASIVO')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import copy
+import json
+import tempfile
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+from curveengine import *
+
+
+class TestLoader(unittest.TestCase):
+    def setUp(self):
+        with open(parent_dir + '/../examples/config.json', 'r') as f:
+            self.data = json.load(f)
+        # non-ASCII text, so byte offsets and character positions differ
+        self.data['description'] = 'curvas en pesos — año'
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'config.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data, **kwargs):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **kwargs)
+        return self.path
+
+    def test_index(self):
+        curveSet = CurveSetFile(self.write(self.data, indent=2), chunkSize=1024)
+        expected = {curve['curveName']: curve for curve in self.data['curves']}
+        self.assertEqual(list(curveSet.keys()), list(expected.keys()))
+        self.assertEqual(curveSet.loaded, {})
+        self.assertEqual(curveSet['LIBOR3M'], expected['LIBOR3M'])
+        self.assertEqual(list(curveSet.loaded.keys()), ['LIBOR3M'])
+        self.assertEqual(curveSet.load(), {**self.data, 'curves': list(expected.values())})
+
+        configuration = curveSet.getConfiguration()
+        self.assertEqual(configuration['refDate'], parseDate(self.data['refDate']))
+        self.assertEqual(configuration['dependencies'], getDependencyList(self.data))
+        self.assertEqual(configuration['tickers']['SOFR'], getTickers(expected['SOFR']))
+        self.assertEqual(CurveSetFile(self.write(self.data)).offsets.keys(), curveSet.offsets.keys())
+
+    def test_errors(self):
+        data = copy.deepcopy(self.data)
+        data['curves'][1]['curveConfig']['rateHelpers'][3]['helperConfig']['tenor'] = '1X'
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            CurveSetFile(self.write(data))
+        self.assertEqual(context.exception.pointer, '/curves/1/curveConfig/rateHelpers/3/helperConfig/tenor')
+        self.assertEqual(len(CurveSetFile(self.path, validate=False)), len(CurveSetFile(self.write(self.data))))
+
+        data['curves'] = []
+        self.assertRaises(ConfigurationError, CurveSetFile, self.write(data))
+        data.pop('curves')
+        self.assertRaises(ConfigurationError, CurveSetFile, self.write(data))
+        with open(self.path, 'w') as f:
+            f.write('{"refDate": "2023-02-14", "curves": [{"curveName": "SOFR"} {}]}')
+        self.assertRaises(ConfigurationError, CurveSetFile, self.path, validate=False)
+
+    def test_conventions(self):
+        with open(parent_dir + '/../examples/conventions.json', 'r') as f:
+            data = json.load(f)
+        curveSet = CurveSetFile(self.write(data), chunkSize=1024)
+        resolved = resolveConventions(data)
+        self.assertEqual(curveSet['SOFR'], resolved['curves'][0])
+        self.assertEqual(curveSet.getConfiguration()['dependencies'], getDependencyList(resolved))
+
+        # the conventions must be read before the curves that reference them
+        self.write({'refDate': data['refDate'], 'curves': data['curves'], 'conventions': data['conventions']})
+        self.assertRaises(ConfigurationError, CurveSetFile, self.path)
+
+    def test_engine(self):
+        data = copy.deepcopy(self.data)
+        data['curves'] = [curve for curve in data['curves'] if curve['curveName'] in ['SOFR', 'LIBOR3M', 'ICP']]
+        self.write(data)
+        curveSet = CurveSetFile(self.path, validate=False)
+        engine = CurveEngine(curveSet, lazy=True)
+        expected = CurveEngine(CurveSetFile(self.path))
+        date = ore.Date(14, 2, 2030)
+        self.assertEqual(engine.getCurve('LIBOR3M').discount(date), expected.getCurve('LIBOR3M').discount(date))
+        self.assertEqual(set(curveSet.loaded.keys()), {'SOFR', 'LIBOR3M'})
+
+
+if __name__ == '__main__':
+    unittest.main()
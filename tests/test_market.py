@@ -0,0 +1,42 @@
+import sys, os
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+
+import json
+import tempfile
+import unittest
+from curveengine import *
+
+
+class TestMarket(unittest.TestCase):
+
+    def test_read_quote_table(self):
+        expected = {'A': 0.01, 'B': 2.0}
+        self.assertEqual(readQuoteTable({'A': 0.01, 'B': 2}), expected)
+        self.assertEqual(readQuoteTable((['A', 'B'], [0.01, 2])), expected)
+        self.assertEqual(readQuoteTable({'ticker': ['A', 'B'], 'value': [0.01, 2]}), expected)
+        self.assertRaises(MarketConfigurationError, readQuoteTable, {'A': 'x'})
+        self.assertRaises(MarketConfigurationError, readQuoteTable, {'A': float('nan')})
+        self.assertRaises(MarketConfigurationError, readQuoteTable, 1.0)
+
+    def test_read_quote_files(self):
+        expected = {'A': 0.01, 'B': 2.0}
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'quotes.csv')
+            with open(path, 'w') as f:
+                f.write('ticker,value\nA,0.01\nB,2\n')
+            self.assertEqual(readQuoteTable(path), expected)
+
+            path = os.path.join(folder, 'quotes.json')
+            with open(path, 'w') as f:
+                json.dump({'A': 0.01, 'B': 2}, f)
+            self.assertEqual(readQuoteTable(path), expected)
+
+            path = os.path.join(folder, 'quotes.txt')
+            with open(path, 'w') as f:
+                f.write('A 0.01')
+            self.assertRaises(MarketConfigurationError, readQuoteTable, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
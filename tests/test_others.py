@@ -2,6 +2,7 @@ import sys, os
 parent_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(parent_dir + '/../src')
 
+import json
 import unittest
 from curveengine import *
 
@@ -138,3 +139,94 @@ class TestCreateOvernightIndex(unittest.TestCase):
         expected_sort = ["d", "b", "e", "c", "a"]
 
         self.assertEqual(topologicalSort(dependencies), expected_sort)
+
+    def test_getDependentsList(self):
+        dependencies = {
+            "a": {"a", "b", "c"},
+            "b": {"d"},
+            "c": {"d"},
+            "d": set()
+        }
+        expected_dependents = {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+        self.assertEqual(getDependentsList(dependencies), expected_dependents)
+
+    def test_getDownstreamCurves(self):
+        dependents = {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}, "e": set()}
+        self.assertEqual(getDownstreamCurves(dependents, ["d"]), {"a", "b", "c", "d"})
+        self.assertEqual(getDownstreamCurves(dependents, ["c", "e"]), {"a", "c", "e"})
+        self.assertEqual(getDownstreamCurves(dependents, []), set())
+
+    def test_getMarketQuotes(self):
+        curve = {
+            "curveName": "SOFR",
+            "curveConfig": {
+                "curveType": "Piecewise",
+                "rateHelpers": [
+                    {"marketConfig": {"rate": {"value": 0.01, "ticker": "A"}}},
+                    {"marketConfig": {"rate": {"value": 0.02}, "spread": {"value": 0.0, "ticker": "B"}}}
+                ]
+            }
+        }
+        self.assertEqual(getMarketQuotes(curve), {"A": 0.01, "B": 0.0})
+
+    def test_bindMarketValues(self):
+        curve = {
+            "curveName": "SOFR",
+            "curveConfig": {
+                "curveType": "Piecewise",
+                "rateHelpers": [
+                    {"marketConfig": {"rate": {"ticker": "A"}}},
+                    {"marketConfig": {"rate": {"value": 0.02, "ticker": "B"}}}
+                ]
+            }
+        }
+        bound = bindMarketValues(curve, {"A": 0.01, "C": 0.03})
+        self.assertEqual(getMarketQuotes(bound), {"A": 0.01, "B": 0.02})
+        self.assertEqual(curve["curveConfig"]["rateHelpers"][0]["marketConfig"]["rate"], {"ticker": "A"})
+
+    def test_getDependencyLevels(self):
+        dependencies = {
+            "a": {"a", "b", "c"},
+            "b": {"d"},
+            "c": {"d", "e"},
+            "d": set(),
+            "e": {"d"},
+            "f": {"x"}
+        }
+        expected_levels = [["d"], ["b", "e"], ["c"], ["a"]]
+        self.assertEqual(getDependencyLevels(dependencies), expected_levels)
+
+
+class TestEvaluationDateScope(unittest.TestCase):
+
+    def test_evaluationDateScope(self):
+        settings = ore.Settings.instance()
+        previous = settings.evaluationDate
+        date = ore.Date(25, 5, 2023)
+        with evaluationDateScope(date) as scoped:
+            self.assertEqual(scoped, date)
+            self.assertEqual(settings.evaluationDate, date)
+        self.assertEqual(settings.evaluationDate, previous)
+
+        with self.assertRaises(ValueError):
+            with evaluationDateScope(date):
+                raise ValueError()
+        self.assertEqual(settings.evaluationDate, previous)
+
+
+class TestFx(unittest.TestCase):
+
+    def test_getFxPairs(self):
+        with open(parent_dir + '/../examples/config.json') as f:
+            data = json.load(f)
+        pairs = getFxPairs(data)
+        self.assertEqual(pairs[('USD', 'CLP')], {"value": 808.51, "ticker": "CLP CURNCY"})
+        self.assertEqual(pairs[('CLF', 'CLP')], {"value": 36012, "ticker": "CLUFUF INDEX"})
+
+    def test_getFxRate(self):
+        rates = {('USD', 'CLP'): 800.0, ('CLF', 'CLP'): 36000.0}
+        self.assertEqual(getFxRate(rates, 'USD', 'CLP'), 800.0)
+        self.assertEqual(getFxRate(rates, 'CLP', 'USD'), 1 / 800.0)
+        self.assertAlmostEqual(getFxRate(rates, 'CLF', 'USD'), 45.0)
+        self.assertEqual(getFxRate(rates, 'USD', 'USD'), 1.0)
+        self.assertRaises(KeyError, getFxRate, rates, 'USD', 'EUR')
@@ -104,6 +104,30 @@ class TestParsing(unittest.TestCase):
         with self.assertRaises(Exception):
             parsePeriod('unknown')
 
+    def test_intern_tables(self):
+        clearInternTables()
+        self.assertIs(parseDate('2019-01-01'), parseDate('2019-01-01T00:00:00'))
+        self.assertIs(parsePeriod('2W'), parsePeriod('2W'))
+        self.assertIs(parseDayCounter('Actual360'), parseDayCounter('Actual360'))
+        self.assertEqual(getInternStats()['parseDate'],
+                         {'hits': 1, 'misses': 1, 'hitRate': 0.5, 'maxSize': 4096, 'size': 1})
+
+        # today is parsed on every call, so it follows the system date
+        parseDate('today')
+        self.assertEqual(getInternStats()['parseDate']['size'], 1)
+        with self.assertRaises(Exception):
+            parsePeriod('unknown')
+        self.assertEqual(getInternStats()['parsePeriod']['size'], 1)
+
+        table = InternTable(lambda value: [value], maxSize=2)
+        first = table(1)
+        table(2)
+        self.assertIs(table(1), first)
+        table(3)
+        self.assertEqual(table.cacheInfo()['size'], 2)
+        self.assertIsNot(table(1), first)
+        self.assertEqual(table([1]), [[1]])
+
     def test_parse_currency(self):
         self.assertIsInstance(parseCurrency('USD'), ore.USDCurrency)
         self.assertIsInstance(parseCurrency('EUR'), ore.EURCurrency)
@@ -0,0 +1,80 @@
+import sys, os
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+
+import unittest
+import numpy as np
+from curveengine import *
+
+
+class TestQueries(unittest.TestCase):
+
+    def test_toSerials(self):
+        expected = ore.Date(25, 5, 2023).serialNumber()
+        self.assertEqual(toSerials(ore.Date(25, 5, 2023)), expected)
+        self.assertEqual(toSerials(np.datetime64('2023-05-25')), expected)
+        self.assertEqual(toSerials(['2023-05-25']).tolist(), [expected])
+        self.assertEqual(toSerials([ore.Date(25, 5, 2023)]).tolist(), [expected])
+        self.assertEqual(toSerials(np.array([[expected]], dtype=float)).shape, (1, 1))
+        self.assertRaises(ValueError, toSerials, [expected + 0.5])
+        self.assertEqual(toDatetimes(expected), np.datetime64('2023-05-25'))
+
+    def test_yearFractions(self):
+        start = np.arange(45000, 46500, 3)
+        end = start[::-1] + 400
+        for dayCounter in [ore.Actual360(), ore.Actual365Fixed(), ore.Thirty360(ore.Thirty360.BondBasis),
+                           ore.ActualActual(ore.ActualActual.ISDA)]:
+            expected = [dayCounter.yearFraction(ore.Date(int(s)), ore.Date(int(e))) for s, e in zip(start, end)]
+            self.assertEqual(yearFractions(dayCounter, start, end).tolist(), expected)
+        self.assertEqual(yearFractions('Actual/360', 45000, 45360), 1.0)
+        self.assertRaises(NotImplementedError, yearFractions, 'Actual/Actual (ISDA)', 45000, 45360)
+
+    def test_impliedRates(self):
+        compound = np.array([1.0, 1.01, 1.05, 1.2])
+        times = np.array([0.0, 0.25, 1.0, 3.0])
+        for compounding in [ore.Simple, ore.Compounded, ore.Continuous, ore.SimpleThenCompounded]:
+            expected = [ore.InterestRate.impliedRate(c, ore.Actual360(), compounding, ore.Semiannual, t).rate()
+                        for c, t in zip(compound, times)]
+            np.testing.assert_allclose(
+                impliedRates(compound, times, compounding, ore.Semiannual), expected, rtol=1e-15)
+        self.assertRaises(ValueError, impliedRates, [1.01], [0.0])
+        self.assertRaises(ValueError, impliedRates, [-1.0], [1.0])
+
+    def test_interpolateDiscounts(self):
+        dates = [ore.Date(25, 5, 2023), ore.Date(25, 5, 2024), ore.Date(25, 5, 2026)]
+        curve = ore.DiscountCurve(dates, [1.0, 0.96, 0.9], ore.Actual365Fixed())
+        curve.enableExtrapolation()
+        nodeTimes = np.array([curve.timeFromReference(date) for date in dates])
+        times = np.linspace(0.0, 5.0, 101)
+        np.testing.assert_allclose(interpolateDiscounts(nodeTimes, np.log([1.0, 0.96, 0.9]), times),
+                                   [curve.discount(t) for t in times], rtol=1e-15)
+
+    def test_checkTimes(self):
+        checkTimes(np.array([0.0, 2.0]), 1.0, True)
+        self.assertRaises(ValueError, checkTimes, np.array([2.0]), 1.0, False)
+        self.assertRaises(ValueError, checkTimes, np.array([-1.0]), 1.0, True)
+
+    def test_advanceSerials(self):
+        serials = np.arange(45000, 45800)
+        calendar = ore.UnitedStates(ore.UnitedStates.NYSE)
+        busdaycal = createBusinessCalendar(calendar, 44900, 46400)
+        for convention in [ore.Following, ore.ModifiedFollowing, ore.Preceding, ore.Unadjusted]:
+            self.assertEqual(adjustSerials(serials, convention, busdaycal).tolist(),
+                             [calendar.adjust(ore.Date(int(s)), convention).serialNumber() for s in serials])
+            for n, unit in [(2, ore.Days), (-1, ore.Days), (1, ore.Weeks), (3, ore.Months), (1, ore.Years)]:
+                for endOfMonth in [False, True]:
+                    expected = [calendar.advance(ore.Date(int(s)), n, unit, convention, endOfMonth).serialNumber()
+                                for s in serials]
+                    self.assertEqual(
+                        advanceSerials(serials, n, unit, convention, endOfMonth, busdaycal).tolist(), expected)
+
+    def test_addMonths(self):
+        serials = toSerials(['2023-01-31', '2024-02-29', '2023-05-15'])
+        self.assertEqual(toDatetimes(addMonths(serials, 1)).astype(str).tolist(),
+                         ['2023-02-28', '2024-03-29', '2023-06-15'])
+        self.assertEqual(toDatetimes(lastDayOfMonth(serials)).astype(str).tolist(),
+                         ['2023-01-31', '2024-02-29', '2023-05-31'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,23 @@ from curveengine import *
 
 class TestRateHelpers(unittest.TestCase):
 
+    def test_createQuoteHandle(self):
+        quotes = {}
+        first = createQuoteHandle({'value': 0.03, 'ticker': 'A'}, quotes)
+        second = createQuoteHandle({'value': 0.03, 'ticker': 'A'}, quotes)
+        untracked = createQuoteHandle({'value': 0.05}, quotes)
+        # a missing value is bound later, another value is a conflict
+        createQuoteHandle({'ticker': 'A'}, quotes)
+        with self.assertRaises(ConfigurationError) as context:
+            createQuoteHandle({'value': 0.04, 'ticker': 'A'}, quotes)
+        self.assertEqual(str(context.exception), 'Conflicting values for ticker A: 0.03 and 0.04')
+        self.assertEqual(list(quotes.keys()), ['A'])
+        self.assertEqual(second.value(), 0.03)
+        quotes['A'].setValue(0.02)
+        self.assertEqual(first.value(), 0.02)
+        self.assertEqual(second.value(), 0.02)
+        self.assertEqual(untracked.value(), 0.05)
+
     def test_createOISRateHelper(self):
         helperConfig = {
             'tenor': '1Y',
@@ -0,0 +1,178 @@
+import unittest
+import sys
+import os
+import copy
+import json
+import math
+import tempfile
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+from curveengine import *
+
+
+def createTenorDepositRateHelper(helperConfig, marketConfig, curveHandles, indexes, *args, quotes=None, **kwargs):
+    config = dict(helperConfig, tenor=helperConfig['depositTenor'])
+    return createDepositRateHelper(config, marketConfig, quotes=quotes)
+
+
+def createFlatCurve(data, refDate, *args, **kwargs):
+    config = data['curveConfig']
+    curve = ore.FlatForward(refDate, config['flatRate'], config['dayCounter'])
+    if config.get('enableExtrapolation', False):
+        curve.enableExtrapolation()
+    return curve
+
+
+TENOR_DEPOSIT = RateHelperDefinition(
+    'TestTenorDeposit', createTenorDepositRateHelper,
+    {'depositTenor': TENOR_RULE, 'dayCounter': DAY_COUNTER_RULE, 'calendar': CALENDAR_RULE,
+     'convention': CONVENTION_RULE, 'endOfMonth': BOOL_RULE, 'settlementDays': INT_RULE},
+    ['rate'], parsers={'depositTenor': parsePeriod}, dependencyKeys=['referenceCurve'])
+FLAT_CURVE = CurveDefinition(
+    'TestFlat', createFlatCurve,
+    {'curveType': CURVE_TYPE_RULE, 'dayCounter': DAY_COUNTER_RULE, 'enableExtrapolation': BOOL_RULE,
+     'currency': CURVE_CURRENCY_RULE, 'flatRate': NUMBER_RULE})
+
+if 'TestTenorDeposit' not in RATE_HELPER_DEFINITIONS:
+    registerRateHelperDefinition(TENOR_DEPOSIT)
+    registerCurveDefinition(FLAT_CURVE)
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        with open(parent_dir + '/../examples/config.json', 'r') as f:
+            self.data = json.load(f)
+        self.data['curves'] = self.data['curves'][:1]
+        self.data['curves'][0]['curveConfig']['rateHelpers'][0] = {
+            'helperType': 'TestTenorDeposit',
+            'helperConfig': {'depositTenor': '1D', 'dayCounter': 'Actual360', 'calendar': 'NullCalendar',
+                             'convention': 'Unadjusted', 'endOfMonth': False, 'settlementDays': 0,
+                             'referenceCurve': 'SOFR'},
+            'marketConfig': {'rate': {'value': 0.0506, 'ticker': 'SOFRRATE INDEX'}}
+        }
+        flat = copy.deepcopy(self.data['curves'][0])
+        flat['curveName'] = 'FLAT'
+        flat['curveConfig'] = {'curveType': 'TestFlat', 'dayCounter': 'Actual365', 'enableExtrapolation': True,
+                               'currency': 'USD', 'flatRate': 0.05}
+        self.data['curves'].append(flat)
+
+    def test_built_in_definitions(self):
+        for helperType in HELPER_CONFIG_RULES:
+            self.assertIs(findRateHelperDefinition(helperType), RATE_HELPER_DEFINITIONS[helperType.value])
+        self.assertIs(findCurveDefinition(CurveType.Piecewise).builder, createPiecewiseCurve)
+        self.assertIsNone(findRateHelperDefinition('Unknown'))
+        self.assertRaises(ValueError, registerRateHelperDefinition, RATE_HELPER_DEFINITIONS['Deposit'])
+
+    def test_checks(self):
+        checkConfiguration(self.data)
+        rateHelper = self.data['curves'][0]['curveConfig']['rateHelpers'][0]
+        checkRateHelper(rateHelper, 0)
+        checkMarketConfig(rateHelper['marketConfig'], 'TestTenorDeposit')
+        checkMarketConfig(rateHelper['marketConfig'], HelperType.Deposit)
+        self.assertRaises(ConfigurationError, checkMarketConfig, {}, 'TestTenorDeposit')
+
+        rateHelper['helperConfig']['depositTenor'] = '1X'
+        self.assertRaises(RateHelperConfigurationError, checkRateHelper, rateHelper, 0)
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(self.data)
+        self.assertEqual(context.exception.pointer, '/curves/0/curveConfig/rateHelpers/0/helperConfig/depositTenor')
+
+        self.data['curves'][1]['curveConfig']['flatRate'] = 'x'
+        self.assertRaises(ConfigurationError, checkBaseCurve, self.data['curves'][1]['curveConfig'])
+        self.data['curves'][1]['curveConfig']['curveType'] = 'Unknown'
+        self.assertRaises(ConfigurationError, checkBaseCurve, self.data['curves'][1]['curveConfig'])
+
+    def test_messages(self):
+        # the messages of the built-in types are the ones from before the registry
+        rateHelper = copy.deepcopy(self.data['curves'][0]['curveConfig']['rateHelpers'][1])
+        rateHelper['helperConfig']['tenor'] = '1X'
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            checkRateHelper(rateHelper, 3)
+        self.assertEqual(str(context.exception), 'Invalid rate helper HelperType.OIS configuration at pos 3')
+
+        rateHelper['helperType'] = 1
+        with self.assertRaises(ConfigurationError) as context:
+            checkRateHelper(rateHelper, 0)
+        self.assertEqual(str(context.exception.__cause__), '1 is not in {}'.format(HELPER_TYPE_VALUES))
+
+        curveConfig = copy.deepcopy(self.data['curves'][0]['curveConfig'])
+        curveConfig['curveType'] = 'Flat'
+        with self.assertRaises(ConfigurationError) as context:
+            checkBaseCurve(curveConfig)
+        self.assertEqual(str(context.exception), 'Invalid curve configuration, curveType should be Piecewise or Discount')
+
+    def test_parse(self):
+        configuration = parseConfiguration(self.data)
+        rateHelper = configuration['curves']['SOFR']['curveConfig']['rateHelpers'][0]
+        self.assertEqual(rateHelper['helperType'], 'TestTenorDeposit')
+        self.assertEqual(rateHelper['helperConfig']['depositTenor'], ore.Period(1, ore.Days))
+        self.assertEqual(configuration['curves']['FLAT']['curveConfig']['curveType'], 'TestFlat')
+        self.assertEqual(parse(**self.data['curves'][0])['curveConfig']['rateHelpers'][1]['helperType'],
+                         HelperType.OIS)
+
+        self.data['curves'][0]['curveConfig']['rateHelpers'][0]['helperConfig']['referenceCurve'] = 'OTHER'
+        self.assertIn('OTHER', getDependencyList(self.data)['SOFR'])
+        self.assertIn('OTHER', parseConfiguration(self.data)['dependencies']['SOFR'])
+
+    def test_engine(self):
+        engine = CurveEngine(self.data)
+        self.assertGreater(engine.getCurve('SOFR').discount(1.0), 0.9)
+        self.assertAlmostEqual(engine.getCurve('FLAT').discount(2.0), math.exp(-0.1), places=12)
+
+        engine.setQuote('SOFRRATE INDEX', 0.06)
+        self.assertEqual(engine.getQuote('SOFRRATE INDEX').value(), 0.06)
+
+    def test_unknown_helper_type(self):
+        data = {'curveName': 'SOFR', 'curveConfig': {'rateHelpers': [{'helperType': 'Unknown'}]}}
+        self.assertRaises(ConfigurationError, createPiecewiseCurve, data, ore.Date(25, 5, 2023), {}, {})
+
+    def test_sofr_future(self):
+        # SofrFuture has no checks yet, so it is rejected as before the registry
+        self.assertIsNone(findRateHelperDefinition(HelperType.SofrFuture))
+        rateHelper = {'helperType': 'SofrFuture',
+                      'helperConfig': {'month': 'March', 'year': 'x', 'frequency': 'Quarterly'},
+                      'marketConfig': {'price': 95.0, 'convexity': 0.0}}
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            checkRateHelper(rateHelper, 2)
+        self.assertEqual(str(context.exception), 'Invalid rate helper HelperType.SofrFuture configuration at pos 2')
+        self.assertEqual(str(context.exception.__cause__), 'Invalid helper type')
+
+        self.data['curves'][0]['curveConfig']['rateHelpers'][1] = rateHelper
+        self.assertRaises(ConfigurationError, checkConfiguration, self.data)
+        with self.assertRaises(RateHelperConfigurationError) as context:
+            parseConfiguration(self.data)
+        self.assertEqual(context.exception.pointer, '/curves/0/curveConfig/rateHelpers/1')
+
+    def test_entry_points(self):
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, 'registry_plugin.py'), 'w') as f:
+                f.write('from curveengine import *\n'
+                        'PLUGIN_DEPOSIT = RateHelperDefinition("TestPluginDeposit", createDepositRateHelper,\n'
+                        '                                      HELPER_CONFIG_RULES[HelperType.Deposit], ["rate"])\n')
+            os.mkdir(os.path.join(path, 'registry_plugin-1.0.dist-info'))
+            with open(os.path.join(path, 'registry_plugin-1.0.dist-info', 'METADATA'), 'w') as f:
+                f.write('Metadata-Version: 2.1\nName: registry-plugin\nVersion: 1.0\n')
+            with open(os.path.join(path, 'registry_plugin-1.0.dist-info', 'entry_points.txt'), 'w') as f:
+                f.write('[curveengine.rate_helpers]\nTestPluginDeposit = registry_plugin:PLUGIN_DEPOSIT\n')
+
+            sys.path.insert(0, path)
+            LOADED_ENTRY_POINTS.discard(RATE_HELPER_ENTRY_POINTS)
+            try:
+                self.assertNotIn('TestPluginDeposit', RATE_HELPER_DEFINITIONS)
+                rateHelper = self.data['curves'][0]['curveConfig']['rateHelpers'][0]
+                rateHelper['helperType'] = 'TestPluginDeposit'
+                rateHelper['helperConfig']['tenor'] = rateHelper['helperConfig'].pop('depositTenor')
+                checkRateHelper(rateHelper, 0)
+                self.assertIn('TestPluginDeposit', RATE_HELPER_DEFINITIONS)
+                self.assertIn(RATE_HELPER_ENTRY_POINTS, LOADED_ENTRY_POINTS)
+                CurveEngine(self.data)
+            finally:
+                sys.path.remove(path)
+                RATE_HELPER_DEFINITIONS.pop('TestPluginDeposit', None)
+                for template in [False, True]:
+                    RATE_HELPER_STRUCTURES[template].pop('TestPluginDeposit', None)
+                    MARKET_CONFIG_STRUCTURES[template].pop('TestPluginDeposit', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
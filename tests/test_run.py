@@ -3,6 +3,17 @@ from test_others import *
 from test_parsing import *
 from test_ratehelpers import *
 from test_checks import *
+from test_engine import *
+from test_market import *
+from test_stream import *
+from test_backfill import *
+from test_queries import *
+from test_snapshot import *
+from test_cache import *
+from test_configuration import *
+from test_registry import *
+from test_loader import *
+from test_serialization import *
 
 def main():
     unittest.main()
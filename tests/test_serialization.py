@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import json
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+from curveengine import *
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        with open(parent_dir + '/../examples/config.json', 'rb') as f:
+            self.bytes = f.read()
+        self.data = json.loads(self.bytes)
+        self.data['curves'] = self.data['curves'][:2]
+        self.backend = getJSONBackend()
+
+    def tearDown(self):
+        setJSONBackend(self.backend)
+
+    def test_backends(self):
+        self.assertIn('json', JSON_BACKENDS)
+        self.assertIn(getJSONBackend(), JSON_BACKENDS)
+        for backend in JSON_BACKENDS:
+            setJSONBackend(backend)
+            self.assertEqual(getJSONBackend(), backend)
+            self.assertEqual(loadJSON(self.bytes), json.loads(self.bytes))
+            self.assertEqual(loadJSON(self.bytes.decode('utf-8')), json.loads(self.bytes))
+            self.assertEqual(json.loads(dumpJSON(self.data)), self.data)
+        self.assertRaises(ValueError, setJSONBackend, 'unknown')
+
+    def test_non_finite(self):
+        # the backends agree on non-finite numbers, which are rejected both ways
+        for backend in JSON_BACKENDS:
+            setJSONBackend(backend)
+            for value in [float('nan'), float('inf'), -float('inf')]:
+                self.assertRaises(ValueError, dumpJSON, {'curves': [{'value': value}]})
+                self.assertRaises(ValueError, dumpJSON, [value], sortKeys=True)
+            for document in [b'[NaN]', b'{"value":Infinity}', b'[-Infinity]']:
+                self.assertRaises(ValueError, loadJSON, document)
+            self.assertEqual(dumpJSON({'value': None, 'values': [1.0, None]}),
+                             b'{"value":null,"values":[1.0,null]}')
+
+    def test_round_trip(self):
+        engine = CurveEngine.fromJSON(json.dumps(self.data).encode('utf-8'))
+        self.assertEqual(list(engine.curves.keys()), ['SOFR', 'LIBOR3M'])
+
+        outputs = []
+        for backend in JSON_BACKENDS:
+            setJSONBackend(backend)
+            outputs.append(engine.toJSON(fields={'curveSetName': self.data['curveSetName']}))
+        output = json.loads(outputs[0])
+        for other in outputs[1:]:
+            self.assertEqual(json.loads(other), output)
+        self.assertEqual(output['curveSetName'], self.data['curveSetName'])
+        self.assertEqual(output['refDate'], parseOREDate(engine.refDate))
+        self.assertEqual([curve['curveName'] for curve in output['curves']], ['SOFR', 'LIBOR3M'])
+        self.assertEqual(output['curves'][1]['curveIndex'], self.data['curves'][1]['curveIndex'])
+
+        discountEngine = CurveEngine.fromJSON(outputs[0])
+        dates = [engine.refDate + ore.Period(n, ore.Years) for n in [1, 5, 10]]
+        for curveName in engine.curves.keys():
+            curve, discountCurve = engine.getCurve(curveName), discountEngine.getCurve(curveName)
+            for date in dates:
+                self.assertAlmostEqual(curve.discount(date), discountCurve.discount(date), places=12)
+
+        output = json.loads(engine.toJSON(['LIBOR3M']))
+        self.assertEqual([curve['curveName'] for curve in output['curves']], ['LIBOR3M'])
+        self.assertRaises(KeyError, engine.toJSON, ['UNKNOWN'])
+
+    def test_lazy(self):
+        engine = CurveEngine.fromJSON(json.dumps(self.data), lazy=True)
+        output = json.loads(engine.toJSON(['SOFR']))
+        self.assertEqual([curve['curveName'] for curve in output['curves']], ['SOFR'])
+        self.assertEqual(list(engine.curves.keys()), ['SOFR'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import sys, os
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+
+import pickle
+import unittest
+import numpy as np
+from curveengine import *
+from test_engine import loadConfig
+
+
+class TestCurveSnapshot(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = CurveEngine(loadConfig())
+        cls.serials = np.arange(cls.engine.refDate.serialNumber(), cls.engine.refDate.serialNumber() + 365 * 30, 17)
+
+    def test_snapshot(self):
+        snapshots = self.engine.snapshot()
+        self.assertEqual(list(snapshots.keys()), self.engine.sortedCurves)
+        for curveName, snapshot in snapshots.items():
+            dates, discounts = snapshot.nodes()
+            nodes = self.engine.getCurve(curveName).nodes()
+            self.assertEqual(toSerials(dates).tolist(), [date.serialNumber() for date, _ in nodes])
+            np.testing.assert_allclose(discounts, [value for _, value in nodes], rtol=1e-15)
+            self.assertEqual(snapshot.discounts(self.serials).tolist(),
+                             self.engine.discounts(curveName, self.serials).tolist())
+        self.assertEqual(list(self.engine.snapshot(['LIBOR3M', 'SOFR']).keys()), ['SOFR', 'LIBOR3M'])
+        self.assertRaises(KeyError, self.engine.snapshot, ['UNKNOWN'])
+
+    def test_immutable(self):
+        snapshot = self.engine.snapshot(['SOFR'])['SOFR']
+        self.assertRaises(AttributeError, setattr, snapshot, 'refDate', 0)
+        self.assertRaises(AttributeError, setattr, snapshot, 'other', 0)
+        with self.assertRaises(ValueError):
+            snapshot.logDiscounts[0] = 0.0
+
+    def test_pickle(self):
+        snapshot = self.engine.snapshot(['SOFR'])['SOFR']
+        buffers = []
+        data = pickle.dumps(snapshot, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 2)
+        restored = pickle.loads(data, buffers=buffers)
+        self.assertEqual(restored.zeroRates(self.serials).tolist(), snapshot.zeroRates(self.serials).tolist())
+        restored = pickle.loads(pickle.dumps(snapshot))
+        self.assertEqual(restored.forwardRates(self.serials, self.serials + 30).tolist(),
+                         snapshot.forwardRates(self.serials, self.serials + 30).tolist())
+
+    def test_pack(self):
+        snapshots = self.engine.snapshot()
+        buffer = packSnapshots(snapshots)
+        restored = unpackSnapshots(buffer)
+        self.assertEqual(list(restored.keys()), list(snapshots.keys()))
+        for curveName, snapshot in restored.items():
+            self.assertFalse(snapshot.serials.flags.owndata)
+            self.assertEqual(snapshot.dayCounter, snapshots[curveName].dayCounter)
+            self.assertEqual(snapshot.discounts(self.serials).tolist(),
+                             snapshots[curveName].discounts(self.serials).tolist())
+
+    def test_queries(self):
+        snapshot = CurveSnapshot('TEST', 45071, 'Actual/365 (Fixed)', [45071, 45436, 46166], np.log([1.0, 0.96, 0.9]))
+        self.assertAlmostEqual(snapshot.discounts(45436), 0.96, places=15)
+        self.assertRaises(ValueError, snapshot.discounts, 46167)
+        self.assertRaises(ValueError, CurveSnapshot, 'TEST', 45071, 'Actual/360', [45071, 45071], [0.0, 0.0])
+        self.assertRaises(NotImplementedError, CurveSnapshot, 'TEST', 45071, 'Actual/360',
+                          [45071, 45436], [0.0, -0.01], 'Linear')
+
+
+if __name__ == '__main__':
+    unittest.main()
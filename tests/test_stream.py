@@ -0,0 +1,135 @@
+import sys, os
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(parent_dir + '/../src')
+
+import asyncio
+import threading
+import unittest
+from curveengine import *
+from test_engine import loadConfig
+
+
+async def tickStream(ticks, delay=0.0):
+    for tick in ticks:
+        if delay:
+            await asyncio.sleep(delay)
+        yield tick
+
+
+class TestCurveStream(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = CurveEngine(loadConfig(('SOFR', 'CF_CLP_PASIVO')))
+
+    def test_coalescing(self):
+        stream = CurveStream(self.engine, debounce=0.05)
+        self.addCleanup(stream.close)
+        versions = []
+        stream.subscribe(lambda version, rebuilt: versions.append((version, rebuilt)))
+        ticks = [('USOSFR5 CURNCY', 0.04 + i * 0.0001, i) for i in range(20)]
+        ticks += [('UNKNOWN', 1.0, 20), ('USOSFR5 CURNCY', 0.05, 10)]
+        version = asyncio.run(stream.run(tickStream(ticks)))
+
+        self.assertEqual(version, 1)
+        self.assertEqual(versions, [(1, ['SOFR'])])
+        self.assertEqual(stream.ignored, 1)
+        self.assertAlmostEqual(self.engine.getQuote('USOSFR5 CURNCY').value(), 0.0419)
+
+    def test_max_rate(self):
+        stream = CurveStream(self.engine, maxRate=20, debounce=10.0)
+        self.addCleanup(stream.close)
+        versions = []
+
+        async def callback(version, rebuilt):
+            versions.append(version)
+
+        stream.subscribe(callback)
+        ticks = [('CF_CLP_PASIVO_5Y', 0.03 + i * 0.0001, i) for i in range(30)]
+        asyncio.run(stream.run(tickStream(ticks, delay=0.01)))
+
+        self.assertGreater(len(versions), 1)
+        self.assertLess(len(versions), 30)
+        self.assertAlmostEqual(self.engine.getQuote('CF_CLP_PASIVO_5Y').value(), 0.0329)
+
+    def test_stale_ticks(self):
+        stream = CurveStream(self.engine)
+        self.addCleanup(stream.close)
+        ticks = [('USOSFR5 CURNCY', 0.045, 5), ('USOSFR5 CURNCY', 0.03, 3), ('USOSFR5 CURNCY', 0.046, None)]
+        version = asyncio.run(stream.run(tickStream(ticks, delay=0.05)))
+
+        # the tick older than the applied one is dropped, even after a flush
+        self.assertEqual(version, 2)
+        self.assertEqual(stream.stale, 1)
+        self.assertAlmostEqual(self.engine.getQuote('USOSFR5 CURNCY').value(), 0.046)
+
+    def test_errors(self):
+        stream = CurveStream(self.engine)
+        self.addCleanup(stream.close)
+        versions = []
+        stream.subscribe(lambda version, rebuilt: versions.append(version))
+        ticks = [('USOSFR5 CURNCY', 'x', 1), ('USOSFR5 CURNCY', 0.047, 2)]
+        with self.assertLogs('curveengine.stream', level='ERROR'):
+            version = asyncio.run(stream.run(tickStream(ticks, delay=0.05)))
+
+        # the failed batch is reported and the next one is applied
+        self.assertEqual(stream.failed, 1)
+        self.assertIsNotNone(stream.lastError)
+        self.assertEqual(version, 1)
+        self.assertEqual(versions, [1])
+        self.assertAlmostEqual(self.engine.getQuote('USOSFR5 CURNCY').value(), 0.047)
+
+    def test_lazy(self):
+        engine = CurveEngine(loadConfig(('SOFR', 'CF_CLP_PASIVO')), lazy=True)
+        stream = CurveStream(engine)
+        self.addCleanup(stream.close)
+        ticks = [('CF_CLP_PASIVO_5Y', 0.031, 1), ('UNKNOWN', 1.0, 1)]
+        version = asyncio.run(stream.run(tickStream(ticks)))
+
+        self.assertEqual(version, 1)
+        self.assertEqual(stream.ignored, 1)
+        self.assertIn('CF_CLP_PASIVO', engine.curves.keys())
+        self.assertAlmostEqual(engine.getQuote('CF_CLP_PASIVO_5Y').value(), 0.031)
+        self.assertEqual(engine.getKnownTickers(['UNKNOWN', 'CF_CLP_PASIVO_5Y']), ['CF_CLP_PASIVO_5Y'])
+
+    def test_bugs_propagate(self):
+        # only the unknown tickers are ignored, a KeyError raised by the update fails the batch
+        stream = CurveStream(self.engine)
+        self.addCleanup(stream.close)
+
+        def update(market=None, curves=None):
+            raise KeyError('bug')
+
+        stream.engine = type('Engine', (), {'getKnownTickers': self.engine.getKnownTickers,
+                                            'update': staticmethod(update)})()
+        with self.assertLogs('curveengine.stream', level='ERROR'):
+            asyncio.run(stream.run(tickStream([('USOSFR5 CURNCY', 0.04, 1)])))
+        self.assertEqual(stream.failed, 1)
+        self.assertEqual(stream.ignored, 0)
+        self.assertIsInstance(stream.lastError, KeyError)
+
+    def test_query(self):
+        # the updates and the queries run on the same worker thread, off the event loop
+        stream = CurveStream(self.engine)
+        self.addCleanup(stream.close)
+        threads = set()
+
+        def record(version, rebuilt):
+            threads.add(threading.get_ident())
+
+        async def main():
+            stream.subscribe(lambda version, rebuilt: stream.query(record, version, rebuilt))
+            await stream.run(tickStream([('USOSFR5 CURNCY', 0.041, 1)]))
+            threads.add(await stream.query(threading.get_ident))
+            return await stream.query(self.engine.discounts, 'SOFR', [ore.Date(25, 5, 2025)])
+
+        discounts = asyncio.run(main())
+        stream.close()
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertEqual(len(discounts), 1)
+        self.assertRaises(RuntimeError, asyncio.run, stream.query(threading.get_ident))
+
+
+if __name__ == '__main__':
+    unittest.main()